@@ -5,6 +5,8 @@ import re
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
 from django.conf import settings
 from django.urls import resolve
 from django.utils.translation import gettext as _
@@ -13,7 +15,10 @@ from eventtracking import tracker
 from search.search_engine_base import SearchEngine
 
 from cms.djangoapps.contentstore.course_group_config import GroupConfiguration
+from cms.djangoapps.contentstore.models import SearchIndexedVersion
+from cms.djangoapps.contentstore.toggles import use_incremental_search_indexing
 from common.djangoapps.course_modes.models import CourseMode
+from openedx.core.djangoapps.content.block_structure.incremental import get_structure_changes
 from openedx.core.lib.courses import course_image_url
 from xmodule.annotator_mixin import html_to_text  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.library_tools import normalize_key_for_search  # lint-amnesty, pylint: disable=wrong-import-order
@@ -30,6 +35,10 @@ REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 # timed out for courseware indexing.
 INDEXING_REQUEST_TIMEOUT = 60
 
+# INDEXING_BATCH_SIZE is the default maximum number of items sent to the search
+# engine in a single bulk index request, see the SEARCH_INDEX_BATCH_SIZE setting.
+INDEXING_BATCH_SIZE = 500
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -113,6 +122,22 @@ class SearchIndexerBase(metaclass=ABCMeta):
         result_ids = [result["data"]["id"] for result in response["results"]]
         searcher.remove(result_ids)
 
+    @classmethod
+    def _get_structure_changes(cls, modulestore, structure_key, structure):
+        """
+        Returns the StructureChanges of the published structure of the given
+        course or library since it was last indexed, or None if unknown.
+        """
+        previous_version = SearchIndexedVersion.get_version(cls.INDEX_NAME, structure_key)
+        current_version = getattr(structure, 'course_version', None)
+        if previous_version is None or current_version is None:
+            return None
+        try:
+            previous_version = ObjectId(previous_version)
+        except InvalidId:
+            return None
+        return get_structure_changes(modulestore, structure.location, previous_version, current_version)
+
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, timeout=INDEXING_REQUEST_TIMEOUT):  # lint-amnesty, pylint: disable=line-too-long, too-many-statements
         """
@@ -130,6 +155,12 @@ class SearchIndexerBase(metaclass=ABCMeta):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+            When incremental search indexing is enabled, and the version of the
+            published structure that was last indexed is known, index updates
+            instead compare that version with the current one: only the items
+            that were added or changed since have their index updated, and only
+            the items that were removed are removed from the index.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -140,6 +171,11 @@ class SearchIndexerBase(metaclass=ABCMeta):
 
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
+        batch_size = getattr(settings, 'SEARCH_INDEX_BATCH_SIZE', INDEXING_BATCH_SIZE)
+
+        # When indexing incrementally, changed_blocks is the set of (block_type, block_id)
+        # of the items that were added or changed, and the only ones to index.
+        changed_blocks = None
 
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
@@ -163,6 +199,14 @@ class SearchIndexerBase(metaclass=ABCMeta):
             """
             return item.location.version_agnostic().replace(branch=None)
 
+        def index_items():
+            """
+            Sends the collected items_index to the search engine, in batches of batch_size items
+            """
+            while items_index:
+                searcher.index(items_index[:batch_size], request_timeout=timeout)
+                del items_index[:batch_size]
+
         def prepare_item_index(item, skip_index=False, groups_usage_info=None):
             """
             Add this item to the items_index and indexed_items list
@@ -178,7 +222,21 @@ class SearchIndexerBase(metaclass=ABCMeta):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
-            item_index_dictionary = item.index_dictionary()
+            if len(items_index) >= batch_size:
+                index_items()
+
+            if changed_blocks is not None:
+                # When indexing incrementally, each item is skipped unless it changed,
+                # whether or not its parent changed.
+                usage_id = item.scope_ids.usage_id
+                skip_index = (usage_id.block_type, usage_id.block_id) not in changed_blocks
+
+            if skip_index and changed_blocks is not None and not groups_usage_info:
+                # The content of unchanged items is only needed to determine the content
+                # groups of their parents, so don't extract it unless the course has any.
+                item_index_dictionary = {}
+            else:
+                item_index_dictionary = item.index_dictionary()
             # if it's not indexable and it does not have children, then ignore
             if not item_index_dictionary and not item.has_children:
                 return
@@ -253,11 +311,36 @@ class SearchIndexerBase(metaclass=ABCMeta):
                 # First perform any additional indexing from the structure object
                 cls.supplemental_index_information(modulestore, structure)
 
+                structure_changes = None
+                if triggered_at is not None and use_incremental_search_indexing():
+                    structure_changes = cls._get_structure_changes(modulestore, structure_key, structure)
+                if structure_changes is not None:
+                    changed_blocks = {
+                        (usage_key.block_type, usage_key.block_id)
+                        for usage_key in structure_changes.changed_block_keys
+                    }
+                    log.info(
+                        "Indexing %s incrementally; changed blocks: %d of %d, removed blocks: %d",
+                        structure_key,
+                        len(changed_blocks),
+                        len(structure_changes.children_map),
+                        len(structure_changes.removed_block_keys),
+                    )
+
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(items_index, request_timeout=timeout)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                index_items()
+                if structure_changes is not None:
+                    usage_key_for = structure.scope_ids.usage_id.course_key.make_usage_key
+                    removed_ids = [
+                        str(cls._id_modifier(usage_key_for(usage_key.block_type, usage_key.block_id)))
+                        for usage_key in structure_changes.removed_block_keys
+                    ]
+                    if removed_ids:
+                        searcher.remove(removed_ids)
+                else:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -270,6 +353,11 @@ class SearchIndexerBase(metaclass=ABCMeta):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        # Remember which version was indexed, to index only what changes after it next time.
+        structure_version = getattr(structure, 'course_version', None)
+        if structure_version is not None:
+            SearchIndexedVersion.set_version(cls.INDEX_NAME, structure_key, structure_version)
+
         return indexed_count["count"]
 
     @classmethod
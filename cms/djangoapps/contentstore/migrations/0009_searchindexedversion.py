@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contentstore', '0008_cleanstalecertificateavailabilitydatesconfig'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexedVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index_name', models.CharField(max_length=255)),
+                ('structure_key', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('structure_version', models.CharField(max_length=255)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('index_name', 'structure_key')},
+            },
+        ),
+    ]
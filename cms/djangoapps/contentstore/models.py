@@ -4,7 +4,9 @@ Models for contentstore
 
 
 from config_models.models import ConfigurationModel
+from django.db import models
 from django.db.models.fields import IntegerField, TextField
+from opaque_keys.edx.django.models import CourseKeyField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -63,3 +65,41 @@ class CleanStaleCertificateAvailabilityDatesConfig(ConfigurationModel):
             "`clean_stale_certificate_available_dates` management command.' See the management command for options."
         )
     )
+
+
+class SearchIndexedVersion(models.Model):
+    """
+    The version of the published structure of a course or library that was
+    last indexed in a search index, used to index only what changed since.
+
+    .. no_pii:
+    """
+    class Meta:
+        app_label = "contentstore"
+        unique_together = ('index_name', 'structure_key')
+
+    index_name = models.CharField(max_length=255)
+    structure_key = CourseKeyField(max_length=255)
+    structure_version = models.CharField(max_length=255)
+    modified = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def get_version(cls, index_name, structure_key):
+        """
+        Returns the last indexed structure version, or None if unknown.
+        """
+        try:
+            return cls.objects.get(index_name=index_name, structure_key=structure_key).structure_version
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def set_version(cls, index_name, structure_key, structure_version):
+        """
+        Records the last indexed structure version.
+        """
+        cls.objects.update_or_create(
+            index_name=index_name,
+            structure_key=structure_key,
+            defaults={'structure_version': str(structure_version)},
+        )
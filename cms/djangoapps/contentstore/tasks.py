@@ -72,7 +72,7 @@ from xmodule.modulestore.xml_importer import CourseImportException, import_cours
 
 from .outlines import update_outline_from_modulestore
 from .outlines_regenerate import CourseOutlineRegenerate
-from .toggles import bypass_olx_failure_enabled
+from .toggles import ENABLE_STREAMING_COURSE_EXPORT, bypass_olx_failure_enabled
 from .utils import course_import_olx_validation_is_enabled
 
 
@@ -358,17 +358,27 @@ def create_export_tarball(course_block, course_key, context, status=None):
     root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+        if ENABLE_STREAMING_COURSE_EXPORT.is_enabled():
+            # The static assets are written straight into the tarball, so only the OLX is written to disk.
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                _export_to_xml(
+                    course_block, course_key, root_dir, name,
+                    static_tar=tar_file, static_workers=settings.COURSE_EXPORT_STATIC_CONTENT_WORKERS,
+                )
+                if status:
+                    status.set_state('Compressing')
+                    status.increment_completed_steps()
+                tar_file.add(root_dir / name, arcname=name)
         else:
-            export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name)
+            _export_to_xml(course_block, course_key, root_dir, name)
 
-        if status:
-            status.set_state('Compressing')
-            status.increment_completed_steps()
-        LOGGER.debug('tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if status:
+                status.set_state('Compressing')
+                status.increment_completed_steps()
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                tar_file.add(root_dir / name, arcname=name)
 
     except SerializationError as exc:
         LOGGER.exception('There was an error exporting %s', course_key, exc_info=True)
@@ -408,6 +418,16 @@ def create_export_tarball(course_block, course_key, context, status=None):
     return export_file
 
 
+def _export_to_xml(course_block, course_key, root_dir, name, **kwargs):
+    """
+    Exports the course or library to the `name` directory of `root_dir`.
+    """
+    if isinstance(course_key, LibraryLocator):
+        export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name, **kwargs)
+    else:
+        export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name, **kwargs)
+
+
 class CourseImportTask(UserTask):  # pylint: disable=abstract-method
     """
     Base class for course and library import tasks.
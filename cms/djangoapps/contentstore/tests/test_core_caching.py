@@ -4,23 +4,19 @@ Tests core caching facilities.
 
 
 from django.test import TestCase
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import AssetLocator, CourseLocator
 
-from openedx.core.djangoapps.contentserver.caching import del_cached_content, get_cached_content, set_cached_content
-
-
-class Content:
-    """
-    Mock cached content
-    """
-    def __init__(self, location, content):
-        self.location = location
-        self.content = content
-
-    def get_id(self):
-        return self.location.to_deprecated_son()
+from openedx.core.djangoapps.contentserver.caching import (
+    del_cached_content,
+    get_cached_content_metadata,
+    get_local_content_cache,
+    set_cached_content_metadata
+)
+from xmodule.contentstore.content import StaticContent
 
 
+@override_settings(CONTENTSERVER_LOCAL_CACHE_MAX_BYTES=1024)
 class CachingTestCase(TestCase):
     """
     Tests for https://edx.lighthouseapp.com/projects/102637/tickets/112-updating-asset-does-not-refresh-the-cached-copy
@@ -28,19 +24,27 @@ class CachingTestCase(TestCase):
     unicodeLocation = AssetLocator(CourseLocator('c4x', 'mitX', '800'), 'thumbnail', 'monsters.jpg')
     # Note that some of the parts are strings instead of unicode strings
     nonUnicodeLocation = AssetLocator(CourseLocator('c4x', 'mitX', '800'), 'thumbnail', 'monsters.jpg')
-    mockAsset = Content(unicodeLocation, 'my content')
+    mockAsset = StaticContent(unicodeLocation, 'monsters.jpg', 'image/jpeg', b'my content', length=10)
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(get_local_content_cache().clear)
 
     def test_put_and_get(self):
-        set_cached_content(self.mockAsset)
-        self.assertEqual(self.mockAsset.content, get_cached_content(self.unicodeLocation).content,
-                         'should be stored in cache with unicodeLocation')
-        self.assertEqual(self.mockAsset.content, get_cached_content(self.nonUnicodeLocation).content,
-                         'should be stored in cache with nonUnicodeLocation')
+        set_cached_content_metadata(self.mockAsset)
+        get_local_content_cache().set(self.mockAsset)
+        for location in (self.unicodeLocation, self.nonUnicodeLocation):
+            metadata = get_cached_content_metadata(location)
+            self.assertEqual((metadata.length, metadata.data), (10, None), 'should be stored without its data')
+            self.assertEqual(b'my content', get_local_content_cache().get(location).data,
+                             'should be stored in memory with its data')
 
     def test_delete(self):
-        set_cached_content(self.mockAsset)
+        set_cached_content_metadata(self.mockAsset)
+        get_local_content_cache().set(self.mockAsset)
         del_cached_content(self.nonUnicodeLocation)
-        self.assertEqual(None, get_cached_content(self.unicodeLocation),
-                         'should not be stored in cache with unicodeLocation')
-        self.assertEqual(None, get_cached_content(self.nonUnicodeLocation),
-                         'should not be stored in cache with nonUnicodeLocation')
+        for location in (self.unicodeLocation, self.nonUnicodeLocation):
+            self.assertEqual(None, get_cached_content_metadata(location),
+                             'should not be stored in cache with {}'.format(location))
+            self.assertEqual(None, get_local_content_cache().get(location),
+                             'should not be stored in memory with {}'.format(location))
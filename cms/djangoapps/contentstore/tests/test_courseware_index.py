@@ -10,6 +10,8 @@ from unittest.mock import patch
 import ddt
 import pytest
 from django.conf import settings
+from django.test.utils import override_settings
+from edx_toggles.toggles.testutils import override_waffle_flag
 from lazy.lazy import lazy
 from pytz import UTC
 from search.search_engine_base import SearchEngine
@@ -23,6 +25,7 @@ from cms.djangoapps.contentstore.courseware_index import (
 from cms.djangoapps.contentstore.signals.handlers import listen_for_course_publish, listen_for_library_update
 from cms.djangoapps.contentstore.tasks import update_search_index
 from cms.djangoapps.contentstore.tests.utils import CourseTestCase
+from cms.djangoapps.contentstore.toggles import INCREMENTAL_SEARCH_INDEXING
 from cms.djangoapps.contentstore.utils import reverse_course_url, reverse_usage_url
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.course_modes.tests.factories import CourseModeFactory
@@ -353,6 +356,42 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index updates only the items that changed since the last index """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+
+        # Rename the html block; only it should be indexed again
+        self.html_unit.display_name = "Renamed Html Content"
+        self.update_item(store, self.html_unit)
+        before_time = datetime.now(UTC)
+        self.publish_item(store, self.vertical.location)
+        new_indexed_count = self.index_recent_changes(store, before_time)
+        self.assertEqual(new_indexed_count, 1)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+        response = self.search(query_string="Renamed")
+        self.assertEqual(response["total"], 1)
+
+        # Delete the html block; only it should be removed from the index
+        self.delete_item(store, self.html_unit.location)
+        before_time = datetime.now(UTC)
+        self.publish_item(store, self.vertical.location)
+        new_indexed_count = self.index_recent_changes(store, before_time)
+        self.assertEqual(new_indexed_count, 0)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
+    @override_settings(SEARCH_INDEX_BATCH_SIZE=1)
+    def _test_batched_index(self, store):
+        """ Make sure that all items are indexed when they are sent in several batches """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
     def _test_course_about_property_index(self, store):
         """
         Test that informational properties in the course object end up in the course_info index.
@@ -485,6 +524,13 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self):
         self._test_exception(self.store)
 
+    @override_waffle_flag(INCREMENTAL_SEARCH_INDEXING, active=True)
+    def test_incremental_index(self):
+        self._test_incremental_index(self.store)
+
+    def test_batched_index(self):
+        self._test_batched_index(self.store)
+
     def test_course_about_property_index(self):
         self._test_course_about_property_index(self.store)
 
@@ -5,6 +5,7 @@ Unit tests for course import and export Celery tasks
 
 import copy
 import json
+import tarfile
 from unittest import mock
 from uuid import uuid4
 
@@ -57,6 +58,20 @@ class ExportCourseTestCase(CourseTestCase):
         output = artifacts[0]
         self.assertEqual(output.name, 'Output')
 
+    @override_settings(ENABLE_STREAMING_COURSE_EXPORT=True)
+    def test_streaming_success(self):
+        """
+        Verify that a course export task that streams the static assets into the tarball succeeds
+        """
+        key = str(self.course.location.course_key)
+        result = export_olx.delay(self.user.id, key, 'en')
+        status = UserTaskStatus.objects.get(task_id=result.id)
+        self.assertEqual(status.state, UserTaskStatus.SUCCEEDED)
+        artifacts = UserTaskArtifact.objects.filter(status=status)
+        self.assertEqual(len(artifacts), 1)
+        with artifacts[0].file.open('rb') as artifact_file, tarfile.open(fileobj=artifact_file) as tar_file:
+            self.assertIn(f'{self.course.url_name}/course.xml', tar_file.getnames())
+
     @mock.patch('cms.djangoapps.contentstore.tasks.export_course_to_xml', side_effect=side_effect_exception)
     def test_exception(self, mock_export):  # pylint: disable=unused-argument
         """
@@ -638,6 +638,35 @@ class TestTranscript(unittest.TestCase):
         result = transcripts_utils.Transcript.convert(latin1_sjson_bytes, 'sjson', 'srt')
         assert result == expected_result
 
+    @override_settings(TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES=1024)
+    def test_convert_cached(self):
+        """
+        Test that conversions are cached by the converted transcript, input format and output format.
+        """
+        cache = transcripts_utils.get_transcript_conversion_cache()
+        self.addCleanup(cache.clear)
+        with patch.object(
+            transcripts_utils.Transcript, '_convert', wraps=transcripts_utils.Transcript._convert
+        ) as mock_convert:
+            for _ in range(2):
+                for transcript, input_format in ((self.srt_transcript, 'srt'), (self.sjson_transcript, 'sjson')):
+                    assert transcripts_utils.Transcript.convert(transcript, input_format, 'txt') == self.txt_transcript
+        assert mock_convert.call_count == 2
+        assert len(cache) == 2
+
+    @override_settings(TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES=10)
+    def test_conversion_cache_bounded_by_length(self):
+        """
+        Test that the conversion cache is bounded by the total length of the converted transcripts.
+        """
+        cache = transcripts_utils.get_transcript_conversion_cache()
+        self.addCleanup(cache.clear)
+        cache.set('a', 'aaaa')
+        cache.set('b', 'bbbb')
+        cache.set('c', 'cccc')
+        assert cache.get('a') is None
+        assert cache.current_size == 8
+
 
 class TestSubsFilename(unittest.TestCase):
     """
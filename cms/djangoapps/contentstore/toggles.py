@@ -1,7 +1,7 @@
 """
 CMS feature toggles.
 """
-from edx_toggles.toggles import SettingDictToggle, WaffleFlag
+from edx_toggles.toggles import SettingDictToggle, SettingToggle, WaffleFlag
 from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag
 
 # .. toggle_name: FEATURES['ENABLE_EXPORT_GIT']
@@ -19,6 +19,18 @@ EXPORT_GIT = SettingDictToggle(
     "FEATURES", "ENABLE_EXPORT_GIT", default=False, module_name=__name__
 )
 
+# .. toggle_name: ENABLE_STREAMING_COURSE_EXPORT
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: When enabled, course and library exports write the static assets straight from the
+#   contentstore into the export tarball, fetching up to COURSE_EXPORT_STATIC_CONTENT_WORKERS assets at once, rather
+#   than first writing them to a temporary directory. Only the OLX is then written to disk before being compressed.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_STREAMING_COURSE_EXPORT = SettingToggle(
+    "ENABLE_STREAMING_COURSE_EXPORT", default=False, module_name=__name__
+)
+
 # Namespace for studio dashboard waffle flags.
 CONTENTSTORE_NAMESPACE = 'contentstore'
 CONTENTSTORE_LOG_PREFIX = 'Contentstore: '
@@ -537,3 +549,26 @@ def default_enable_flexible_peer_openassessments(course_key):
     level to opt in/out of rolling forward this feature.
     """
     return DEFAULT_ENABLE_FLEXIBLE_PEER_OPENASSESSMENTS.is_enabled(course_key)
+
+
+# .. toggle_name: contentstore.incremental_search_indexing
+# .. toggle_implementation: WaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the search index of a course or library is updated after a publish by
+#   comparing the last indexed version of its published structure with the new version, and indexing only the
+#   blocks that were added or changed, and removing only the blocks that were removed, instead of reindexing
+#   all of its blocks. Full reindexes are used when no previously indexed version is known.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+INCREMENTAL_SEARCH_INDEXING = WaffleFlag(
+    f'{CONTENTSTORE_NAMESPACE}.incremental_search_indexing',
+    __name__,
+    CONTENTSTORE_LOG_PREFIX,
+)
+
+
+def use_incremental_search_indexing():
+    """
+    Returns a boolean if search indexes should be updated incrementally.
+    """
+    return INCREMENTAL_SEARCH_INDEXING.is_enabled()
@@ -1010,8 +1010,46 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 32 * 1024 * 1024
+# .. setting_description: Maximum size, in bytes, of the process-local LRU cache of small course assets
+#   served by the contentserver. Set to 0 to disable it; assets are then always streamed from the contentstore.
+CONTENTSERVER_LOCAL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES
+# .. setting_default: 64 * 1024
+# .. setting_description: Maximum size, in bytes, of the course assets kept in the process-local cache of the
+#   contentserver. Larger assets are streamed from the contentstore.
+CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES = 64 * 1024
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: Number of seconds that course assets are kept in the process-local cache of the
+#   contentserver. Changes to assets made by other processes are visible after at most this long.
+CONTENTSERVER_LOCAL_CACHE_TIMEOUT = 60
+
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# .. setting_name: COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 0
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of decoded
+#   split modulestore course structures that sits in front of the 'course_structure_cache'. Studio mostly
+#   reads the structures it has just written, so the cache is disabled by default.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+
+# .. setting_name: COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES
+# .. setting_default: 512 * 1024
+# .. setting_description: Maximum compressed size, in bytes, of the split modulestore definitions that are
+#   written to the 'course_definition_cache', if that cache is configured. Larger definitions are always read
+#   from the database, as are all definitions if this is 0. Edits create new definitions rather than
+#   changing saved ones, so cached definitions never expire.
+COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES = 512 * 1024
+
+# .. setting_name: TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES
+# .. setting_default: 16 * 1024 * 1024
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of video
+#   transcripts converted between formats and speeds. Set to 0 to disable it. Conversions are keyed by a
+#   hash of the converted transcript, so uploading a new transcript needs no invalidation.
+TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1115,6 +1153,16 @@ CODE_JAIL = {
     "limit_overrides": {},
 }
 
+# .. setting_name: SAFE_EXEC_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 16 * 1024 * 1024
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of safe_exec
+#   results that sits in front of the shared cache passed to safe_exec. Set to 0 to disable it.
+SAFE_EXEC_LOCAL_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# .. setting_name: SAFE_EXEC_LOCAL_CACHE_TIMEOUT
+# .. setting_default: 300
+# .. setting_description: Number of seconds that safe_exec results are kept in the process-local cache.
+SAFE_EXEC_LOCAL_CACHE_TIMEOUT = 300
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -1148,6 +1196,24 @@ CODE_JAIL_REST_SERVICE_CONNECT_TIMEOUT = 0.5  # time in seconds
 #   codejail remote service endpoint.
 CODE_JAIL_REST_SERVICE_READ_TIMEOUT = 3.5  # time in seconds
 
+# Pool of warm codejail workers
+ENABLE_CODEJAIL_WORKER_POOL = False
+# .. setting_name: CODE_JAIL_WORKER_POOL_SIZE
+# .. setting_default: 2
+# .. setting_description: Number of idle warm sandbox workers kept by each pool, when
+#   ENABLE_CODEJAIL_WORKER_POOL is True. Workers count towards the NPROC limit of the sandbox user.
+CODE_JAIL_WORKER_POOL_SIZE = 2
+# .. setting_name: CODE_JAIL_WORKER_POOL_MAX_JOBS
+# .. setting_default: 50
+# .. setting_description: Number of jobs a warm sandbox worker serves, each in a fresh child process, before it
+#   is replaced by a new one.
+CODE_JAIL_WORKER_POOL_MAX_JOBS = 50
+# .. setting_name: CODE_JAIL_WORKER_POOL_MAX_POOLS
+# .. setting_default: 4
+# .. setting_description: Number of pools of warm sandbox workers kept by each process. Workers are pooled by
+#   limit overrides context (i.e. by course), and the least recently used pool is stopped to make room.
+CODE_JAIL_WORKER_POOL_MAX_POOLS = 4
+
 ############################ DJANGO_BUILTINS ################################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -1168,6 +1234,19 @@ ROOT_URLCONF = 'cms.urls'
 COURSE_IMPORT_EXPORT_BUCKET = ''
 COURSE_METADATA_EXPORT_BUCKET = ''
 
+# .. setting_name: COURSE_IMPORT_STATIC_CONTENT_WORKERS
+# .. setting_default: 1
+# .. setting_description: The number of static files that a course import uploads to the contentstore at once.
+#   Raising it speeds up the import of courses with many or large assets, at the cost of the memory needed
+#   to hold that many files.
+COURSE_IMPORT_STATIC_CONTENT_WORKERS = 1
+
+# .. setting_name: COURSE_EXPORT_STATIC_CONTENT_WORKERS
+# .. setting_default: 4
+# .. setting_description: The number of static assets that a course export fetches from the contentstore at once,
+#   when ENABLE_STREAMING_COURSE_EXPORT is enabled.
+COURSE_EXPORT_STATIC_CONTENT_WORKERS = 4
+
 ALTERNATE_WORKER_QUEUES = 'lms'
 
 STATIC_URL_BASE = '/static/'
@@ -2096,6 +2175,11 @@ FILES_AND_UPLOAD_TYPE_FILTERS = {
 
 # Default to no Search Engine
 SEARCH_ENGINE = None
+# .. setting_name: SEARCH_INDEX_BATCH_SIZE
+# .. setting_default: 500
+# .. setting_description: Maximum number of documents sent to the search engine in a single bulk index request
+#   when indexing courseware and library content.
+SEARCH_INDEX_BATCH_SIZE = 500
 ELASTIC_FIELD_MAPPINGS = {
     "start_date": {
         "type": "date"
@@ -2199,6 +2283,17 @@ CACHES = {
             'use_pooling': True,
         }
     },
+    'course_definition_cache': {
+        'KEY_PREFIX': 'course_definition',
+        'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'OPTIONS': {
+            'no_delay': True,
+            'ignore_exc': True,
+            'use_pooling': True,
+        }
+    },
     'celery': {
         'KEY_PREFIX': 'celery',
         'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
@@ -2477,6 +2572,19 @@ ANALYTICS_DASHBOARD_NAME = 'Your Platform Name Here Insights'
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
 
+# .. setting_name: COMMENTS_SERVICE_POOL_SIZE
+# .. setting_default: 10
+# .. setting_description: The maximum number of keep-alive connections to the comments service kept by each
+#   process, which is also the maximum number of requests that it sends in parallel. Only used when the
+#   ENABLE_COMMENTS_SERVICE_CONNECTION_POOL toggle is enabled.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# .. setting_name: COMMENTS_SERVICE_MAX_RETRIES
+# .. setting_default: 2
+# .. setting_description: The number of times that idempotent requests to the comments service are retried when
+#   they get no response. Only used when the ENABLE_COMMENTS_SERVICE_CONNECTION_POOL toggle is enabled.
+COMMENTS_SERVICE_MAX_RETRIES = 2
+
 EXAMS_SERVICE_URL = 'http://localhost:18740/api/v1'
 EXAMS_SERVICE_USERNAME = 'edx_exams_worker'
 
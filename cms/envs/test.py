@@ -176,6 +176,9 @@ CACHES = {
     'course_structure_cache': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     },
+    'course_definition_cache': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
     'blockstore': {
         'KEY_PREFIX': 'blockstore',
         'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
@@ -184,6 +187,12 @@ CACHES = {
     },
 }
 
+# Process-local caches outlive individual test cases, so disable them and let tests enable them explicitly.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+SAFE_EXEC_LOCAL_CACHE_MAX_BYTES = 0
+CONTENTSERVER_LOCAL_CACHE_MAX_BYTES = 0
+TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES = 0
+
 ############################### BLOCKSTORE #####################################
 # Blockstore tests
 RUN_BLOCKSTORE_TESTS = os.environ.get('EDXAPP_RUN_BLOCKSTORE_TESTS', 'no').lower() in ('true', 'yes', '1')
@@ -15,6 +15,7 @@ class BlockCompletionTransformer(BlockStructureTransformer):
     """
     READ_VERSION = 1
     WRITE_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     COMPLETION = 'completion'
     COMPLETE = 'complete'
     RESUME_BLOCK = 'resume_block'
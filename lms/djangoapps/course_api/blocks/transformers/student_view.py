@@ -12,6 +12,7 @@ class StudentViewTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -26,11 +27,14 @@ class StudentViewTransformer(BlockStructureTransformer):
     def collect(cls, block_structure):
         """
         Collect student_view_multi_device and student_view_data values for each block
+        that needs to be collected
         """
         # collect basic xblock fields
         block_structure.request_xblock_fields('category')
 
         for block_key in block_structure.topological_traversal():
+            if not block_structure.needs_collect(block_key):
+                continue
             block = block_structure.get_xblock(block_key)
 
             # We're iterating through blocks (not bound to a user) that are
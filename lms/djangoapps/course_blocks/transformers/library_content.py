@@ -32,6 +32,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -46,6 +47,10 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
         """
         Collects any information that's necessary to execute this
         transformer's transform method.
+
+        Supports incremental collection: the analytics summaries of
+        children that don't need to be collected are kept as previously
+        collected.
         """
         block_structure.request_xblock_fields('mode')
         block_structure.request_xblock_fields('max_count')
@@ -68,8 +73,15 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 filter_func=lambda block_key: block_key.block_type == 'library_content',
                 yield_descendants_of_unyielded=True,
         ):
+            if not any(
+                block_structure.needs_collect(child_key) for child_key in block_structure.get_children(block_key)
+            ):
+                continue
+
             xblock = block_structure.get_xblock(block_key)
             for child_key in xblock.children:
+                if not block_structure.needs_collect(child_key):
+                    continue
                 summary = summarize_block(child_key)
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
@@ -195,6 +207,7 @@ class ContentLibraryOrderTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -26,6 +26,7 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -40,6 +41,10 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
         """
         Collects any information that's necessary to execute this
         transformer's transform method.
+
+        Supports incremental collection: the group access of children
+        that don't need to be collected is already in their collected
+        fields.
         """
 
         root_block = block_structure.get_xblock(block_structure.root_block_usage_key)
@@ -49,6 +54,11 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
                 filter_func=lambda block_key: block_key.block_type == 'split_test',
                 yield_descendants_of_unyielded=True,
         ):
+            if not any(
+                block_structure.needs_collect(child_key) for child_key in block_structure.get_children(block_key)
+            ):
+                continue
+
             xblock = block_structure.get_xblock(block_key)
             partition_for_this_block = next(
                 (
@@ -70,6 +80,8 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             # Set group access for each child using its group_access
             # field so the user partitions transformer enforces it.
             for child_location in xblock.children:
+                if not block_structure.needs_collect(child_location):
+                    continue
                 child = block_structure.get_xblock(child_location)
                 group = child_to_group.get(child_location, None)
                 child.group_access[partition_for_this_block.id] = [group] if group is not None else []
@@ -0,0 +1,108 @@
+"""
+Tests for the incremental collection of the core course block transformers.
+"""
+
+
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory
+
+from lms.djangoapps.course_api.blocks.transformers.blocks_api import BlocksAPITransformer
+from lms.djangoapps.grades.transformer import GradesTransformer
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.incremental import StructureChanges
+from openedx.core.djangoapps.content.block_structure.tests.helpers import mock_registered_transformers
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from openedx.core.djangoapps.discussions.transformers import DiscussionsTopicLinkTransformer
+from openedx.features.effort_estimation.block_transformers import EffortEstimationTransformer
+
+from ..library_content import ContentLibraryOrderTransformer, ContentLibraryTransformer
+from ..split_test import SplitTestTransformer
+from ..user_partitions import UserPartitionTransformer
+
+
+class RecordingModulestore:
+    """
+    Modulestore wrapper that records the keys of the items loaded from it.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.loaded_keys = set()
+
+    def get_item(self, usage_key, *args, **kwargs):
+        self.loaded_keys.add(usage_key)
+        return self.store.get_item(usage_key, *args, **kwargs)
+
+
+class IncrementalCollectTestCase(ModuleStoreTestCase):
+    """
+    Verifies that the core transformers only load the xBlocks they need
+    when collecting incrementally, and keep the data of unchanged blocks.
+    """
+    TRANSFORMERS = [
+        BlocksAPITransformer,
+        ContentLibraryOrderTransformer,
+        ContentLibraryTransformer,
+        DiscussionsTopicLinkTransformer,
+        EffortEstimationTransformer,
+        GradesTransformer,
+        SplitTestTransformer,
+        UserPartitionTransformer,
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.chapter = BlockFactory.create(parent=self.course, category='chapter')
+        self.sequential = BlockFactory.create(
+            parent=self.chapter, category='sequential', graded=True, format='Homework',
+        )
+        self.vertical = BlockFactory.create(parent=self.sequential, category='vertical')
+        self.problem = BlockFactory.create(
+            parent=self.vertical,
+            category='problem',
+            data='<problem><numericalresponse answer="2"><textline/></numericalresponse></problem>',
+        )
+        self.html = BlockFactory.create(parent=self.vertical, category='html', data='<p>Four words of text</p>')
+
+    def collect(self, block_structure):
+        """
+        Collects the given block structure with the transformers under test.
+        """
+        with mock_registered_transformers([transformer() for transformer in self.TRANSFORMERS]):
+            assert all(transformer.SUPPORTS_INCREMENTAL_COLLECT for transformer in self.TRANSFORMERS)
+            BlockStructureTransformers.collect(block_structure)
+        return block_structure
+
+    def test_incremental_collect(self):
+        full = self.collect(BlockStructureFactory.create_from_modulestore(self.course.location, self.store))
+        word_count = full.get_transformer_block_field(
+            self.html.location, EffortEstimationTransformer, EffortEstimationTransformer.HTML_WORD_COUNT,
+        )
+        assert word_count == 4
+
+        recording_store = RecordingModulestore(self.store)
+        incremental = self.collect(BlockStructureFactory.create_incrementally(
+            self.course.location,
+            recording_store,
+            full,
+            StructureChanges(
+                children_map={block_key: full.get_children(block_key) for block_key in full},
+                changed_block_keys={self.problem.location},
+                removed_block_keys=set(),
+            ),
+        ))
+
+        assert self.html.location not in recording_store.loaded_keys
+        assert recording_store.loaded_keys <= {
+            self.course.location,
+            self.chapter.location,
+            self.sequential.location,
+            self.vertical.location,
+            self.problem.location,
+        }
+        assert incremental.get_transformer_block_field(
+            self.html.location, EffortEstimationTransformer, EffortEstimationTransformer.HTML_WORD_COUNT,
+        ) == word_count
+        assert incremental.get_transformer_block_field(self.problem.location, GradesTransformer, 'max_score') == 1
+        assert incremental.get_xblock_field(self.sequential.location, 'graded')
+        assert incremental.get_xblock_field(self.course.location, 'subtree_edited_on') is not None
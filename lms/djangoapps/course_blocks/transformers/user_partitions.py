@@ -28,6 +28,7 @@ class UserPartitionTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -43,6 +44,10 @@ class UserPartitionTransformer(BlockStructureTransformer):
         Computes any information for each XBlock that's necessary to
         execute this transformer's transform method.
 
+        Supports incremental collection: the merged group access of
+        blocks that don't need to be collected is kept as previously
+        collected, unless the user partitions of the course changed.
+
         Arguments:
             block_structure (BlockStructureCollectedData)
         """
@@ -54,6 +59,12 @@ class UserPartitionTransformer(BlockStructureTransformer):
         # them on the root block.
         root_block = block_structure.get_xblock(block_structure.root_block_usage_key)
         user_partitions = get_all_partitions_for_course(root_block, active_only=True)
+        previous_user_partitions = block_structure.get_transformer_data(cls, 'user_partitions')
+        partitions_changed = (
+            previous_user_partitions is None or
+            [partition.to_json() for partition in previous_user_partitions] !=
+            [partition.to_json() for partition in user_partitions]
+        )
         block_structure.set_transformer_data(cls, 'user_partitions', user_partitions)
 
         # If there are no user partitions, this transformation is a
@@ -66,6 +77,9 @@ class UserPartitionTransformer(BlockStructureTransformer):
         # already have merged group access computed before the block
         # itself.
         for block_key in block_structure.topological_traversal():
+            if not partitions_changed and not block_structure.needs_collect(block_key):
+                continue
+
             xblock = block_structure.get_xblock(block_key)
             parent_keys = block_structure.get_parents(block_key)
             merged_parent_access_list = [
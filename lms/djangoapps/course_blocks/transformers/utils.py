@@ -72,9 +72,15 @@ def collect_merged_boolean_field(
     the value is ANDed across all parents for blocks with
     multiple parents and ORed across all ancestors down a single
     hierarchy chain.
+
+    Supports incremental collection: the merged values of blocks that
+    don't need to be collected are kept as previously collected.
     """
 
     for block_key in block_structure.topological_traversal():
+        if not block_structure.needs_collect(block_key):
+            continue
+
         # compute merged value of the boolean field from all parents
         parents = block_structure.get_parents(block_key)
         all_parents_merged_value = all(
@@ -114,9 +120,14 @@ def collect_merged_date_field(
     value is percolated down the hierarchy of the block_structure
     and stored as a value of merged_field_name in the
     block_structure.
+
+    Supports incremental collection: the merged values of blocks that
+    don't need to be collected are kept as previously collected.
     """
 
     for block_key in block_structure.topological_traversal():
+        if not block_structure.needs_collect(block_key):
+            continue
 
         parents = block_structure.get_parents(block_key)
         block_date = get_field_on_block(block_structure.get_xblock(block_key), xblock_field_name)
@@ -7,6 +7,7 @@ import json
 import logging
 import textwrap
 from collections import OrderedDict
+from contextlib import nullcontext
 
 from functools import partial
 
@@ -31,6 +32,7 @@ from edx_when.field_data import DateLookupFieldData
 from eventtracking import tracker
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey, UsageKey
+from opaque_keys.edx.locator import CourseLocator
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import APIException
 from typing import Callable, TYPE_CHECKING
@@ -65,11 +67,17 @@ from lms.djangoapps.courseware.masquerade import (
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.courseware.services import UserStateService
+from lms.djangoapps.courseware.toggles import (
+    COURSEWARE_BUFFER_USER_STATE_WRITES,
+    COURSEWARE_PREFETCH_FIELD_DATA_FROM_BLOCK_STRUCTURE
+)
+from lms.djangoapps.courseware.user_state_client import buffered_user_state_writes
 from lms.djangoapps.grades.api import GradesUtilService
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.runtime import UserTagsService, lms_wrappers_aside, lms_applicable_aside_types
 from lms.djangoapps.verify_student.services import XBlockVerificationService
 from openedx.core.djangoapps.bookmarks.api import BookmarksService
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.util.user_utils import SystemUser
@@ -853,11 +861,17 @@ def get_block_by_usage_id(request, course_id, usage_id, disable_staff_debug_info
     block, tracking_context = _get_block_by_usage_key(usage_key)
 
     _, user = setup_masquerade(request, course_key, has_access(request.user, 'staff', block, course_key))
+    block_structure = None
+    prefetch_from_block_structure = COURSEWARE_PREFETCH_FIELD_DATA_FROM_BLOCK_STRUCTURE.is_enabled(course_key)
+    # Block structures are only collected for courses, not libraries.
+    if prefetch_from_block_structure and isinstance(course_key, CourseLocator):
+        block_structure = get_course_in_cache(course_key)
     field_data_cache = FieldDataCache.cache_for_block_descendents(
         course_key,
         user,
         block,
         read_only=CrawlersConfig.is_crawler(request),
+        block_structure=block_structure,
     )
     instance = get_block_for_descriptor(
         user,
@@ -935,6 +949,11 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
 
         tracking_context_name = 'module_callback_handler'
         req = django_to_webob_request(request)
+        if COURSEWARE_BUFFER_USER_STATE_WRITES.is_enabled(course_key):
+            # Save the learner state written by the handler with bulk queries once it returns.
+            user_state_writes = buffered_user_state_writes()
+        else:
+            user_state_writes = nullcontext()
         try:
             with tracker.get_tracker().context(tracking_context_name, tracking_context):
                 if is_xblock_aside(usage_key):
@@ -944,7 +963,8 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
                     handler_instance = get_aside_from_xblock(instance, usage_key.aside_type)
                 else:
                     handler_instance = instance
-                resp = handler_instance.handle(handler, req, suffix)
+                with user_state_writes:
+                    resp = handler_instance.handle(handler, req, suffix)
                 if suffix == 'problem_check' \
                         and course \
                         and getattr(course, 'entrance_exam_enabled', False) \
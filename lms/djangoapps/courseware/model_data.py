@@ -9,6 +9,9 @@ Classes to provide the LMS runtime data storage to XBlocks.
 :class:`FieldDataCache`: A object which provides a read-through prefetch cache
     of data to support XBlock fields within a limited set of scopes.
 
+:class:`FieldDataPrefetchPlan`: The blocks and fields whose data a FieldDataCache
+    prefetches, computed either from XBlocks or from a collected block structure.
+
 The remaining classes in this module provide read-through prefetch cache implementations
 for specific scopes. The individual classes provide the knowledge of what are the essential
 pieces of information for each scope, and thus how to cache, prefetch, and create new field data
@@ -25,19 +28,21 @@ DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 import json
 import logging
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict, namedtuple
+from collections import defaultdict, deque, namedtuple
 
 from django.db import DatabaseError, IntegrityError, transaction
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
-from xblock.core import XBlockAside
+from xblock.core import XBlock, XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
+from xblock.plugin import PluginMissingError
 from xblock.runtime import KeyValueStore
 
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.x_module import XModuleMixin  # lint-amnesty, pylint: disable=wrong-import-order
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
 
@@ -51,35 +56,144 @@ class InvalidWriteError(Exception):
     """
 
 
-def _all_usage_keys(blocks, aside_types):
+def _get_child_blocks(block, depth, block_filter):
     """
-    Return a set of all usage_ids for the `blocks` and for
-    as all asides in `aside_types` for those blocks.
+    Return a list of all child blocks down to the specified depth
+    that match the block filter. Includes `block`
+
+    block: The parent to search inside
+    depth: The number of levels to descend, or None for infinite depth
+    block_filter(block): A function that returns True
+        if block should be included in the results
     """
-    usage_ids = set()
-    for block in blocks:
-        usage_ids.add(block.scope_ids.usage_id)
+    if block_filter(block):
+        blocks = [block]
+    else:
+        blocks = []
 
-        for aside_type in aside_types:
-            usage_ids.add(AsideUsageKeyV1(block.scope_ids.usage_id, aside_type))
-            usage_ids.add(AsideUsageKeyV2(block.scope_ids.usage_id, aside_type))
+    if depth is None or depth > 0:
+        new_depth = depth - 1 if depth is not None else depth
 
-    return usage_ids
+        for child in block.get_children() + block.get_required_block_descriptors():
+            blocks.extend(_get_child_blocks(child, new_depth, block_filter))
+
+    return blocks
+
+
+def _load_block_class(block_type):
+    """
+    Return the XBlock class, mixed with the modulestore's mixins, for the
+    given `block_type`, or None if no XBlock is installed for it.
+    """
+    try:
+        block_class = XBlock.load_class(block_type)
+    except PluginMissingError:
+        return None
+    return modulestore().mixologist.mix(block_class)
+
+
+def _has_required_blocks(block_class):
+    """
+    Return whether instances of `block_class` may require the data of
+    blocks other than their descendants, see get_required_block_descriptors.
+    """
+    get_required_blocks = getattr(block_class, 'get_required_block_descriptors', None)
+    return get_required_blocks not in (None, XModuleMixin.get_required_block_descriptors)
 
 
-def _all_block_types(blocks, aside_types):
+class FieldDataPrefetchPlan:
     """
-    Return a set of all block_types for the supplied `blocks` and for
-    the asides types in `aside_types` associated with those blocks.
+    The blocks, and the fields of each scope, whose data is prefetched by a
+    FieldDataCache.
+
+    A plan can be computed from XBlocks or, without instantiating any
+    XBlocks, from a collected block structure.  The data for all of the
+    blocks in a plan is then prefetched with a single (chunked) query per
+    backing table.
     """
-    block_types = set()
-    for block in blocks:
-        block_types.add(BlockTypeKeyV1(block.entry_point, block.scope_ids.block_type))
+    def __init__(self):
+        self.usage_keys = set()
+        self.block_types = set()
+        self.fields = defaultdict(set)
+        self.scorable_locations = set()
+        # Blocks whose XBlocks need to be instantiated to find the other
+        # blocks they require the data of.
+        self.blocks_with_required_blocks = set()
 
-    for aside_type in aside_types:
-        block_types.add(BlockTypeKeyV1(XBlockAside.entry_point, aside_type))
+    def add_xblocks(self, blocks):
+        """
+        Add all `blocks` to this plan.
+        """
+        for block in blocks:
+            self.usage_keys.add(block.scope_ids.usage_id)
+            self.block_types.add(BlockTypeKeyV1(block.entry_point, block.scope_ids.block_type))
+            for field in block.fields.values():
+                self.fields[field.scope].add(field)
+            if block.has_score:
+                self.scorable_locations.add(block.location)
 
-    return block_types
+    def add_block_class(self, usage_key, block_class, has_score=False):
+        """
+        Add the block with the given `usage_key` and XBlock class to this plan.
+        """
+        self.usage_keys.add(usage_key)
+        self.block_types.add(BlockTypeKeyV1(block_class.entry_point, usage_key.block_type))
+        for field in block_class.fields.values():
+            self.fields[field.scope].add(field)
+        if has_score:
+            self.scorable_locations.add(usage_key)
+        if _has_required_blocks(block_class):
+            self.blocks_with_required_blocks.add(usage_key)
+
+    @classmethod
+    def for_block_structure(cls, block_structure, usage_key, depth=None):
+        """
+        Return a plan for the block with the given `usage_key` in the
+        `block_structure` and its descendants, down to the specified `depth`
+        (or all descendants if depth is None).
+        """
+        plan = cls()
+        visited = set()
+        queue = deque([(usage_key, depth)])
+        # Breadth-first, so blocks shared in DAGs are first visited at their
+        # shallowest depth.
+        while queue:
+            block_key, remaining_depth = queue.popleft()
+            if block_key in visited:
+                continue
+            visited.add(block_key)
+
+            block_class = _load_block_class(block_key.block_type)
+            if block_class is not None:
+                has_score = block_structure.get_xblock_field(block_key, 'has_score', False)
+                plan.add_block_class(block_key, block_class, has_score)
+
+            if remaining_depth is None or remaining_depth > 0:
+                child_depth = remaining_depth - 1 if remaining_depth is not None else None
+                queue.extend((child_key, child_depth) for child_key in block_structure.get_children(block_key))
+        return plan
+
+    def all_usage_keys(self, aside_types):
+        """
+        Return a set of all usage_ids for the blocks in this plan and for
+        all asides in `aside_types` for those blocks.
+        """
+        usage_ids = set(self.usage_keys)
+        for usage_id in self.usage_keys:
+            for aside_type in aside_types:
+                usage_ids.add(AsideUsageKeyV1(usage_id, aside_type))
+                usage_ids.add(AsideUsageKeyV2(usage_id, aside_type))
+        return usage_ids
+
+    def all_block_types(self, aside_types):
+        """
+        Return a set of all block_types for the blocks in this plan and for
+        the asides types in `aside_types` associated with those blocks.
+        """
+        block_types = set(self.block_types)
+        for aside_type in aside_types:
+            block_types.add(BlockTypeKeyV1(XBlockAside.entry_point, aside_type))
+        return block_types
 
 
 class DjangoKeyValueStore(KeyValueStore):
@@ -157,17 +271,17 @@ class DjangoOrmFieldCache(metaclass=ABCMeta):
     def __init__(self):
         self._cache = {}
 
-    def cache_fields(self, fields, xblocks, aside_types):
+    def cache_fields(self, fields, plan, aside_types):
         """
-        Load all fields specified by ``fields`` for the supplied ``xblocks``
-        and ``aside_types`` into this cache.
+        Load all fields specified by ``fields`` for the blocks in the supplied
+        ``plan`` and ``aside_types`` into this cache.
 
         Arguments:
             fields (list of str): Field names to cache.
-            xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        for field_object in self._read_objects(fields, plan, aside_types):
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
     def get(self, kvs_key):
@@ -295,15 +409,15 @@ class DjangoOrmFieldCache(metaclass=ABCMeta):
         raise NotImplementedError()
 
     @abstractmethod
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, plan, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
-        with them.
+        for the ``fields`` on the blocks in the ``plan`` and the ``aside_types``
+        associated with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to load fields for
             aside_types (list of str): Asides to load field for (which annotate the supplied
                 xblocks).
         """
@@ -340,19 +454,19 @@ class UserStateCache:
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
 
-    def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
+    def cache_fields(self, fields, plan, aside_types):  # pylint: disable=unused-argument
         """
-        Load all fields specified by ``fields`` for the supplied ``xblocks``
-        and ``aside_types`` into this cache.
+        Load all fields specified by ``fields`` for the blocks in the supplied
+        ``plan`` and ``aside_types`` into this cache.
 
         Arguments:
             fields (list of str): Field names to cache.
-            xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            plan.all_usage_keys(aside_types),
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
@@ -500,21 +614,21 @@ class UserStateSummaryCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, plan, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
-        with them.
+        for the ``fields`` on the blocks in the ``plan`` and the ``aside_types``
+        associated with them.
 
         Arguments:
             fields (list of :class:`~Field`): Fields to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to load fields for
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleUserStateSummaryField.objects.chunked_filter(
             'usage_id__in',
-            _all_usage_keys(xblocks, aside_types),
+            plan.all_usage_keys(aside_types),
             field_name__in={field.name for field in fields},
         )
 
@@ -562,21 +676,21 @@ class PreferencesCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, plan, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
-        with them.
+        for the ``fields`` on the blocks in the ``plan`` and the ``aside_types``
+        associated with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to load fields for
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleStudentPrefsField.objects.chunked_filter(
             'module_type__in',
-            _all_block_types(xblocks, aside_types),
+            plan.all_block_types(aside_types),
             student=self.user.pk,
             field_name__in={field.name for field in fields},
         )
@@ -624,17 +738,17 @@ class UserInfoCache(DjangoOrmFieldCache):
             value=value,
         )
 
-    def _read_objects(self, fields, xblocks, aside_types):
+    def _read_objects(self, fields, plan, aside_types):
         """
         Return an iterator for all objects stored in the underlying datastore
-        for the ``fields`` on the ``xblocks`` and the ``aside_types`` associated
-        with them.
+        for the ``fields`` on the blocks in the ``plan`` and the ``aside_types``
+        associated with them.
 
         Arguments:
             fields (list of str): Field names to return values for
-            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            plan (:class:`FieldDataPrefetchPlan`): The blocks to load fields for
             aside_types (list of str): Asides to load field for (which annotate the supplied
-                xblocks).
+                blocks).
         """
         return XModuleStudentInfoField.objects.filter(
             student=self.user.pk,
@@ -711,13 +825,21 @@ class FieldDataCache:
         """
         Add all `blocks` to this FieldDataCache.
         """
+        plan = FieldDataPrefetchPlan()
+        plan.add_xblocks(blocks)
+        self.add_plan_to_cache(plan)
+
+    def add_plan_to_cache(self, plan):
+        """
+        Add all blocks in the FieldDataPrefetchPlan `plan` to this FieldDataCache.
+        """
         if self.user.is_authenticated:
-            self.scorable_locations.update(block.location for block in blocks if block.has_score)
-            for scope, fields in self._fields_to_cache(blocks).items():
+            self.scorable_locations.update(plan.scorable_locations)
+            for scope, fields in plan.fields.items():
                 if scope not in self.cache:
                     continue
 
-                self.cache[scope].cache_fields(fields, blocks, self.asides)
+                self.cache[scope].cache_fields(fields, plan, self.asides)
 
     def add_block_descendents(self, block, depth=None, block_filter=lambda block: True):
         """
@@ -731,38 +853,37 @@ class FieldDataCache:
                 should be cached
         """
 
-        def get_child_blocks(block, depth, block_filter):
-            """
-            Return a list of all child blocks down to the specified depth
-            that match the block filter. Includes `block`
-
-            block: The parent to search inside
-            depth: The number of levels to descend, or None for infinite depth
-            block_filter(block): A function that returns True
-                if block should be included in the results
-            """
-            if block_filter(block):
-                blocks = [block]
-            else:
-                blocks = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
+        with modulestore().bulk_operations(block.location.course_key):
+            blocks = _get_child_blocks(block, depth, block_filter)
 
-                for child in block.get_children() + block.get_required_block_descriptors():
-                    blocks.extend(get_child_blocks(child, new_depth, block_filter))
+        self.add_blocks_to_cache(blocks)
 
-            return blocks
+    def add_block_structure_descendents(self, block_structure, usage_key, depth=None):
+        """
+        Add the block with the given `usage_key` and all its descendants in
+        the collected `block_structure` to this FieldDataCache, without
+        instantiating their XBlocks.
 
-        with modulestore().bulk_operations(block.location.course_key):
-            blocks = get_child_blocks(block, depth, block_filter)
+        Arguments:
+            block_structure: A BlockStructureBlockData containing `usage_key`.
+            usage_key: The usage key of the block to add.
+            depth is the number of levels of descendant blocks to load StudentModules for, in addition to
+                the supplied block. If depth is None, load all descendant StudentModules
+        """
+        plan = FieldDataPrefetchPlan.for_block_structure(block_structure, usage_key, depth)
+        if plan.blocks_with_required_blocks:
+            store = modulestore()
+            with store.bulk_operations(usage_key.course_key):
+                for block_key in plan.blocks_with_required_blocks:
+                    for required_block in store.get_item(block_key).get_required_block_descriptors():
+                        plan.add_xblocks(_get_child_blocks(required_block, None, lambda block: True))
 
-        self.add_blocks_to_cache(blocks)
+        self.add_plan_to_cache(plan)
 
     @classmethod
     def cache_for_block_descendents(cls, course_id, user, block, depth=None,
                                     block_filter=lambda block: True,
-                                    asides=None, read_only=False):
+                                    asides=None, read_only=False, block_structure=None):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -771,21 +892,17 @@ class FieldDataCache:
             the supplied block. If depth is None, load all descendant StudentModules
         block_filter is a function that accepts a block and return whether the field data
             should be cached
+        block_structure: An optional collected block structure of the course. If it contains `block`,
+            its descendants are found in the block structure rather than by instantiating their
+            XBlocks, and `block_filter` is not applied.
         """
         cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
-        cache.add_block_descendents(block, depth, block_filter)
+        if block_structure is not None and block.location in block_structure:
+            cache.add_block_structure_descendents(block_structure, block.location, depth)
+        else:
+            cache.add_block_descendents(block, depth, block_filter)
         return cache
 
-    def _fields_to_cache(self, blocks):
-        """
-        Returns a map of scopes to fields in that scope that should be cached
-        """
-        scope_map = defaultdict(set)
-        for block in blocks:
-            for field in block.fields.values():
-                scope_map[field.scope].add(field)
-        return scope_map
-
     def get(self, key):
         """
         Load the field value specified by `key`.
@@ -275,6 +275,56 @@ class BaseStudentModuleHistory(models.Model):
             request_cache.setdefault(request_cache_key, {})
             request_cache.data[request_cache_key][student_module.id] = history_entry.id
 
+    @staticmethod
+    def save_history_entries(student_modules, history_model_cls, request_cache_key):
+        """
+        Bulk version of :meth:`save_history_entry`, for StudentModule instances that were
+        updated without sending the post_save signal (e.g. by `bulk_update`).
+        """
+        student_modules = [
+            student_module for student_module in student_modules
+            if student_module.module_type in history_model_cls.HISTORY_SAVING_TYPES
+        ]
+        if not student_modules:
+            return
+
+        request_cache = RequestCache('studentmodulehistory')
+        request_smh_cache = request_cache.get_cached_response(request_cache_key).get_value_or_default({})
+
+        # As in save_history_entry, update the history records already generated during this
+        # request rather than creating new ones.
+        cached_history_entries = history_model_cls.objects.in_bulk([
+            request_smh_cache[student_module.id]
+            for student_module in student_modules
+            if student_module.id in request_smh_cache
+        ])
+
+        history_entries_to_update = []
+        history_entries_to_create = []
+        for student_module in student_modules:
+            history_entry = cached_history_entries.get(request_smh_cache.get(student_module.id))
+            if history_entry:
+                history_entries_to_update.append(history_entry)
+            else:
+                history_entry = history_model_cls(student_module=student_module, version=None)
+                history_entries_to_create.append(history_entry)
+
+            history_entry.created = student_module.modified
+            history_entry.state = student_module.state
+            history_entry.grade = student_module.grade
+            history_entry.max_grade = student_module.max_grade
+
+        history_model_cls.objects.bulk_update(
+            history_entries_to_update, ['created', 'state', 'grade', 'max_grade'],
+        )
+        history_model_cls.objects.bulk_create(history_entries_to_create)
+
+        # Primary keys are only set by bulk_create on backends that can return them.
+        request_cache.setdefault(request_cache_key, {})
+        for history_entry in history_entries_to_create:
+            if history_entry.id is not None:
+                request_cache.data[request_cache_key][history_entry.student_module_id] = history_entry.id
+
 
 class StudentModuleHistory(BaseStudentModuleHistory):
     """Keeps a complete history of state changes for a given XModule for a given
@@ -287,6 +337,8 @@ class StudentModuleHistory(BaseStudentModuleHistory):
 
     student_module = models.ForeignKey(StudentModule, db_index=True, db_constraint=False, on_delete=models.CASCADE)
 
+    REQUEST_CACHE_KEY = "lms.djangoapps.courseware.models.student_module_history_map"
+
     def __str__(self):
         return str(repr(self))
 
@@ -299,7 +351,7 @@ class StudentModuleHistory(BaseStudentModuleHistory):
         BaseStudentModuleHistory.save_history_entry(
             instance,
             StudentModuleHistory,
-            "lms.djangoapps.courseware.models.student_module_history_map"
+            StudentModuleHistory.REQUEST_CACHE_KEY,
         )
 
     # When the extended studentmodulehistory table exists, don't save
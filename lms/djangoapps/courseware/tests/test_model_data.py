@@ -13,7 +13,12 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    FieldDataPrefetchPlan,
+    InvalidScopeError
+)
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -26,6 +31,9 @@ from lms.djangoapps.courseware.tests.factories import StudentInfoFactory
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from lms.djangoapps.courseware.tests.factories import StudentPrefsFactory
 from lms.djangoapps.courseware.tests.factories import UserStateSummaryFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.modulestore.tests.factories import BlockFactory, CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
 
 def mock_field(scope, name):
@@ -444,3 +452,68 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestFieldDataCacheFromBlockStructure(SharedModuleStoreTestCase):
+    """
+    Tests for prefetching field data using a collected block structure.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.course = CourseFactory.create()
+        with cls.store.bulk_operations(cls.course.id):
+            chapter = BlockFactory.create(parent=cls.course, category='chapter')
+            cls.sequential = BlockFactory.create(parent=chapter, category='sequential')
+            cls.vertical = BlockFactory.create(parent=cls.sequential, category='vertical')
+            cls.problems = [
+                BlockFactory.create(parent=cls.vertical, category='problem') for __ in range(3)
+            ]
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        for problem in self.problems:
+            cmfStudentModuleFactory.create(
+                student=self.user,
+                course_id=self.course.id,
+                module_state_key=problem.location,
+                state=json.dumps({'attempts': 2}),
+            )
+        self.block_structure = get_course_in_cache(self.course.id)
+
+    def test_plan(self):
+        plan = FieldDataPrefetchPlan.for_block_structure(self.block_structure, self.sequential.location)
+        problem_locations = {problem.location for problem in self.problems}
+        assert plan.usage_keys == {self.sequential.location, self.vertical.location} | problem_locations
+        assert plan.scorable_locations == problem_locations
+        assert 'attempts' in {field.name for field in plan.fields[Scope.user_state]}
+
+    def test_plan_depth(self):
+        plan = FieldDataPrefetchPlan.for_block_structure(self.block_structure, self.sequential.location, depth=1)
+        assert plan.usage_keys == {self.sequential.location, self.vertical.location}
+        assert not plan.scorable_locations
+
+    def test_matches_xblock_prefetch(self):
+        sequential = self.store.get_item(self.sequential.location)
+        from_xblocks = FieldDataCache.cache_for_block_descendents(self.course.id, self.user, sequential)
+        with patch.object(FieldDataCache, 'add_block_descendents') as mock_add_block_descendents:
+            from_block_structure = FieldDataCache.cache_for_block_descendents(
+                self.course.id, self.user, sequential, block_structure=self.block_structure,
+            )
+        mock_add_block_descendents.assert_not_called()
+
+        assert from_block_structure.scorable_locations == from_xblocks.scorable_locations
+        for problem in self.problems:
+            key = DjangoKeyValueStore.Key(Scope.user_state, self.user.id, problem.location, 'attempts')
+            assert from_block_structure.get(key) == from_xblocks.get(key) == 2
+
+    def test_block_not_in_block_structure(self):
+        sequential = self.store.get_item(self.sequential.location)
+        self.block_structure.remove_block(self.sequential.location, keep_descendants=False)
+        with patch.object(FieldDataCache, 'add_block_descendents') as mock_add_block_descendents:
+            FieldDataCache.cache_for_block_descendents(
+                self.course.id, self.user, sequential, block_structure=self.block_structure,
+            )
+        mock_add_block_descendents.assert_called_once()
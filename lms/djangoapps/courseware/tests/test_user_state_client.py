@@ -3,6 +3,8 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import json
+
 import pytz
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import Scope
@@ -12,10 +14,13 @@ from collections import defaultdict
 from django.db import connections
 
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.models import StudentModule, StudentModuleHistory
 from lms.djangoapps.courseware.user_state_client import (
     DjangoXBlockUserStateClient,
     XBlockUserStateClient,
-    XBlockUserState
+    XBlockUserState,
+    buffered_user_state_writes,
+    flush_user_state_writes
 )
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 
@@ -757,3 +762,48 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
             2. Update the test in the other repo to align with the new functionality
             3. Remove this override to re-enable the working test
         """
+
+
+class TestBufferedDjangoUserStateClient(TestDjangoUserStateClient):
+    """
+    Tests of the DjangoUserStateClient backend, with its writes buffered.
+    It reuses all tests from :class:`~UserStateClientTestBase`.
+    """
+    __test__ = True
+
+    def setUp(self):
+        super().setUp()
+        buffered_writes = buffered_user_state_writes()
+        buffered_writes.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self.addCleanup(buffered_writes.__exit__, None, None, None)
+
+    def _student_module_states(self):
+        """
+        Return the stored states of the StudentModules of user 0.
+        """
+        return {
+            student_module.module_state_key: student_module.state
+            for student_module in StudentModule.objects.filter(student=self.users[0])
+        }
+
+    def test_writes_buffered(self):
+        self.set(user=0, block=0, state={'a': 'b'})
+        self.set_many(user=0, block_to_state={0: {'c': 'd'}, 1: {'e': 'f'}})
+        assert not self._student_module_states()
+        assert self.get(user=0, block=0).state == {'a': 'b', 'c': 'd'}
+
+        flush_user_state_writes()
+        assert len(self._student_module_states()) == 2
+        assert self.get(user=0, block=0).state == {'a': 'b', 'c': 'd'}
+        assert StudentModuleHistory.objects.filter(student_module__student=self.users[0]).count() == 2
+
+    def test_buffered_overlay(self):
+        self.set(user=0, block=0, state={'a': 'b', 'c': 'd'})
+        flush_user_state_writes()
+        self.set(user=0, block=0, state={'a': 'e'})
+        assert json.loads(self._student_module_states()[self._block(0)]) == {'a': 'b', 'c': 'd'}
+        assert self.get(user=0, block=0).state == {'a': 'e', 'c': 'd'}
+
+        flush_user_state_writes()
+        assert self.get(user=0, block=0).state == {'a': 'e', 'c': 'd'}
+        assert len(list(self.get_history(user=0, block=0))) == 1
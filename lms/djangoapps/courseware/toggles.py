@@ -96,6 +96,32 @@ COURSEWARE_OPTIMIZED_RENDER_XBLOCK = CourseWaffleFlag(
     f'{WAFFLE_FLAG_NAMESPACE}.optimized_render_xblock', __name__
 )
 
+# .. toggle_name: courseware.prefetch_field_data_from_block_structure
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag that determines whether the learner state of the descendants of a block
+#   rendered by usage id is prefetched by finding the descendants in the course's collected block structure,
+#   rather than by instantiating the XBlock of each descendant before any data is loaded.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+COURSEWARE_PREFETCH_FIELD_DATA_FROM_BLOCK_STRUCTURE = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.prefetch_field_data_from_block_structure', __name__
+)
+
+# .. toggle_name: courseware.buffer_user_state_writes
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Waffle flag that determines whether the learner state written while an XBlock handler
+#   is invoked is buffered and saved with bulk queries, along with its history records, once the handler
+#   returns, rather than with a read-modify-write of each StudentModule every time the XBlock saves its fields.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: None
+COURSEWARE_BUFFER_USER_STATE_WRITES = CourseWaffleFlag(
+    f'{WAFFLE_FLAG_NAMESPACE}.buffer_user_state_writes', __name__
+)
+
 # .. toggle_name: COURSES_INVITE_ONLY
 # .. toggle_implementation: SettingToggle
 # .. toggle_type: feature_flag
@@ -11,16 +11,19 @@ from time import time
 
 from abc import abstractmethod
 from collections import namedtuple
+from contextlib import contextmanager
 
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import RequestCache
 from xblock.fields import Scope
 
-from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule, StudentModuleHistory
 
 try:
     import simplejson as json
@@ -30,6 +33,9 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+USER_STATE_WRITE_BUFFER_NAMESPACE = 'lms.djangoapps.courseware.user_state_client.write_buffer'
+USER_STATE_WRITE_BUFFER_KEY = 'write_buffer'
+
 
 class XBlockUserState(namedtuple('_XBlockUserState', ['username', 'block_key', 'state', 'updated', 'scope'])):
     """
@@ -367,13 +373,19 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # keep track of blocks requested
         self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
 
+        # Overlay any state that has been buffered, but not yet saved.
+        write_buffer = get_user_state_write_buffer()
+        buffered_states = write_buffer.get_many(username, block_keys) if write_buffer is not None else {}
+
         modules = self._get_student_modules(username, block_keys)
         for module, usage_key in modules:
-            if module.state is None:
+            buffered_state, updated = buffered_states.pop(usage_key, (None, module.modified))
+            if module.state is None and buffered_state is None:
                 continue
 
-            state = json.loads(module.state)
-            state_length = len(module.state)
+            state = json.loads(module.state) if module.state is not None else {}
+            state.update(buffered_state or {})
+            state_length = len(module.state or '')
 
             # If the state is the empty dict, then it has been deleted, and so
             # conformant UserStateClients should treat it as if it doesn't exist.
@@ -392,7 +404,19 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                     for field in fields
                     if field in state
                 }
-            yield XBlockUserState(username, usage_key, state, module.modified, scope)
+            yield XBlockUserState(username, usage_key, state, updated, scope)
+
+        for usage_key, (state, updated) in buffered_states.items():
+            if state == {}:
+                continue
+
+            if fields is not None:
+                state = {
+                    field: state[field]
+                    for field in fields
+                    if field in state
+                }
+            yield XBlockUserState(username, usage_key, state, updated, scope)
 
         # The rest of this method exists only to report custom attributes.
         finish_time = time()
@@ -431,8 +455,25 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        write_buffer = get_user_state_write_buffer()
+        if write_buffer is not None:
+            write_buffer.add(user, block_keys_to_state)
+            self._nr_stat_accumulate('set_many', 'blocks_buffered', len(block_keys_to_state))
+            return
+
         evt_time = time()
+        self._set_many(user, block_keys_to_state)
+
+        # Events for the entire set_many call.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _set_many(self, user, block_keys_to_state):
+        """
+        Overlay the state dicts in `block_keys_to_state` over the stored state of
+        `user`, with a read-modify-write of each StudentModule.
+        """
         for usage_key, state in block_keys_to_state.items():
             try:
                 student_module, created = StudentModule.objects.get_or_create(
@@ -496,7 +537,65 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # Event to record number of existing fields updated in set/set_many.
             num_fields_updated = max(0, len(state) - num_new_fields_set)
 
-        # Events for the entire set_many call.
+    def _bulk_set_many(self, user, block_keys_to_state):
+        """
+        Overlay the state dicts in `block_keys_to_state` over the stored state of
+        `user`, reading, updating and creating all of the StudentModules (and
+        their history records) with bulk queries in a single transaction.
+
+        If another process created any of the StudentModules in the meantime,
+        falls back to :meth:`_set_many`.
+        """
+        evt_time = time()
+        modified = timezone.now()
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, list(block_keys_to_state))
+        }
+
+        modules_to_update = []
+        modules_to_create = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.context_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                )
+                modules_to_create.append(student_module)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
+            else:
+                current_state = json.loads(student_module.state) if student_module.state is not None else {}
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                # bulk_update doesn't apply auto_now.
+                student_module.modified = modified
+                modules_to_update.append(student_module)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
+            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+
+        try:
+            with transaction.atomic():
+                # Only the state is written, so that a score saved in the meantime isn't overwritten.
+                StudentModule.objects.bulk_update(modules_to_update, ['state', 'modified'])
+                StudentModule.objects.bulk_create(modules_to_create)
+                if modules_to_create and any(module.id is None for module in modules_to_create):
+                    # bulk_create only sets primary keys on backends that can return them.
+                    modules_to_create = [
+                        student_module for student_module, _ in self._get_student_modules(
+                            user.username, [module.module_state_key for module in modules_to_create]
+                        )
+                    ]
+                _save_history_entries(modules_to_update + modules_to_create)
+        except IntegrityError:
+            log.warning("set_many: IntegrityError for student {} - bulk saving {} block keys: {}".format(
+                user, len(block_keys_to_state), list(block_keys_to_state.keys())
+            ))
+            self._set_many(user, block_keys_to_state)
+
         finish_time = time()
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('set_many', 'duration', duration)
@@ -514,6 +613,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        # Save any buffered state first, so that it is deleted along with the stored state.
+        flush_user_state_writes()
+
         evt_time = time()  # lint-amnesty, pylint: disable=unused-variable
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
@@ -552,6 +654,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        flush_user_state_writes()
         student_modules = list(
             student_module
             for student_module, usage_id
@@ -602,6 +705,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        flush_user_state_writes()
 
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key)
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
@@ -634,6 +738,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         """
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        flush_user_state_writes()
 
         results = StudentModule.objects.order_by('id').filter(course_id=course_key)
         if block_type:
@@ -651,3 +756,111 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                     continue
 
                 yield XBlockUserState(sm.student.username, sm.module_state_key, state, sm.modified, scope)
+
+
+def _save_history_entries(student_modules):
+    """
+    Save the history records of StudentModules that were saved with bulk queries,
+    which don't send the post_save signal that saves them otherwise.
+    """
+    if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+        from lms.djangoapps.coursewarehistoryextended.models import StudentModuleHistoryExtended
+        history_model_cls = StudentModuleHistoryExtended
+    else:
+        history_model_cls = StudentModuleHistory
+    BaseStudentModuleHistory.save_history_entries(
+        student_modules, history_model_cls, history_model_cls.REQUEST_CACHE_KEY,
+    )
+
+
+class UserStateWriteBuffer:
+    """
+    Coalesces the Scope.user_state writes made by DjangoXBlockUserStateClients,
+    so that they are saved with bulk queries when flushed, rather than with a
+    read-modify-write of each StudentModule for every write.
+    """
+    def __init__(self):
+        self._users = {}
+        # username -> {usage_key: (state, updated)}
+        self._states = {}
+
+    def __len__(self):
+        return sum(len(states) for states in self._states.values())
+
+    def add(self, user, block_keys_to_state):
+        """
+        Buffer the state dicts in `block_keys_to_state` for `user`, overlaying
+        them over any state already buffered for the same blocks.
+        """
+        self._users[user.username] = user
+        states = self._states.setdefault(user.username, {})
+        updated = timezone.now()
+        for usage_key, state in block_keys_to_state.items():
+            buffered_state, _ = states.get(usage_key, ({}, None))
+            states[usage_key] = (dict(buffered_state, **state), updated)
+
+    def get_many(self, username, block_keys):
+        """
+        Return a dict mapping those of `block_keys` that have buffered state for
+        `username` to a (state, updated) tuple.
+        """
+        states = self._states.get(username, {})
+        return {
+            usage_key: (dict(states[usage_key][0]), states[usage_key][1])
+            for usage_key in block_keys
+            if usage_key in states
+        }
+
+    def flush(self):
+        """
+        Save all buffered state.
+        """
+        while self._states:
+            username, states = self._states.popitem()
+            user = self._users.pop(username)
+            DjangoXBlockUserStateClient(user)._bulk_set_many(  # pylint: disable=protected-access
+                user,
+                {usage_key: state for usage_key, (state, _) in states.items()},
+            )
+
+
+def get_user_state_write_buffer():
+    """
+    Return the UserStateWriteBuffer of the current request, or None if writes
+    aren't being buffered.
+    """
+    request_cache = RequestCache(USER_STATE_WRITE_BUFFER_NAMESPACE)
+    return request_cache.get_cached_response(USER_STATE_WRITE_BUFFER_KEY).get_value_or_default(None)
+
+
+def flush_user_state_writes():
+    """
+    Save the state buffered in the current request, if any, without waiting for
+    the buffering to end.
+    """
+    write_buffer = get_user_state_write_buffer()
+    if write_buffer is not None:
+        write_buffer.flush()
+
+
+@contextmanager
+def buffered_user_state_writes():
+    """
+    Context manager that buffers the Scope.user_state writes made by
+    DjangoXBlockUserStateClients within it, and saves them when it exits
+    (whether or not an exception was raised).
+
+    Nested contexts share the buffer of the outermost one, which saves it.
+    """
+    if get_user_state_write_buffer() is not None:
+        yield
+        return
+
+    request_cache = RequestCache(USER_STATE_WRITE_BUFFER_NAMESPACE)
+    write_buffer = UserStateWriteBuffer()
+    request_cache.set(USER_STATE_WRITE_BUFFER_KEY, write_buffer)
+    try:
+        yield
+    finally:
+        request_cache.clear()
+        write_buffer.flush()
@@ -39,6 +39,8 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
 
     student_module = models.ForeignKey(StudentModule, db_index=True, db_constraint=False, on_delete=models.DO_NOTHING)
 
+    REQUEST_CACHE_KEY = "lms.djangoapps.coursewarehistoryextended.models.student_module_history_extended_map"
+
     @receiver(post_save, sender=StudentModule)
     def save_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
         """
@@ -49,7 +51,7 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
         BaseStudentModuleHistory.save_history_entry(
             instance,
             StudentModuleHistoryExtended,
-            "lms.djangoapps.coursewarehistoryextended.models.student_module_history_extended_map"
+            StudentModuleHistoryExtended.REQUEST_CACHE_KEY,
         )
 
     @receiver(post_delete, sender=StudentModule)
@@ -9,8 +9,10 @@ from unittest.mock import Mock, patch
 
 import ddt
 import pytest
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import translation
+from django.utils.translation import get_language
 from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
@@ -39,6 +41,9 @@ from openedx.core.djangoapps.discussions.utils import (
 )
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
+    _get_forums_config,
+    get_session,
+    perform_concurrently,
     perform_request,
 )
 from openedx.core.djangoapps.django_comment_common.models import (
@@ -1650,6 +1655,7 @@ class GroupModeratorPermissionsTestCase(ModuleStoreTestCase):
                                                                                     'can_report': True}
 
 
+@ddt.ddt
 class ClientConfigurationTestCase(TestCase):
     """Simple test cases to ensure enabling/disabling the use of the comment service works as intended."""
 
@@ -1678,6 +1684,47 @@ class ClientConfigurationTestCase(TestCase):
         result = perform_request('GET', 'http://www.google.com')
         assert result == {}
 
+    @override_settings(ENABLE_COMMENTS_SERVICE_CONNECTION_POOL=True)
+    @patch('requests.Session.request')
+    def test_connection_pool(self, mock_request):
+        """Ensures that requests are sent through the pooled session when it is enabled."""
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {}
+        mock_request.return_value = response
+
+        assert perform_request('GET', 'http://www.google.com') == {}
+        assert perform_request('GET', 'http://www.google.com') == {}
+        assert mock_request.call_count == 2
+        assert get_session() is get_session()
+
+    @ddt.data(True, False)
+    def test_perform_concurrently(self, pooled):
+        """Ensures that the results of concurrent calls are returned in order, with the caller's language."""
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        def get_config_and_language():
+            return _get_forums_config().enabled, get_language()
+
+        with override_settings(ENABLE_COMMENTS_SERVICE_CONNECTION_POOL=pooled), translation.override('eo'):
+            results = perform_concurrently(get_config_and_language, lambda: 2, get_config_and_language)
+        assert results == [(True, 'eo'), 2, (True, 'eo')]
+
+    @override_settings(ENABLE_COMMENTS_SERVICE_CONNECTION_POOL=True)
+    def test_perform_concurrently_error(self):
+        """Ensures that the exception of the first failing call is raised."""
+        def fail(exception):
+            raise exception
+
+        with pytest.raises(CommentClientMaintenanceError):
+            perform_concurrently(lambda: 1, lambda: fail(CommentClientMaintenanceError()), lambda: fail(ValueError()))
+
 
 def set_discussion_division_settings(
     course_key, enable_cohorts=False, always_divide_inline_discussions=False,
@@ -55,7 +55,8 @@ from openedx.core.djangoapps.django_comment_common.comment_client.course import
 from openedx.core.djangoapps.django_comment_common.comment_client.thread import Thread
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClient500Error,
-    CommentClientRequestError
+    CommentClientRequestError,
+    perform_concurrently
 )
 from openedx.core.djangoapps.django_comment_common.models import (
     FORUM_ROLE_ADMINISTRATOR,
@@ -215,10 +216,14 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
             retrieve_kwargs["with_responses"] = False
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        # The thread and the requester are independent, so they are retrieved in parallel.
+        cc_thread, cc_requester = perform_concurrently(
+            lambda: Thread(id=thread_id).retrieve(**retrieve_kwargs),
+            lambda: comment_client.User.from_django_user(request.user).retrieve(),
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester)
 
         if retrieve_kwargs.get("flagged_comments") and not context["has_moderation_privilege"]:
             raise ValidationError("Only privileged users can request flagged comments")
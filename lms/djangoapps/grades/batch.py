@@ -0,0 +1,463 @@
+"""
+Batch computation of course grades.
+
+The BatchCourseGrader computes the grades of a batch of users at once:
+the course structure is transformed once and shared by all the users of the
+batch, their raw scores (from CSM and the Submissions API) are loaded into
+arrays of users by problems, and the subsection, assignment type and course
+percentages of all of them are computed with array operations.
+
+The array operations reproduce the order of the floating point operations of
+get_score, aggregate_scores and the course grader, so that users get exactly
+the grades they would get from CourseGrade.update.  Users whose structure or
+grades may differ from the shared ones (with grade overrides, staff or beta
+tester access, or personal date overrides), and all users of courses whose
+content varies by user, are left to the per-user path.
+"""
+
+
+from collections import OrderedDict, defaultdict, namedtuple
+
+import numpy as np
+from ccx_keys.locator import CCXLocator
+from django.conf import settings
+from edx_when.api import get_overrides_for_user
+from lazy import lazy
+from submissions import api as submissions_api
+
+from common.djangoapps.student.models import anonymous_id_for_user
+from common.djangoapps.student.roles import CourseBetaTesterRole
+from lms.djangoapps.course_blocks.api import get_course_blocks, has_individual_student_override_provider
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.models import StudentModule
+from xmodule.graders import (  # lint-amnesty, pylint: disable=wrong-import-order
+    AggregatedScore,
+    AssignmentFormatGrader,
+    ProblemScore,
+    WeightedSubsectionsGrader
+)
+
+from .course_data import CourseData
+from .course_grade import CourseGrade
+from .models import PersistentSubsectionGradeOverride
+from .scores import _get_explicit_graded, possibly_scored
+from .subsection_grade import CreateSubsectionGrade, NonZeroSubsectionGrade
+from .transformer import GradesTransformer
+
+# The number of users graded together by the BatchCourseGrader.
+BATCH_SIZE = 200
+
+# The raw scores of a batch of users, as arrays of users by problems.
+BatchScores = namedtuple(
+    'BatchScores',
+    ['valid', 'raw_earned', 'raw_possible', 'earned', 'possible', 'graded', 'first_attempted', 'attempted_at'],
+)
+
+
+def _sequential_sum(values):
+    """
+    Returns the sums of the rows of the given 2-dimensional array, adding
+    their values from left to right like the builtin sum does, rather than
+    pairwise like numpy.sum does.
+    """
+    if not values.shape[1]:
+        return np.zeros(values.shape[0])
+    return np.add.accumulate(values, axis=1)[:, -1]
+
+
+def _none_if_nan(value):
+    return None if np.isnan(value) else float(value)
+
+
+class BatchSubsectionGrade(CreateSubsectionGrade):
+    """
+    A subsection grade computed by the BatchCourseGrader.
+
+    Its totals are computed with the batch, but its problem scores are only
+    built when needed, e.g. to persist its visible blocks.
+    """
+    def __init__(self, subsection, all_total, graded_total, scores_getter):  # pylint: disable=super-init-not-called
+        self._get_problem_scores = scores_getter
+        NonZeroSubsectionGrade.__init__(self, subsection, all_total, graded_total)
+
+    @lazy
+    def problem_scores(self):
+        return self._get_problem_scores()
+
+
+class BatchCourseGrade(CourseGrade):
+    """
+    A course grade computed by the BatchCourseGrader.
+
+    Updating it persists its subsection grades, without computing them again.
+    """
+    def __init__(self, user, course_data, grader_percent, subsection_grades):
+        super().__init__(user, course_data, force_update_subsections=True)
+        self._batch_subsection_grades = subsection_grades
+        grade_cutoffs = course_data.course.grade_cutoffs
+        self.percent = self._compute_percent({'percent': grader_percent})
+        self.letter_grade = self._compute_letter_grade(grade_cutoffs, self.percent)
+        self.passed = self._compute_passed(grade_cutoffs, self.percent)
+
+    def update(self, visible_grades_only=False, has_staff_access=False):
+        if visible_grades_only:
+            # The batch only computes the grades of all visible problems.
+            return super().update(visible_grades_only=visible_grades_only, has_staff_access=has_staff_access)
+        # Getting the chapter grades persists all the subsection grades.
+        self.chapter_grades  # pylint: disable=pointless-statement
+        return self
+
+    def _get_subsection_grade(self, subsection, force_update_subsections=False):
+        calculated_grade = self._batch_subsection_grades.get(subsection.location)
+        if calculated_grade is None:
+            return super()._get_subsection_grade(subsection, force_update_subsections)
+        return self._subsection_grade_factory.update(
+            subsection, force_update_subsections=force_update_subsections, calculated_grade=calculated_grade,
+        )
+
+
+class BatchCourseGrader:
+    """
+    Computes the grades of batches of users in a course.
+
+    The course structure is transformed for the first user that is graded,
+    and shared by all the users graded afterwards, so a single instance
+    should be used to grade all the batches of users of a task.
+    """
+    def __init__(self, course_data):
+        self.course_data = course_data
+        self.structure = None
+
+    def grade(self, users):
+        """
+        Returns a dict of the BatchCourseGrade of the given users, by user id.
+        Users that must be graded one at a time are missing from the dict.
+        """
+        if not self._supports_course:
+            return {}
+        personalized_user_ids = self._get_personalized_user_ids(users)
+        users = [user for user in users if user.id not in personalized_user_ids]
+        if not users:
+            return {}
+        if self.structure is None:
+            self._load_structure(users[0])
+
+        scores = self._get_scores(users)
+        graded_earned, graded_possible, all_totals, graded_totals = self._get_subsection_totals(users, scores)
+        grader_percents = self._get_grader_percents(graded_earned, graded_possible)
+
+        course_grades = {}
+        for user_index, user in enumerate(users):
+            course_data = CourseData(
+                user,
+                course=self.course_data.course,
+                collected_block_structure=self.course_data.collected_structure,
+                structure=self.structure,
+                course_key=self.course_data.course_key,
+            )
+            subsection_grades = {
+                subsection_key: BatchSubsectionGrade(
+                    self.structure[subsection_key],
+                    all_totals[subsection_index][user_index],
+                    graded_totals[subsection_index][user_index],
+                    self._problem_scores_getter(scores, user_index, subsection_index),
+                )
+                for subsection_index, subsection_key in enumerate(self._subsection_keys)
+            }
+            course_grades[user.id] = BatchCourseGrade(
+                user, course_data, float(grader_percents[user_index]), subsection_grades,
+            )
+        return course_grades
+
+    @lazy
+    def _supports_course(self):
+        """
+        Returns whether all the users of the course without any personal
+        overrides get the same course structure and are graded by a grader
+        that can be computed in batches.
+        """
+        if isinstance(self.course_data.course_key, CCXLocator):
+            return False
+        if settings.GENERATE_PROFILE_SCORES or has_individual_student_override_provider():
+            return False
+
+        grader = self.course_data.course.grader
+        if not isinstance(grader, WeightedSubsectionsGrader) or not all(
+            isinstance(subgrader, AssignmentFormatGrader) for subgrader, _, _ in grader.subgraders
+        ):
+            return False
+
+        collected_structure = self.course_data.collected_structure
+        for block_key in collected_structure:
+            # Library content blocks select different children for each user.
+            if block_key.block_type == 'library_content':
+                return False
+            merged_group_access = collected_structure.get_transformer_block_field(
+                block_key, UserPartitionTransformer, 'merged_group_access',
+            )
+            if merged_group_access and merged_group_access.get_allowed_groups():
+                return False
+        return True
+
+    @lazy
+    def _beta_tester_ids(self):
+        return set(CourseBetaTesterRole(self.course_data.course_key).users_with_role().values_list('id', flat=True))
+
+    def _get_personalized_user_ids(self, users):
+        """
+        Returns the ids of the given users whose course structure or grades
+        may differ from those of other users.
+        """
+        course_key = self.course_data.course_key
+        user_ids = {user.id for user in users}
+        personalized_user_ids = set(
+            PersistentSubsectionGradeOverride.objects.filter(
+                grade__course_id=course_key, grade__user_id__in=user_ids,
+            ).values_list('grade__user_id', flat=True)
+        )
+        personalized_user_ids.update(user_ids & self._beta_tester_ids)
+        for user in users:
+            if user.id in personalized_user_ids:
+                continue
+            if has_access(user, 'staff', course_key) or any(True for _ in get_overrides_for_user(course_key, user)):
+                personalized_user_ids.add(user.id)
+        return personalized_user_ids
+
+    def _load_structure(self, user):
+        """
+        Transforms the course structure for the given user, and lays out the
+        subsections and scored problems in it.
+        """
+        self.structure = get_course_blocks(
+            user, self.course_data.location, collected_block_structure=self.course_data.collected_structure,
+        )
+
+        subsection_keys = OrderedDict()
+        for chapter_key in self.structure.get_children(self.course_data.location):
+            for subsection_key in self.structure.get_children(chapter_key):
+                subsection_keys[subsection_key] = None
+        self._subsection_keys = list(subsection_keys)
+
+        problem_indices = OrderedDict()
+        self._subsection_problems = []
+        self._subsections_by_format = defaultdict(list)
+        for subsection_index, subsection_key in enumerate(self._subsection_keys):
+            indices = [
+                problem_indices.setdefault(block_key, len(problem_indices))
+                for block_key in self.structure.post_order_traversal(
+                    filter_func=possibly_scored,
+                    start_node=subsection_key,
+                )
+                if getattr(self.structure[block_key], 'has_score', False)
+            ]
+            self._subsection_problems.append(np.array(indices, dtype=int))
+            subsection = self.structure[subsection_key]
+            if getattr(subsection, 'graded', False):
+                self._subsections_by_format[getattr(subsection, 'format', '')].append(subsection_index)
+
+        self._problem_keys = list(problem_indices)
+        problems = [self.structure[problem_key] for problem_key in self._problem_keys]
+        self._weights = [getattr(problem, 'weight', None) for problem in problems]
+        self._weight_values = np.array([np.nan if weight is None else weight for weight in self._weights], dtype=float)
+        max_scores = [problem.transformer_data[GradesTransformer].max_score for problem in problems]
+        self._max_scores = np.array([np.nan if score is None else score for score in max_scores], dtype=float)
+        self._explicit_graded = np.array([bool(_get_explicit_graded(problem)) for problem in problems], dtype=bool)
+
+    def _get_scores(self, users):
+        """
+        Returns the BatchScores of the given users, computed as get_score
+        computes the score of each user and problem.
+        """
+        course_key = self.course_data.course_key
+        shape = (len(users), len(self._problem_keys))
+        user_indices = {user.id: index for index, user in enumerate(users)}
+        problem_indices = {
+            problem_key.replace(version=None, branch=None): index
+            for index, problem_key in enumerate(self._problem_keys)
+        }
+
+        csm_correct, csm_total = np.full(shape, np.nan), np.full(shape, np.nan)
+        csm_attempted_at = np.full(shape, np.inf)
+        csm_created = np.full(shape, None, dtype=object)
+        scores = StudentModule.objects.filter(
+            course_id=course_key,
+            student_id__in=list(user_indices),
+            module_state_key__in=self._problem_keys,
+        ).values_list('student_id', 'module_state_key', 'grade', 'max_grade', 'created')
+        for user_id, location, correct, total, created in scores:
+            problem_index = problem_indices.get(location.map_into_course(course_key))
+            if problem_index is None or total is None:
+                continue
+            index = user_indices[user_id], problem_index
+            csm_total[index] = total
+            if correct is not None:
+                csm_correct[index] = correct
+                csm_created[index] = created
+                csm_attempted_at[index] = created.timestamp()
+
+        problem_indices = {str(problem_key): index for index, problem_key in enumerate(self._problem_keys)}
+        submission_earned, submission_possible = np.full(shape, np.nan), np.full(shape, np.nan)
+        submission_attempted_at = np.full(shape, np.inf)
+        submission_created = np.full(shape, None, dtype=object)
+        for user_index, user in enumerate(users):
+            anonymous_user_id = anonymous_id_for_user(user, course_key)
+            for location, value in submissions_api.get_scores(str(course_key), anonymous_user_id).items():
+                problem_index = problem_indices.get(location)
+                if problem_index is None or not value:
+                    continue
+                index = user_index, problem_index
+                submission_earned[index] = value['points_earned']
+                submission_possible[index] = value['points_possible']
+                submission_created[index] = value['created_at']
+                submission_attempted_at[index] = value['created_at'].timestamp()
+
+        # Scores are taken from the Submissions API, then from CSM, then from the latest block content.
+        from_submissions = ~np.isnan(submission_possible)
+        from_csm = ~from_submissions & ~np.isnan(csm_total)
+        from_block = ~from_submissions & ~from_csm
+        valid = ~(from_block & np.isnan(self._max_scores))
+
+        raw_earned = np.where(from_csm, np.nan_to_num(csm_correct), 0.0)
+        raw_possible = np.where(from_csm, csm_total, self._max_scores)
+        use_weight = ~np.isnan(self._weight_values) & (raw_possible != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            earned = np.where(use_weight, raw_earned * self._weight_values / raw_possible, raw_earned)
+        possible = np.where(use_weight, self._weight_values, raw_possible)
+
+        earned = np.where(from_submissions, submission_earned, earned)
+        possible = np.where(from_submissions, submission_possible, possible)
+        raw_earned[from_submissions] = np.nan
+        raw_possible[from_submissions] = np.nan
+        earned[~valid] = 0.0
+        possible[~valid] = 0.0
+
+        return BatchScores(
+            valid=valid,
+            raw_earned=raw_earned,
+            raw_possible=raw_possible,
+            earned=earned,
+            possible=possible,
+            graded=valid & self._explicit_graded & (possible > 0),
+            first_attempted=np.where(from_submissions, submission_created, csm_created),
+            attempted_at=np.where(from_submissions, submission_attempted_at, csm_attempted_at),
+        )
+
+    def _get_subsection_totals(self, users, scores):
+        """
+        Returns the graded earned and possible points of the given users in
+        each subsection, as arrays of users by subsections, followed by the
+        lists of the all and graded AggregatedScores of the users in each
+        subsection.
+        """
+        shape = (len(users), len(self._subsection_keys))
+        graded_earned, graded_possible = np.zeros(shape), np.zeros(shape)
+        all_totals, graded_totals = [], []
+        graded_problem_earned = np.where(scores.graded, scores.earned, 0.0)
+        graded_problem_possible = np.where(scores.graded, scores.possible, 0.0)
+        for subsection_index, problems in enumerate(self._subsection_problems):
+            all_earned = _sequential_sum(scores.earned[:, problems])
+            all_possible = _sequential_sum(scores.possible[:, problems])
+            graded_earned[:, subsection_index] = _sequential_sum(graded_problem_earned[:, problems])
+            graded_possible[:, subsection_index] = _sequential_sum(graded_problem_possible[:, problems])
+            all_first_attempted = self._get_first_attempted(scores, problems, scores.valid)
+            graded_first_attempted = self._get_first_attempted(scores, problems, scores.graded)
+            all_totals.append([
+                AggregatedScore(earned, possible, False, first_attempted=first_attempted)
+                for earned, possible, first_attempted in zip(all_earned, all_possible, all_first_attempted)
+            ])
+            graded_totals.append([
+                AggregatedScore(earned, possible, True, first_attempted=first_attempted)
+                for earned, possible, first_attempted in zip(
+                    graded_earned[:, subsection_index], graded_possible[:, subsection_index], graded_first_attempted,
+                )
+            ])
+        return graded_earned, graded_possible, all_totals, graded_totals
+
+    @staticmethod
+    def _get_first_attempted(scores, problems, mask):
+        """
+        Returns, for each user, the earliest time at which the user attempted
+        one of the given problems where mask is set, or None.
+        """
+        if not problems.size:
+            return [None] * scores.valid.shape[0]
+        attempted_at = np.where(mask[:, problems], scores.attempted_at[:, problems], np.inf)
+        earliest = attempted_at.argmin(axis=1)
+        return [
+            scores.first_attempted[user_index, problems[index]]
+            if attempted_at[user_index, index] != np.inf else None
+            for user_index, index in enumerate(earliest)
+        ]
+
+    def _get_grader_percents(self, graded_earned, graded_possible):
+        """
+        Returns the percent of each user computed by the course grader, from
+        the graded earned and possible points of the users in each subsection.
+        """
+        # Like compute_percent, for all users and subsections.
+        has_possible = graded_possible > 0
+        percents = np.around(
+            np.divide(graded_earned, graded_possible, out=np.zeros_like(graded_earned), where=has_possible),
+            decimals=2,
+        )
+
+        total_percents = np.zeros(graded_earned.shape[0])
+        for subgrader, _, weight in self.course_data.course.grader.subgraders:
+            assignment_type_percents = self._get_assignment_type_percents(subgrader, percents, has_possible)
+            total_percents = total_percents + assignment_type_percents * weight
+        return total_percents
+
+    def _get_assignment_type_percents(self, subgrader, percents, has_possible):
+        """
+        Returns the percent of each user computed by the given
+        AssignmentFormatGrader, from the percents of the users in each
+        subsection.
+        """
+        subsections = self._subsections_by_format.get(subgrader.type, [])
+        min_count = int(float(subgrader.min_count))
+        num_slots = max(min_count, len(subsections))
+        values = np.zeros((percents.shape[0], num_slots))
+        counts = np.zeros(percents.shape[0], dtype=int)
+        if subsections:
+            # Like graded_subsections_by_format, only keep the subsections with possible points,
+            # moving them to the front while keeping their order.
+            included = has_possible[:, subsections]
+            order = np.argsort(~included, axis=1, kind='stable')
+            included_percents = np.where(included, percents[:, subsections], 0.0)
+            values[:, :len(subsections)] = np.take_along_axis(included_percents, order, axis=1)
+            counts = included.sum(axis=1)
+
+        # Each user has max(min_count, count) scores, padded with zeros.
+        num_scores = np.maximum(min_count, counts)
+        if subgrader.drop_count > 0:
+            # Drop the lowest scores, and the last ones of equal scores, like total_with_drops does.
+            keys = np.where(np.arange(num_slots) < num_scores[:, None], -values, -np.inf)
+            ranking = np.argsort(keys, axis=1, kind='stable')
+            np.put_along_axis(values, ranking[:, max(num_slots - subgrader.drop_count, 0):], 0.0, axis=1)
+
+        totals = _sequential_sum(values)
+        num_kept = num_scores - subgrader.drop_count
+        return np.where(num_kept > 0, totals / np.maximum(num_kept, 1), totals)
+
+    def _problem_scores_getter(self, scores, user_index, subsection_index):
+        """
+        Returns a function that builds the problem scores of the given user in
+        the given subsection, as CreateSubsectionGrade does.
+        """
+        def get_problem_scores():
+            problem_scores = OrderedDict()
+            for problem_index in self._subsection_problems[subsection_index]:
+                index = user_index, problem_index
+                if scores.valid[index]:
+                    problem_scores[self._problem_keys[problem_index]] = ProblemScore(
+                        _none_if_nan(scores.raw_earned[index]),
+                        _none_if_nan(scores.raw_possible[index]),
+                        float(scores.earned[index]),
+                        float(scores.possible[index]),
+                        self._weights[problem_index],
+                        bool(scores.graded[index]),
+                        first_attempted=scores.first_attempted[index],
+                    )
+            return problem_scores
+        return get_problem_scores
@@ -72,6 +72,29 @@ WRITABLE_GRADEBOOK = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.writable_gradebook',
 # .. toggle_tickets: https://github.com/openedx/edx-platform/pull/21389
 BULK_MANAGEMENT = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.bulk_management', __name__, LOG_PREFIX)
 
+# .. toggle_name: grades.use_batch_grading
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, recomputing the grades of many learners (e.g. in compute_grades_for_course)
+#   grades them in batches, sharing one transformed course structure and computing their subsection, assignment
+#   type and course percentages with array operations. Learners with grade overrides, staff or beta tester access
+#   or personal date overrides, and all learners of courses with content that varies by learner, are still graded
+#   one at a time.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+BATCH_GRADING = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.use_batch_grading', __name__, LOG_PREFIX)
+
+# .. toggle_name: grades.share_course_structures
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, recomputing the grades of many learners (e.g. in compute_grades_for_course)
+#   transforms the course structure once for each equivalence class of learners with the same access to the course
+#   (staff and beta tester access, content type gating, partition groups, enrollment track and schedule), and shares
+#   it between the learners of the class, rather than transforming it for every learner.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+SHARE_COURSE_STRUCTURES = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.share_course_structures', __name__, LOG_PREFIX)
+
 
 def is_writable_gradebook_enabled(course_key):
     """
@@ -85,3 +108,18 @@ def gradebook_bulk_management_enabled(course_key):
     Returns whether bulk management features should be specially enabled for a given course.
     """
     return BULK_MANAGEMENT.is_enabled(course_key)
+
+
+def use_batch_grading(course_key):
+    """
+    Returns whether the grades of many learners should be recomputed in batches for the given course.
+    """
+    return BATCH_GRADING.is_enabled(course_key)
+
+
+def share_course_structures(course_key):
+    """
+    Returns whether learners with the same access to the given course should share transformed course structures
+    when their grades are recomputed.
+    """
+    return SHARE_COURSE_STRUCTURES.is_enabled(course_key)
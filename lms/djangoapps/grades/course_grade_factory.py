@@ -2,6 +2,7 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 from openedx.core.djangoapps.signals.signals import (
@@ -9,10 +10,13 @@ from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_NOW_FAILED,
     COURSE_GRADE_NOW_PASSED
 )
+from .batch import BATCH_SIZE, BatchCourseGrader
+from .config.waffle import share_course_structures, use_batch_grading
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
 from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .structure_cache import StructureEquivalenceCache
 
 log = getLogger(__name__)
 
@@ -93,11 +97,54 @@ class CourseGradeFactory:
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
+        # Users with the same access to the course share their transformed
+        # course structure when their grades are recomputed.
+        structure_cache = None
+        if force_update and share_course_structures(course_data.course_key):
+            structure_cache = StructureEquivalenceCache(course_data)
+
+        if force_update and use_batch_grading(course_data.course_key):
+            yield from self._iter_batch_grade_results(users, course_data, structure_cache)
+            return
         for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+            yield self._iter_grade_result(user, course_data, force_update, structure_cache=structure_cache)
+
+    def _iter_batch_grade_results(self, users, course_data, structure_cache=None):
+        """
+        Updates the grades of the given users in batches of BATCH_SIZE users,
+        yielding a GradeResult for each of them. Users that the
+        BatchCourseGrader can't grade are graded one at a time.
+        """
+        batch_grader = BatchCourseGrader(course_data)
+        users = iter(users)
+        while True:
+            batch = list(islice(users, BATCH_SIZE))
+            if not batch:
+                return
+            try:
+                batch_course_grades = batch_grader.grade(batch)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(
+                    'Grades: Cannot grade a batch of students in course %s, grading them one at a time.',
+                    course_data.course_key,
+                )
+                batch_course_grades = {}
+            for user in batch:
+                yield self._iter_grade_result(
+                    user, course_data, True, batch_course_grades.get(user.id), structure_cache=structure_cache,
+                )
 
-    def _iter_grade_result(self, user, course_data, force_update):  # lint-amnesty, pylint: disable=missing-function-docstring
+    def _iter_grade_result(self, user, course_data, force_update, batch_course_grade=None, structure_cache=None):  # lint-amnesty, pylint: disable=missing-function-docstring
         try:
+            if batch_course_grade is not None:
+                course_grade = self._update(
+                    user,
+                    batch_course_grade.course_data,
+                    force_update_subsections=True,
+                    course_grade=batch_course_grade,
+                )
+                return self.GradeResult(user, course_grade, None)
+
             kwargs = {
                 'user': user,
                 'course': course_data.course,
@@ -106,6 +153,8 @@ class CourseGradeFactory:
             }
             if force_update:
                 kwargs['force_update_subsections'] = True
+            if structure_cache is not None:
+                kwargs['course_structure'] = structure_cache.get(user)
 
             method = CourseGradeFactory().update if force_update else CourseGradeFactory().read
             course_grade = method(**kwargs)
@@ -148,22 +197,26 @@ class CourseGradeFactory:
         )
 
     @staticmethod
-    def _update(user, course_data, force_update_subsections=False):
+    def _update(user, course_data, force_update_subsections=False, course_grade=None):
         """
         Computes, saves, and returns a CourseGrade object for the
         given user and course.
         Sends a COURSE_GRADE_CHANGED signal to listeners and
         COURSE_GRADE_NOW_PASSED if learner has passed course or
         COURSE_GRADE_NOW_FAILED if learner is now failing course
+
+        If a course_grade is given (e.g. by the BatchCourseGrader), it is
+        saved instead of a newly computed one.
         """
         if force_update_subsections:
             prefetch_grade_overrides_and_visible_blocks(user, course_data.course_key)
 
-        course_grade = CourseGrade(
-            user,
-            course_data,
-            force_update_subsections=force_update_subsections
-        )
+        if course_grade is None:
+            course_grade = CourseGrade(
+                user,
+                course_data,
+                force_update_subsections=force_update_subsections
+            )
         course_grade = course_grade.update()
 
         should_persist = course_grade.attempted
@@ -28,7 +28,7 @@ from simple_history.models import HistoricalRecords
 
 from lms.djangoapps.courseware.fields import UnsignedBigIntAutoField
 from lms.djangoapps.grades import events  # lint-amnesty, pylint: disable=unused-import
-from openedx.core.lib.cache_utils import get_cache
+from openedx.core.lib.cache_utils import BoundedLRUCache, get_cache
 from lms.djangoapps.grades.signals.signals import (
     COURSE_GRADE_PASSED_FIRST_TIME,
     COURSE_GRADE_PASSED_UPDATE_IN_LEARNER_PATHWAY
@@ -38,11 +38,36 @@ log = logging.getLogger(__name__)
 
 BLOCK_RECORD_LIST_VERSION = 1
 
+# The maximum number of serialized block record lists memoized by a process.
+SERIALIZED_BLOCK_RECORD_LISTS_MAX_SIZE = 10000
+
 # Used to serialize information about a block at the time it was used in
 # grade calculation.
 BlockRecord = namedtuple('BlockRecord', ['locator', 'weight', 'raw_possible', 'graded'])
 
 
+def _block_record_list_key(block_record_list):
+    """
+    Returns the key of the given BlockRecordList in the memo of serialized
+    block record lists.  The types of the values are part of the key, since
+    e.g. 1 and 1.0 are equal but are serialized differently.
+    """
+    return (
+        block_record_list.course_key,
+        block_record_list.version,
+        tuple(
+            (block, tuple(type(value) for value in block))
+            for block in block_record_list.blocks
+        ),
+    )
+
+
+# The (json_value, hash_value) pairs of recently serialized block record lists.
+# Regrading a course serializes and hashes the same few lists of visible blocks
+# for every learner, so each distinct list is only serialized once.
+_serialized_block_record_lists = BoundedLRUCache(SERIALIZED_BLOCK_RECORD_LISTS_MAX_SIZE)
+
+
 class BlockRecordList:
     """
     An immutable ordered list of BlockRecord objects.
@@ -80,7 +105,7 @@ class BlockRecordList:
         supported by adding a label indicated which algorithm was used, e.g.,
         "sha256$j0NDRmSPa5bfid2pAcUXaxCm2Dlh3TwayItZstwyeqQ=".
         """
-        return b64encode(sha1(self.json_value.encode('utf-8')).digest()).decode('utf-8')
+        return self._serialized[1]
 
     @lazy
     def json_value(self):
@@ -88,6 +113,31 @@ class BlockRecordList:
         Return a JSON-serialized version of the list of block records, using a
         stable ordering.
         """
+        return self._serialized[0]
+
+    @lazy
+    def _serialized(self):
+        """
+        Returns the (json_value, hash_value) pair of the list of block records,
+        memoized by the process for identical lists.
+        """
+        try:
+            key = _block_record_list_key(self)
+            serialized = _serialized_block_record_lists.get(key)
+        except TypeError:
+            # Unhashable values can't be memoized.
+            key = serialized = None
+        if serialized is None:
+            json_value = self._to_json()
+            serialized = json_value, b64encode(sha1(json_value.encode('utf-8')).digest()).decode('utf-8')
+            if key is not None:
+                _serialized_block_record_lists.set(key, serialized)
+        return serialized
+
+    def _to_json(self):
+        """
+        Serializes the list of block records to JSON.
+        """
         list_of_block_dicts = [block._asdict() for block in self.blocks]
         for block_dict in list_of_block_dicts:
             block_dict['locator'] = str(block_dict['locator'])  # BlockUsageLocator is not json-serializable
@@ -190,12 +240,16 @@ class VisibleBlocks(models.Model):
         if prefetched is not None:
             model = prefetched.get(blocks.hash_value)
             if not model:
-                # We still have to do a get_or_create, because
-                # another user may have had this block hash created,
-                # even if the user we checked the cache for hasn't yet.
-                model, _ = cls.objects.get_or_create(
-                    hashed=blocks.hash_value, blocks_json=blocks.json_value, course_id=blocks.course_key,
-                )
+                interned = cls._interned(blocks.course_key)
+                model = interned.get(blocks.hash_value)
+                if not model:
+                    # We still have to do a get_or_create, because
+                    # another user may have had this block hash created,
+                    # even if the user we checked the cache for hasn't yet.
+                    model, _ = cls.objects.get_or_create(
+                        hashed=blocks.hash_value, blocks_json=blocks.json_value, course_id=blocks.course_key,
+                    )
+                    interned[model.hashed] = model
                 cls._update_cache(user_id, blocks.course_key, [model])
         else:
             model, _ = cls.objects.get_or_create(
@@ -258,10 +312,26 @@ class VisibleBlocks(models.Model):
         Bulk creates VisibleBlocks for the given iterator of
         BlockRecordList objects for the given user and course_key, but
         only for those that aren't already created.
+
+        The VisibleBlocks of other users of the course are interned for the
+        duration of the request (or task), so only the block record lists never
+        seen before are looked up in bulk, and only those that don't exist yet
+        are inserted.
         """
         cached_records = cls.bulk_read(user_id, course_key)
+        interned = cls._interned(course_key)
         non_existent_brls = {brl for brl in block_record_lists if brl.hash_value not in cached_records}
-        cls.bulk_create(user_id, course_key, non_existent_brls)
+        known_visible_blocks = [interned[brl.hash_value] for brl in non_existent_brls if brl.hash_value in interned]
+        unknown_brls = {brl for brl in non_existent_brls if brl.hash_value not in interned}
+        if unknown_brls:
+            existing_visible_blocks = list(cls.objects.filter(hashed__in=[brl.hash_value for brl in unknown_brls]))
+            existing_hashes = {visible_blocks.hashed for visible_blocks in existing_visible_blocks}
+            known_visible_blocks += existing_visible_blocks
+            new_brls = {brl for brl in unknown_brls if brl.hash_value not in existing_hashes}
+            if new_brls:
+                cls.bulk_create(user_id, course_key, new_brls)
+        cls._update_cache(user_id, course_key, known_visible_blocks)
+        interned.update(cls.bulk_read(user_id, course_key))
 
     @classmethod
     def _initialize_cache(cls, user_id, course_key):
@@ -288,6 +358,14 @@ class VisibleBlocks(models.Model):
             {visible_block.hashed: visible_block for visible_block in visible_blocks}
         )
 
+    @classmethod
+    def _interned(cls, course_key):
+        """
+        Returns the dict of the VisibleBlocks of the given course known in this
+        request (or task), by hash.
+        """
+        return get_cache(cls._CACHE_NAMESPACE).setdefault(f"visible_blocks_interned.{course_key}", {})
+
     @classmethod
     def _cache_key(cls, user_id, course_key):
         return f"visible_blocks_cache.{course_key}.{user_id}"
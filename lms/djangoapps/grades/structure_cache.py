@@ -0,0 +1,119 @@
+"""
+Sharing of transformed course structures between users with the same access.
+
+Recomputing the grades of every user of a course transforms the collected
+course structure for each of them, although most users of a course have the
+same access to its content, and so get identical structures.  The
+StructureEquivalenceCache keys users by everything that the course block
+access transformers vary on (staff and beta tester access, content type
+gating, partition groups, enrollment track and schedule), so that users in the
+same equivalence class share a single transformed structure.
+"""
+
+
+from collections import OrderedDict
+
+from edx_when.api import get_overrides_for_user
+from lazy import lazy
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.roles import CourseBetaTesterRole
+from lms.djangoapps.course_blocks.api import get_course_blocks, has_individual_student_override_provider
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from lms.djangoapps.courseware.access import has_access
+from openedx.core.djangoapps.schedules.models import Schedule
+from openedx.features.content_type_gating.models import ContentTypeGatingConfig
+from openedx.features.course_experience import RELATIVE_DATES_FLAG
+from xmodule.partitions.partitions_service import get_user_partition_groups
+
+# The maximum number of transformed structures kept by a StructureEquivalenceCache.
+MAX_CACHED_STRUCTURES = 20
+
+
+class StructureEquivalenceCache:
+    """
+    Caches the course structures transformed for users, by the equivalence
+    class of the users' access to the course.
+
+    Structures are transformed at a given time, so a cache should only be
+    used for the duration of a task.
+    """
+    def __init__(self, course_data, max_structures=MAX_CACHED_STRUCTURES):
+        self.course_data = course_data
+        self.max_structures = max_structures
+        self._structures = OrderedDict()
+
+    def get(self, user):
+        """
+        Returns the course structure transformed for the given user, or None
+        if the user's structure can't be shared with other users.
+        """
+        key = self.get_key(user)
+        if key is None:
+            return None
+        structure = self._structures.pop(key, None)
+        if structure is None:
+            structure = get_course_blocks(
+                user, self.course_data.location, collected_block_structure=self.course_data.collected_structure,
+            )
+            if len(self._structures) >= self.max_structures:
+                self._structures.popitem(last=False)
+        self._structures[key] = structure
+        return structure
+
+    def get_key(self, user):
+        """
+        Returns the key of the equivalence class of the given user, or None
+        if the user's structure may differ from those of all other users.
+        """
+        if not self._shares_structures:
+            return None
+        course_key = self.course_data.course_key
+        if any(True for _ in get_overrides_for_user(course_key, user)):
+            return None
+
+        enrollment_mode, _ = CourseEnrollment.enrollment_mode_for_user(user, course_key)
+        partition_groups = get_user_partition_groups(course_key, self._user_partitions, user, 'id')
+        return (
+            bool(has_access(user, 'staff', course_key)),
+            user.id in self._beta_tester_ids,
+            ContentTypeGatingConfig.enabled_for_enrollment(user=user, course_key=course_key),
+            enrollment_mode,
+            frozenset((partition_id, group.id) for partition_id, group in partition_groups.items()),
+            self._get_schedule_start(user),
+        )
+
+    @lazy
+    def _shares_structures(self):
+        """
+        Returns whether users of the course may share transformed structures.
+        """
+        if has_individual_student_override_provider():
+            return False
+        # Library content blocks select different children for each user.
+        return not any(block_key.block_type == 'library_content' for block_key in self.course_data.collected_structure)
+
+    @lazy
+    def _user_partitions(self):
+        return self.course_data.collected_structure.get_transformer_data(
+            UserPartitionTransformer, 'user_partitions', []
+        )
+
+    @lazy
+    def _beta_tester_ids(self):
+        return set(CourseBetaTesterRole(self.course_data.course_key).users_with_role().values_list('id', flat=True))
+
+    @lazy
+    def _uses_relative_dates(self):
+        return self.course_data.course.self_paced and RELATIVE_DATES_FLAG.is_enabled(self.course_data.course_key)
+
+    def _get_schedule_start(self, user):
+        """
+        Returns the start of the user's schedule, from which the relative
+        dates of self-paced courses are computed, or None if not relevant.
+        """
+        if not self._uses_relative_dates:
+            return None
+        return Schedule.objects.filter(
+            enrollment__user_id=user.id, enrollment__course_id=self.course_data.course_key,
+        ).values_list('start_date', flat=True).first()
@@ -70,15 +70,19 @@ class SubsectionGradeFactory:
         )
         self._unsaved_subsection_grades.clear()
 
-    def update(self, subsection, only_if_higher=None, score_deleted=False, force_update_subsections=False, persist_grade=True):  # lint-amnesty, pylint: disable=line-too-long
+    def update(self, subsection, only_if_higher=None, score_deleted=False, force_update_subsections=False, persist_grade=True, calculated_grade=None):  # lint-amnesty, pylint: disable=line-too-long
         """
         Updates the SubsectionGrade object for the student and subsection.
+
+        If a calculated_grade is given (e.g. by the BatchCourseGrader), it is
+        persisted instead of calculating the grade again.
         """
         self._log_event(log.debug, f"update, subsection: {subsection.location}", subsection)
 
-        calculated_grade = CreateSubsectionGrade(
-            subsection, self.course_data.structure, self._submissions_scores, self._csm_scores,
-        )
+        if calculated_grade is None:
+            calculated_grade = CreateSubsectionGrade(
+                subsection, self.course_data.structure, self._submissions_scores, self._csm_scores,
+            )
 
         if persist_grade:
             if only_if_higher:
@@ -4,15 +4,21 @@ Tests for the CourseGradeFactory class.
 from unittest.mock import patch
 
 import ddt
+from edx_toggles.toggles.testutils import override_waffle_flag
 
+from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.model_data import set_score
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
+from ..batch import BatchCourseGrade
+from ..config.waffle import BATCH_GRADING
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentCourseGrade
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
@@ -158,6 +164,58 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    def test_iter_force_update_batched(self):
+        users = [UserFactory() for _ in range(3)]
+        for user in users:
+            CourseEnrollment.enroll(user, self.course.id)
+        set_score(users[0].id, self.problem.location, 1, 2)
+        set_score(users[1].id, self.problem.location, 2, 2)
+        set_score(users[1].id, self.problem2.location, 1, 1)
+
+        def _iter_grades(batched):
+            """
+            Returns the course grades and the subsection totals of the users, updated with or without batches.
+            """
+            with override_waffle_flag(BATCH_GRADING, active=batched):
+                results = list(CourseGradeFactory().iter(users, course=self.course, force_update=True))
+            assert all(isinstance(course_grade, BatchCourseGrade) == batched for _, course_grade, _ in results)
+            return [
+                (
+                    user,
+                    course_grade.percent,
+                    course_grade.letter_grade,
+                    {
+                        location: (
+                            subsection_grade.all_total.earned,
+                            subsection_grade.all_total.possible,
+                            subsection_grade.graded_total.earned,
+                            subsection_grade.graded_total.possible,
+                            subsection_grade.all_total.first_attempted,
+                        )
+                        for location, subsection_grade in course_grade.subsection_grades.items()
+                    },
+                    error,
+                )
+                for user, course_grade, error in results
+            ]
+
+        batched_grades = _iter_grades(batched=True)
+        assert [percent for _, percent, _, _, _ in batched_grades] == [0.25, 1.0, 0.0]
+        assert PersistentCourseGrade.read(users[1].id, self.course.id).percent_grade == 1.0
+        assert batched_grades == _iter_grades(batched=False)
+
+    def test_iter_force_update_batched_staff(self):
+        staff = UserFactory(is_staff=True)
+        set_score(staff.id, self.problem.location, 1, 2)
+        with override_waffle_flag(BATCH_GRADING, active=True):
+            results = list(CourseGradeFactory().iter(
+                [staff, self.request.user], course=self.course, force_update=True,
+            ))
+        # Staff users may see content that other learners can't, so they are graded one at a time.
+        assert not isinstance(results[0].course_grade, BatchCourseGrade)
+        assert results[0].course_grade.percent == 0.25
+        assert isinstance(results[1].course_grade, BatchCourseGrade)
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -16,6 +16,7 @@ import pytz
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.utils.timezone import now
+from edx_django_utils.cache import RequestCache
 from freezegun import freeze_time
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
@@ -58,6 +59,20 @@ class BlockRecordListTestCase(TestCase):
         assert brs.json_value == empty_json
         assert BlockRecordList.from_json(empty_json) == brs
 
+    def test_serialization_memoized(self):
+        locator = BlockUsageLocator(course_key=self.course_key, block_type='problem', block_id='memoized')
+        with patch.object(BlockRecordList, '_to_json', autospec=True, side_effect=BlockRecordList._to_json) as mock:
+            brls = [
+                BlockRecordList.from_list([BlockRecord(locator, 1, 10, True)], self.course_key) for _ in range(2)
+            ]
+            assert brls[0].hash_value == brls[1].hash_value
+            assert mock.call_count == 1
+
+            # Equal values of different types are serialized differently.
+            float_brl = BlockRecordList.from_list([BlockRecord(locator, 1, 10.0, True)], self.course_key)
+            assert float_brl.json_value != brls[0].json_value
+            assert mock.call_count == 2
+
 
 class GradesModelTestCase(TestCase):
     """
@@ -183,6 +198,23 @@ class VisibleBlocksTest(GradesModelTestCase):
         assert stored_vblocks.pk != new_vblocks.pk
         assert stored_vblocks.hashed != new_vblocks.hashed
 
+    def test_bulk_get_or_create_interned(self):
+        """
+        Ensures that bulk_get_or_create doesn't look up or insert the visible
+        blocks already created for another user in the same request.
+        """
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        block_record_list = BlockRecordList.from_list([self.record_a, self.record_b], self.course_key)
+        VisibleBlocks.bulk_get_or_create(self.user_id, self.course_key, [block_record_list])
+        other_user_id = self.user_id + 1
+        with self.assertNumQueries(1):
+            VisibleBlocks.bulk_get_or_create(other_user_id, self.course_key, [block_record_list])
+        assert VisibleBlocks.objects.count() == 1
+        assert (
+            VisibleBlocks.bulk_read(other_user_id, self.course_key)[block_record_list.hash_value].pk ==
+            VisibleBlocks.objects.get().pk
+        )
+
     def test_blocks_property(self):
         """
         Ensures that, given an array of BlockRecord, creating visible_blocks
@@ -0,0 +1,62 @@
+"""
+Tests for the StructureEquivalenceCache class.
+"""
+from unittest.mock import patch
+
+from edx_toggles.toggles.testutils import override_waffle_flag
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.course_blocks.api import get_course_blocks
+
+from ..config.waffle import SHARE_COURSE_STRUCTURES
+from ..course_data import CourseData
+from ..course_grade_factory import CourseGradeFactory
+from ..structure_cache import StructureEquivalenceCache
+from .base import GradeTestBase
+
+
+class TestStructureEquivalenceCache(GradeTestBase):
+    """
+    Tests sharing transformed course structures between users.
+    """
+    def setUp(self):
+        super().setUp()
+        self.users = [UserFactory() for _ in range(3)]
+        for user in self.users:
+            CourseEnrollment.enroll(user, self.course.id)
+        self.cache = StructureEquivalenceCache(CourseData(None, course=self.course))
+
+    def test_shared_structure(self):
+        with patch(
+            'lms.djangoapps.grades.structure_cache.get_course_blocks', wraps=get_course_blocks,
+        ) as mock_get_course_blocks:
+            structures = [self.cache.get(user) for user in self.users]
+        assert mock_get_course_blocks.call_count == 1
+        assert all(structure is structures[0] for structure in structures)
+
+    def test_staff_structure(self):
+        staff = UserFactory(is_staff=True)
+        assert self.cache.get_key(staff) != self.cache.get_key(self.users[0])
+        assert self.cache.get(staff) is not self.cache.get(self.users[0])
+
+    def test_enrollment_mode(self):
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode='verified')
+        assert self.cache.get_key(self.users[0]) == self.cache.get_key(self.users[2])
+        assert self.cache.get_key(self.users[0]) != self.cache.get_key(self.users[1])
+
+    def test_max_structures(self):
+        cache = StructureEquivalenceCache(CourseData(None, course=self.course), max_structures=1)
+        staff = UserFactory(is_staff=True)
+        structure = cache.get(self.users[0])
+        cache.get(staff)
+        assert cache.get(self.users[1]) is not structure
+
+    def test_iter_force_update(self):
+        with override_waffle_flag(SHARE_COURSE_STRUCTURES, active=True), patch(
+            'lms.djangoapps.grades.structure_cache.get_course_blocks', wraps=get_course_blocks,
+        ) as mock_get_course_blocks:
+            results = list(CourseGradeFactory().iter(self.users, course=self.course, force_update=True))
+        assert mock_get_course_blocks.call_count == 1
+        assert all(result.error is None for result in results)
+        assert results[0].course_grade.course_data.structure is results[1].course_grade.course_data.structure
@@ -39,6 +39,7 @@ class GradesTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 4
     READ_VERSION = 4
+    SUPPORTS_INCREMENTAL_COLLECT = True
     FIELDS_TO_COLLECT = [
         'due',
         'format',
@@ -65,8 +66,13 @@ class GradesTransformer(BlockStructureTransformer):
         """
         Collects any information that's necessary to execute this
         transformer's transform method.
+
+        Supports incremental collection: the max scores and explicit
+        graded values of blocks that don't need to be collected are kept
+        as previously collected.
         """
         block_structure.request_xblock_fields(*cls.FIELDS_TO_COLLECT)
+        cls._collect_changed_subtrees(block_structure)
         cls._collect_max_scores(block_structure)
         collect_unioned_set_field(
             block_structure=block_structure,
@@ -117,6 +123,8 @@ class GradesTransformer(BlockStructureTransformer):
         block_types_to_ignore = {'course', 'chapter', 'sequential'}
 
         for block_key in block_structure.topological_traversal():
+            if not block_structure.needs_collect(block_key):
+                continue
             if block_key.block_type in block_types_to_ignore:
                 _set_field(block_key, None)
             else:
@@ -133,12 +141,29 @@ class GradesTransformer(BlockStructureTransformer):
                     explicit_from_parents = functools_reduce(lambda x, y: x or y, non_null_values_from_parents, None)
                     _set_field(block_key, explicit_from_parents)
 
+    @classmethod
+    def _collect_changed_subtrees(cls, block_structure):
+        """
+        When collecting incrementally, load the xBlocks of the ancestors
+        of the blocks that need to be collected, so that their requested
+        fields, notably 'subtree_edited_on', are collected again.
+        """
+        changed_subtrees = set()
+        for block_key in block_structure.post_order_traversal():
+            if block_structure.needs_collect(block_key):
+                changed_subtrees.add(block_key)
+            elif any(child_key in changed_subtrees for child_key in block_structure.get_children(block_key)):
+                block_structure.get_xblock(block_key)
+                changed_subtrees.add(block_key)
+
     @classmethod
     def _collect_max_scores(cls, block_structure):
         """
         Collect the `max_score` for every block in the provided `block_structure`.
         """
         for block_locator in block_structure.post_order_traversal():
+            if not block_structure.needs_collect(block_locator):
+                continue
             block = block_structure.get_xblock(block_locator)
             if getattr(block, 'has_score', False):
                 cls._collect_max_score(block_structure, block)
@@ -36,6 +36,19 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports, partition the enrollees into shards of
+#   GRADE_REPORT_USERS_PER_SHARD learners that are graded in parallel by separate celery subtasks. Each shard
+#   checkpoints its rows as a partial CSV in the report store, and a final subtask merges the partial CSVs
+#   into the report.
+# .. toggle_use_cases: opt_in
+# .. toggle_creation_date: 2026-10-18
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
 
 def optimize_get_learners_switch_enabled():
     """
@@ -69,3 +82,11 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if course grade reports should be generated in
+    parallel shards by separate subtasks, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
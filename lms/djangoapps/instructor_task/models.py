@@ -318,6 +318,27 @@ class DjangoStorageReportStore(ReportStore):
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer, parent_dir)
 
+    def exists(self, course_id, filename, parent_dir=''):
+        """
+        Return whether a file named `filename` has been stored for the
+        given `course_id`.
+        """
+        return self.storage.exists(self.path_to(course_id, filename, parent_dir))
+
+    def open(self, course_id, filename, parent_dir=''):
+        """
+        Return a binary file-like object for reading the contents of the
+        file named `filename` stored for the given `course_id`.
+        """
+        return self.storage.open(self.path_to(course_id, filename, parent_dir), 'rb')
+
+    def delete(self, course_id, filename, parent_dir=''):
+        """
+        Delete the file named `filename` stored for the given `course_id`,
+        if it exists.
+        """
+        self.storage.delete(self.path_to(course_id, filename, parent_dir))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
@@ -11,7 +11,7 @@ from time import time
 from uuid import uuid4
 
 import psutil
-from celery.states import READY_STATES, RETRY, SUCCESS
+from celery.states import FAILURE, READY_STATES, RETRY, SUCCESS
 from django.core.cache import cache
 from django.db import DatabaseError, transaction
 
@@ -562,10 +562,10 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         num_remaining = subtask_dict['total'] - subtask_dict['succeeded'] - subtask_dict['failed']
 
         # If we're done with the last task, update the parent status to indicate that.
-        # At present, we mark the task as having succeeded.  In future, we should see
-        # if there was a catastrophic failure that occurred, and figure out how to
-        # report that here.
-        if num_remaining <= 0:
+        # At present, we mark the task as having succeeded, unless it was already
+        # marked as failed (see fail_subtask).  In future, we should see if there was
+        # a catastrophic failure that occurred, and figure out how to report that here.
+        if num_remaining <= 0 and entry.task_state != FAILURE:
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
@@ -31,7 +31,12 @@ from lms.djangoapps.bulk_email.tasks import perform_delegate_email_batches
 from lms.djangoapps.instructor_task.tasks_base import BaseInstructorTask
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses,
+    ShardedCourseGradeReport
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -49,7 +54,7 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     rescore_problem_module_state,
     reset_attempts_module_state
 )
-from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
+from lms.djangoapps.instructor_task.tasks_helper.runner import fail_subtask, run_main_task, run_subtask
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -197,6 +202,46 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+# The subtasks of a sharded grade report don't use BaseInstructorTask, whose handlers would
+# overwrite the progress of the InstructorTask that the other subtasks are still updating:
+# run_subtask and fail_subtask record their state instead.
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_shard(entry_id, xblock_instance_args, shard, subtask_status_dict):
+    """
+    Grade a single shard of a course's enrollees as a subtask of a sharded
+    grade report.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = gettext_noop('graded')
+    task_fn = partial(ShardedCourseGradeReport.generate_shard, xblock_instance_args, shard=shard)
+    return run_subtask(entry_id, task_fn, action_name, subtask_status_dict)
+
+
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_merge(entry_id, xblock_instance_args, num_shards, subtask_status_dict):
+    """
+    Merge the shards of a sharded grade report and push the results to an
+    S3 bucket for download.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = gettext_noop('graded')
+    task_fn = partial(ShardedCourseGradeReport.merge_shards, xblock_instance_args, num_shards=num_shards)
+    return run_subtask(entry_id, task_fn, action_name, subtask_status_dict)
+
+
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_merge_failed(_request, exc, _traceback, entry_id, subtask_status_dict):
+    """
+    Errback of the merge of a sharded grade report, which is called instead
+    of the merge when any of its shards failed, or after the merge itself
+    failed.  Marks the merge subtask, and thereby the grade report, as failed.
+    """
+    fail_subtask(entry_id, subtask_status_dict, exc)
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
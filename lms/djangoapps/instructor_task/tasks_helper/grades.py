@@ -2,16 +2,22 @@
 Functionality for generating grade reports.
 """
 
+import codecs
 import csv
+import json
 import logging
+import os
 import re
+import shutil
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from itertools import chain
 from tempfile import TemporaryFile
 
 from time import time
+from uuid import uuid4
 
+from celery import chord
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from lazy import lazy
@@ -22,6 +28,7 @@ from six.moves import zip_longest
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.roles import BulkRoleCache
+from common.djangoapps.util.db import outer_atomic
 from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.course_blocks.api import get_course_blocks
@@ -35,7 +42,10 @@ from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
     use_on_disk_grade_reporting,
+    use_sharded_grade_reporting,
 )
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, initialize_subtask_info
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -80,7 +90,7 @@ class _CourseGradeReportContext:
     boundaries.
     """
 
-    def __init__(self, _xblock_instance_args, _entry_id, course_id, _task_input, action_name):
+    def __init__(self, _xblock_instance_args, _entry_id, course_id, _task_input, action_name, user_id_range=None):
         self.task_info_string = (
             'Task: {task_id}, '
             'InstructorTask ID: {entry_id}, '
@@ -98,6 +108,11 @@ class _CourseGradeReportContext:
         self.report_for_verified_only = course_grade_report_verified_only(self.course_id)
         self.upload_parent_dir = _task_input.get('upload_parent_dir', '')
         self.upload_filename = _task_input.get('filename', 'grade_report')
+        self.xblock_instance_args = _xblock_instance_args
+        self.entry_id = _entry_id
+        # Inclusive (min, max) range of the ids of the users to include in
+        # the report, when generating a single shard of a sharded report.
+        self.user_id_range = user_id_range
 
     @lazy
     def course(self):
@@ -270,7 +285,7 @@ class _CourseGradeBulkContext:  # lint-amnesty, pylint: disable=missing-class-do
         self.certs = _CertificateBulkContext(context, users)
         self.teams = _TeamBulkContext(context, users)
         self.enrollments = _EnrollmentBulkContext(context, users)
-        bulk_cache_cohorts(context.course_id, users)
+        bulk_cache_cohorts(context.course_id, users, use_membership_index=True)
         BulkRoleCache.prefetch(users)
         prefetch_course_and_subsection_grades(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
@@ -451,7 +466,7 @@ class GradeReportBase:
             args = [iter(iterable)] * chunk_size
             return zip_longest(*args, fillvalue=fillvalue)
 
-        def get_enrolled_learners_for_course(course_id, verified_only=False):
+        def get_enrolled_learners_for_course(course_id, verified_only=False, user_id_range=None):
             """
             Get all the enrolled users in a course chunk by chunk.
             This generator method fetches & loads the enrolled user objects on demand which in chunk
@@ -462,6 +477,8 @@ class GradeReportBase:
             }
             if verified_only:
                 filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+            if user_id_range is not None:
+                filter_kwargs['id__range'] = user_id_range
 
             user_ids_list = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
             user_chunks = grouper(user_ids_list)
@@ -479,7 +496,8 @@ class GradeReportBase:
 
         return get_enrolled_learners_for_course(
             course_id=self.context.course_id,
-            verified_only=self.context.report_for_verified_only
+            verified_only=self.context.report_for_verified_only,
+            user_id_range=getattr(self.context, 'user_id_range', None),
         )
 
     def log_additional_info_for_testing(self, message):
@@ -519,6 +537,8 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            if use_sharded_grade_reporting(course_id) and _entry_id is not None:
+                return ShardedCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             if use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
@@ -706,6 +726,222 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
+    """
+    Course Grade Report that is generated in parallel across celery workers.
+
+    The enrollees are partitioned by user id into shards, each of which is
+    graded by a separate subtask that checkpoints its rows as a partial CSV
+    in the report store.  The shards are queued as a celery chord, so the
+    final merge subtask that stitches the partial CSVs together into the
+    report only runs once all shards have succeeded; if any shard fails,
+    the report is marked as failed instead.  Shards
+    whose checkpoint already exists are not graded again, so a shard or
+    merge subtask that is redelivered after a worker is lost only redoes
+    the unfinished work.
+    """
+
+    def _generate(self):
+        """
+        Partitions the enrollees into shards and queues a subtask for each
+        shard.  Returns the task progress as stored in the InstructorTask,
+        which is updated by the subtasks from here on.
+        """
+        # pylint: disable=import-outside-toplevel
+        from lms.djangoapps.instructor_task.tasks import (
+            calculate_grades_csv_merge,
+            calculate_grades_csv_merge_failed,
+            calculate_grades_csv_shard
+        )
+
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            # The task is being rerun after its subtasks were queued, so
+            # don't queue them again.
+            self.context.update_status('ShardedCourseGradeReport - Subtasks already queued')
+            return json.loads(entry.task_output)
+
+        self.context.update_status('ShardedCourseGradeReport - 1: Partitioning enrollees into shards')
+        shards = self._shards(settings.GRADE_REPORT_USERS_PER_SHARD)
+        shard_ids = [str(uuid4()) for _ in shards]
+        merge_id = str(uuid4())
+        total_num_users = sum(shard['num_users'] for shard in shards)
+        with outer_atomic():
+            progress = initialize_subtask_info(
+                entry, self.context.action_name, total_num_users, shard_ids + [merge_id]
+            )
+
+        self.context.update_status(f'ShardedCourseGradeReport - 2: Queueing {len(shards)} shards')
+        merge_status = SubtaskStatus.create(merge_id).to_dict()
+        merge = calculate_grades_csv_merge.si(
+            entry.id, self.context.xblock_instance_args, len(shards), merge_status,
+        ).set(task_id=merge_id)
+        merge.link_error(calculate_grades_csv_merge_failed.s(entry.id, merge_status))
+        if not shards:
+            merge.apply_async()
+            return progress
+
+        # The merge is only run once every shard succeeded.  If any shard
+        # fails, the errback marks the merge, and thereby the report, as
+        # failed instead; if the merge itself fails, it marks the report.
+        chord(
+            [
+                calculate_grades_csv_shard.si(
+                    entry.id, self.context.xblock_instance_args, shard, SubtaskStatus.create(shard_id).to_dict(),
+                ).set(task_id=shard_id)
+                for shard_id, shard in zip(shard_ids, shards)
+            ],
+            merge,
+        ).apply_async()
+        return progress
+
+    def _shards(self, users_per_shard):
+        """
+        Returns a list of dicts describing each shard of enrollees, with the
+        shard's 'index', the inclusive 'min_user_id' and 'max_user_id' of
+        its users and the 'num_users' it contains.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        user_ids = get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id')
+
+        shards = []
+        for user_id in user_ids.iterator():
+            if shards and shards[-1]['num_users'] < users_per_shard:
+                shards[-1]['max_user_id'] = user_id
+                shards[-1]['num_users'] += 1
+            else:
+                shards.append({'index': len(shards), 'min_user_id': user_id, 'max_user_id': user_id, 'num_users': 1})
+        return shards
+
+    @classmethod
+    def generate_shard(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name, shard):
+        """
+        Public method to generate the partial grade report for a single shard.
+        """
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(
+                _xblock_instance_args, _entry_id, course_id, _task_input, action_name,
+                user_id_range=(shard['min_user_id'], shard['max_user_id']),
+            )
+            return cls(context)._generate_shard(shard['index'])  # pylint: disable=protected-access
+
+    @classmethod
+    def merge_shards(cls, _xblock_instance_args, _entry_id, course_id, _task_input, action_name, num_shards):
+        """
+        Public method to merge the partial grade reports of all shards into
+        the final grade report.
+        """
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
+            return cls(context)._merge_shards(num_shards)  # pylint: disable=protected-access
+
+    def _generate_shard(self, shard_index):
+        """
+        Grades the users of the shard and checkpoints the resulting rows,
+        without headers, as partial CSVs in the report store.  The success
+        rows are stored last, so their presence marks the shard as done.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        shard_dir = grade_report_shard_dir(report_store, self.context.course_id, self.context.entry_id)
+        success_filename, error_filename = grade_report_shard_filenames(shard_index)
+
+        if report_store.exists(self.context.course_id, success_filename, shard_dir):
+            self.context.update_status(f'ShardedCourseGradeReport - Shard {shard_index}: Found checkpoint')
+            succeeded = self._count_shard_rows(report_store, shard_dir, success_filename)
+            failed = self._count_shard_rows(report_store, shard_dir, error_filename)
+        else:
+            self.context.update_status(f'ShardedCourseGradeReport - Shard {shard_index}: Grading')
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                success_writer = csv.writer(success_file)
+                error_writer = csv.writer(error_file)
+                succeeded, failed = 0, 0
+                for success_rows, error_rows in self._batched_rows():
+                    success_writer.writerows(success_rows)
+                    error_writer.writerows(error_rows)
+                    succeeded += len(success_rows)
+                    failed += len(error_rows)
+
+                # Remove the error rows of any earlier, interrupted run of this shard.
+                report_store.delete(self.context.course_id, error_filename, shard_dir)
+                if failed:
+                    error_file.seek(0)
+                    report_store.store(self.context.course_id, error_filename, error_file, shard_dir)
+                success_file.seek(0)
+                report_store.store(self.context.course_id, success_filename, success_file, shard_dir)
+
+        self.context.task_progress.succeeded = succeeded
+        self.context.task_progress.failed = failed
+        self.context.task_progress.attempted = succeeded + failed
+        self.context.task_progress.total = self.context.task_progress.attempted
+        return self.context.update_status(f'ShardedCourseGradeReport - Shard {shard_index}: Completed')
+
+    def _merge_shards(self, num_shards):
+        """
+        Stitches the partial CSVs of all shards, in order, into the final
+        report and uploads it, then removes the partial CSVs.
+        """
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        shard_dir = grade_report_shard_dir(report_store, self.context.course_id, self.context.entry_id)
+        shard_filenames = [grade_report_shard_filenames(shard_index) for shard_index in range(num_shards)]
+
+        self.context.update_status('ShardedCourseGradeReport - 3: Merging shards')
+        with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+            csv.writer(success_file).writerow(self._success_headers())
+            csv.writer(error_file).writerow(self._error_headers())
+            has_errors = False
+            for success_filename, error_filename in shard_filenames:
+                if not report_store.exists(self.context.course_id, success_filename, shard_dir):
+                    raise ValueError(f'Missing checkpoint {success_filename} for grade report shard.')
+                self._append_shard(report_store, shard_dir, success_filename, success_file)
+                if report_store.exists(self.context.course_id, error_filename, shard_dir):
+                    self._append_shard(report_store, shard_dir, error_filename, error_file)
+                    has_errors = True
+
+            self.context.update_status('ShardedCourseGradeReport - 4: Uploading files')
+            self.upload_temp_files(success_file, error_file, has_errors)
+
+        for filenames in shard_filenames:
+            for filename in filenames:
+                report_store.delete(self.context.course_id, filename, shard_dir)
+        return self.context.update_status('ShardedCourseGradeReport - 5: Completed grades')
+
+    def _append_shard(self, report_store, shard_dir, filename, output_file):
+        """
+        Appends the contents of the given partial CSV to the output file.
+        """
+        with report_store.open(self.context.course_id, filename, shard_dir) as shard_file:
+            shutil.copyfileobj(codecs.getreader('utf-8')(shard_file), output_file)
+
+    def _count_shard_rows(self, report_store, shard_dir, filename):
+        """
+        Returns the number of rows in the given partial CSV, if it exists.
+        """
+        if not report_store.exists(self.context.course_id, filename, shard_dir):
+            return 0
+        with report_store.open(self.context.course_id, filename, shard_dir) as shard_file:
+            return sum(1 for _ in csv.reader(codecs.iterdecode(shard_file, 'utf-8')))
+
+
+def grade_report_shard_dir(report_store, course_id, entry_id):
+    """
+    Returns the report store directory containing the partial CSVs written
+    by the shards of the given grade report task.  It is nested within the
+    course's report directory so the partial CSVs aren't listed as reports.
+    """
+    return os.path.join(report_store.path_to(course_id), 'grade_report_shards', str(entry_id))
+
+
+def grade_report_shard_filenames(shard_index):
+    """
+    Returns the (success, error) filenames of the partial CSVs of a shard.
+    """
+    return f'{shard_index:05d}.csv', f'{shard_index:05d}_err.csv'
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
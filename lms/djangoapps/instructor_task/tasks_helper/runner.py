@@ -8,13 +8,20 @@ import logging
 from time import time
 
 from celery import current_task
-from django.db import reset_queries
+from celery.states import FAILURE, READY_STATES, SUCCESS
+from django.db import reset_queries, transaction
 
 from common.djangoapps.util.db import outer_atomic
+from lms.djangoapps.instructor_task.exceptions import DuplicateTaskException
 from lms.djangoapps.instructor_task.models import PROGRESS, InstructorTask
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid, update_subtask_status
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# The maximum length of the output of an InstructorTask failed by fail_subtask, which
+# is less than that of the task_output column since running subtasks still update it.
+MAX_SUBTASK_FAILURE_OUTPUT_LENGTH = 960
+
 
 class TaskProgress:
     """
@@ -127,6 +134,95 @@ def run_main_task(entry_id, task_fcn, action_name):
     return task_progress
 
 
+def run_subtask(entry_id, task_fcn, action_name, subtask_status_dict):
+    """
+    Applies the `task_fcn` to the arguments defined in `entry_id` InstructorTask,
+    as one of the subtasks queued by its main task, and records the subtask's
+    status in the InstructorTask.
+
+    Arguments passed to `task_fcn` are the same as for `run_main_task`, and
+    `task_fcn` should return a task progress dict in the same format.  The
+    `subtask_status_dict` is the SubtaskStatus.to_dict() of the subtask.
+
+    Returns None, without applying `task_fcn`, if the subtask is a duplicate
+    that has already been (or is being) run by another worker.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    try:
+        check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+    except DuplicateTaskException:
+        TASK_LOG.warning('InstructorTask ID: %s, Skipping duplicate subtask %s', entry_id, current_task_id)
+        return None
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_input = json.loads(entry.task_input)
+
+    try:
+        task_progress = task_fcn(entry_id, course_id, task_input, action_name)
+    except Exception:
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress['succeeded'],
+        failed=task_progress['failed'],
+        skipped=task_progress['skipped'],
+        state=SUCCESS,
+    )
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+
+    # Release any queries that the connection has been hanging onto
+    reset_queries()
+
+    TASK_LOG.info(
+        'InstructorTask ID: %s, Task type: %s, Finishing subtask %s: %s',
+        entry_id, action_name, current_task_id, task_progress,
+    )
+    return task_progress
+
+
+def fail_subtask(entry_id, subtask_status_dict, exception):
+    """
+    Records the subtask described by `subtask_status_dict` as failed, unless
+    it already ran and failed, and marks the `entry_id` InstructorTask as
+    failed with the given `exception`, e.g. when a subtask it depends on failed.
+
+    The progress of the InstructorTask is kept in its output, next to the
+    message of `exception`, since the subtasks that are still running go on
+    updating it.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    entry = InstructorTask.objects.get(pk=entry_id)
+    recorded_status = json.loads(entry.subtasks)['status'].get(subtask_status.task_id, {})
+    if recorded_status.get('state') not in READY_STATES:
+        subtask_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+
+    with transaction.atomic():
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        task_progress = json.loads(entry.task_output)
+        task_progress['exception'] = type(exception).__name__
+        message = str(exception)
+        # Shorten the message until the output fits, leaving room for the counts to grow.  A
+        # character of the message takes up to 6 in the output, once escaped.
+        while True:
+            task_progress['message'] = message
+            too_long = len(json.dumps(task_progress)) - MAX_SUBTASK_FAILURE_OUTPUT_LENGTH
+            if too_long <= 0 or not message:
+                break
+            cut = too_long // 6 + 4
+            message = message[:-cut] + '...' if len(message) > cut else ''
+        entry.task_output = InstructorTask.create_output_for_success(task_progress)
+        entry.task_state = FAILURE
+        entry.save()
+    TASK_LOG.warning(
+        'InstructorTask ID: %s, Failing subtask %s: %s', entry_id, subtask_status.task_id, exception,
+    )
+
+
 def _get_current_task():
     """
     Stub to make it easier to test without actually running Celery.
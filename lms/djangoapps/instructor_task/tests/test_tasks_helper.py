@@ -7,6 +7,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
@@ -14,10 +15,12 @@ from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, Mock, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
@@ -38,6 +41,10 @@ from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsec
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import QUEUING
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus
+from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_merge_failed
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
@@ -46,6 +53,8 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
+    grade_report_shard_dir,
+    grade_report_shard_filenames,
 )
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
@@ -54,6 +63,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -82,6 +92,7 @@ _TEAMS_CONFIG = TeamsConfig({
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
 
 
 class InstructorGradeReportTestCase(TestReportMixin, InstructorTaskCourseTestCase):
@@ -472,6 +483,163 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
 
 
 # pylint: disable=protected-access
+@ddt.ddt
+class TestShardedCourseGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that CSV grade reports generated in parallel shards work.
+    """
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+        self.usernames = [f'student{i}' for i in range(5)]
+        for username in self.usernames:
+            self.create_student(username, f'{username}@example.com')
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_type=InstructorTaskTypes.GRADE_COURSE,
+        )
+        self.report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.shard_dir = grade_report_shard_dir(self.report_store, self.course.id, self.entry.id)
+
+    def _generate(self):
+        """
+        Generates the sharded grade report, running its subtasks eagerly.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            with patch(USE_SHARDED_GRADE_REPORT, return_value=True):
+                CourseGradeReport.generate(None, self.entry.id, self.course.id, {}, 'graded')
+        self.entry.refresh_from_db()
+
+    def _report_usernames(self):
+        """
+        Returns the usernames in the rows of the uploaded grade report.
+        """
+        links = self.report_store.links_for(self.course.id)
+        assert len(links) == 1
+        report_path = self.report_store.path_to(self.course.id, links[0][0])
+        with self.report_store.storage.open(report_path) as csv_file:
+            return [row['Username'] for row in unicodecsv.DictReader(csv_file)]
+
+    @ddt.data((1, 5), (2, 3), (10, 1))
+    @ddt.unpack
+    def test_sharded_report(self, users_per_shard, expected_num_shards):
+        with override_settings(GRADE_REPORT_USERS_PER_SHARD=users_per_shard):
+            self._generate()
+
+        assert self.entry.task_state == SUCCESS
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(self.entry.task_output))
+        subtasks = json.loads(self.entry.subtasks)
+        assert subtasks['total'] == expected_num_shards + 1
+        assert subtasks['succeeded'] == expected_num_shards + 1
+
+        assert self._report_usernames() == self.usernames
+        for shard_index in range(expected_num_shards):
+            for filename in grade_report_shard_filenames(shard_index):
+                assert not self.report_store.exists(self.course.id, filename, self.shard_dir)
+
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter')
+    def test_shard_checkpoint(self, mock_grades_iter):
+        success_filename, _ = grade_report_shard_filenames(0)
+        self.report_store.store_rows(self.course.id, success_filename, [[1, '', 'checkpointed']], self.shard_dir)
+
+        with override_settings(GRADE_REPORT_USERS_PER_SHARD=10):
+            self._generate()
+
+        mock_grades_iter.assert_not_called()
+        assert self.entry.task_state == SUCCESS
+        self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1}, json.loads(self.entry.task_output))
+        assert self._report_usernames() == ['checkpointed']
+
+    def test_subtasks_already_queued(self):
+        with override_settings(GRADE_REPORT_USERS_PER_SHARD=10):
+            self._generate()
+            with patch('lms.djangoapps.instructor_task.tasks_helper.grades.chord') as mock_chord:
+                self._generate()
+        mock_chord.assert_not_called()
+
+    def _fail_merge(self, exception):
+        """
+        Calls the errback of the merge, as celery does when a shard or the merge fails.
+        """
+        merge_id = list(json.loads(self.entry.subtasks)['status'])[-1]
+        calculate_grades_csv_merge_failed(
+            None, exception, None, self.entry.id, SubtaskStatus.create(merge_id).to_dict(),
+        )
+        self.entry.refresh_from_db()
+        return merge_id
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.ShardedCourseGradeReport.merge_shards')
+    def test_shard_failure(self, mock_merge_shards):
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper.grades.ShardedCourseGradeReport._generate_shard',
+            side_effect=[{'succeeded': 3, 'failed': 0, 'skipped': 0}, ValueError('Shard failed')],
+        ):
+            with override_settings(GRADE_REPORT_USERS_PER_SHARD=3), pytest.raises(ValueError):
+                self._generate()
+        mock_merge_shards.assert_not_called()
+
+        # The failed shard only records its own status, so the progress of the report is kept.
+        shard_states = [status['state'] for status in json.loads(self.entry.subtasks)['status'].values()]
+        assert shard_states == [SUCCESS, FAILURE, QUEUING]
+        self.assertDictContainsSubset({'succeeded': 3}, json.loads(self.entry.task_output))
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.ShardedCourseGradeReport.merge_shards')
+    def test_merge_failed(self, mock_merge_shards):
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper.grades.ShardedCourseGradeReport._generate_shard',
+            side_effect=[{'succeeded': 3, 'failed': 0, 'skipped': 0}, ValueError('Shard failed')],
+        ):
+            with override_settings(GRADE_REPORT_USERS_PER_SHARD=3), pytest.raises(ValueError):
+                self._generate()
+
+        merge_id = self._fail_merge(ValueError('Shard failed'))
+
+        mock_merge_shards.assert_not_called()
+        assert self.entry.task_state == FAILURE
+        task_output = json.loads(self.entry.task_output)
+        assert task_output['message'] == 'Shard failed'
+        self.assertDictContainsSubset({'succeeded': 3, 'start_time': ANY}, task_output)
+        subtasks = json.loads(self.entry.subtasks)
+        assert subtasks['status'][merge_id]['state'] == FAILURE
+        assert (subtasks['succeeded'], subtasks['failed']) == (1, 2)
+
+    @patch(
+        'lms.djangoapps.instructor_task.tasks_helper.grades.ShardedCourseGradeReport.merge_shards',
+        side_effect=ValueError('Merge failed'),
+    )
+    def test_merge_raised(self, _mock_merge_shards):
+        with override_settings(GRADE_REPORT_USERS_PER_SHARD=10), pytest.raises(ValueError):
+            self._generate()
+
+        self._fail_merge(ValueError('Merge failed'))
+
+        assert self.entry.task_state == FAILURE
+        assert json.loads(self.entry.task_output)['message'] == 'Merge failed'
+        subtasks = json.loads(self.entry.subtasks)
+        assert (subtasks['succeeded'], subtasks['failed']) == (1, 1)
+
+    def test_shards_finishing_after_failure(self):
+        with override_settings(GRADE_REPORT_USERS_PER_SHARD=3):
+            with patch('lms.djangoapps.instructor_task.tasks_helper.grades.chord') as mock_chord:
+                self._generate()
+        self._fail_merge(ValueError('Shard failed'))
+
+        # Shards that were still running when the report failed record their progress
+        # without marking the report as succeeded.
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            for shard in mock_chord.call_args[0][0]:
+                shard.apply().get()
+
+        self.entry.refresh_from_db()
+        assert self.entry.task_state == FAILURE
+        task_output = json.loads(self.entry.task_output)
+        assert task_output['message'] == 'Shard failed'
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5}, task_output)
+        subtasks = json.loads(self.entry.subtasks)
+        assert (subtasks['succeeded'], subtasks['failed']) == (2, 1)
+
+
 @ddt.ddt
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskModuleTestCase):
     """
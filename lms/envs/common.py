@@ -1142,6 +1142,17 @@ CACHES = {
             'use_pooling': True,
         }
     },
+    'course_definition_cache': {
+        'KEY_PREFIX': 'course_definition',
+        'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
+        'LOCATION': ['localhost:11211'],
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'OPTIONS': {
+            'no_delay': True,
+            'ignore_exc': True,
+            'use_pooling': True,
+        }
+    },
     'celery': {
         'KEY_PREFIX': 'celery',
         'KEY_FUNCTION': 'common.djangoapps.util.memcache.safe_key',
@@ -1663,6 +1674,44 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 32 * 1024 * 1024
+# .. setting_description: Maximum size, in bytes, of the process-local LRU cache of small course assets
+#   served by the contentserver. Set to 0 to disable it; assets are then always streamed from the contentstore.
+CONTENTSERVER_LOCAL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES
+# .. setting_default: 64 * 1024
+# .. setting_description: Maximum size, in bytes, of the course assets kept in the process-local cache of the
+#   contentserver. Larger assets are streamed from the contentstore.
+CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES = 64 * 1024
+# .. setting_name: CONTENTSERVER_LOCAL_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: Number of seconds that course assets are kept in the process-local cache of the
+#   contentserver. Changes to assets made by other processes are visible after at most this long.
+CONTENTSERVER_LOCAL_CACHE_TIMEOUT = 60
+
+# .. setting_name: COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 64 * 1024 * 1024
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of decoded
+#   split modulestore course structures that sits in front of the 'course_structure_cache'. Set to 0 to
+#   disable it. Each saved structure version is immutable, so its cached copy never goes stale.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# .. setting_name: COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES
+# .. setting_default: 512 * 1024
+# .. setting_description: Maximum compressed size, in bytes, of the split modulestore definitions that are
+#   written to the 'course_definition_cache', if that cache is configured. Larger definitions are always read
+#   from the database, as are all definitions if this is 0. Edits create new definitions rather than
+#   changing saved ones, so cached definitions never expire.
+COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES = 512 * 1024
+
+# .. setting_name: TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES
+# .. setting_default: 16 * 1024 * 1024
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of video
+#   transcripts converted between formats and speeds. Set to 0 to disable it. Conversions are keyed by a
+#   hash of the converted transcript, so uploading a new transcript needs no invalidation.
+TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1763,6 +1812,16 @@ CODE_JAIL = {
     "limit_overrides": {},
 }
 
+# .. setting_name: SAFE_EXEC_LOCAL_CACHE_MAX_BYTES
+# .. setting_default: 16 * 1024 * 1024
+# .. setting_description: Maximum approximate size, in bytes, of the process-local LRU cache of safe_exec
+#   results that sits in front of the shared cache passed to safe_exec. Set to 0 to disable it.
+SAFE_EXEC_LOCAL_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# .. setting_name: SAFE_EXEC_LOCAL_CACHE_TIMEOUT
+# .. setting_default: 300
+# .. setting_description: Number of seconds that safe_exec results are kept in the process-local cache.
+SAFE_EXEC_LOCAL_CACHE_TIMEOUT = 300
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -1795,6 +1854,24 @@ CODE_JAIL_REST_SERVICE_CONNECT_TIMEOUT = 0.5  # time in seconds
 #   codejail remote service endpoint.
 CODE_JAIL_REST_SERVICE_READ_TIMEOUT = 3.5  # time in seconds
 
+# Pool of warm codejail workers
+ENABLE_CODEJAIL_WORKER_POOL = False
+# .. setting_name: CODE_JAIL_WORKER_POOL_SIZE
+# .. setting_default: 2
+# .. setting_description: Number of idle warm sandbox workers kept by each pool, when
+#   ENABLE_CODEJAIL_WORKER_POOL is True. Workers count towards the NPROC limit of the sandbox user.
+CODE_JAIL_WORKER_POOL_SIZE = 2
+# .. setting_name: CODE_JAIL_WORKER_POOL_MAX_JOBS
+# .. setting_default: 50
+# .. setting_description: Number of jobs a warm sandbox worker serves, each in a fresh child process, before it
+#   is replaced by a new one.
+CODE_JAIL_WORKER_POOL_MAX_JOBS = 50
+# .. setting_name: CODE_JAIL_WORKER_POOL_MAX_POOLS
+# .. setting_default: 4
+# .. setting_description: Number of pools of warm sandbox workers kept by each process. Workers are pooled by
+#   limit overrides context (i.e. by course), and the least recently used pool is stopped to make room.
+CODE_JAIL_WORKER_POOL_MAX_POOLS = 4
+
 
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
@@ -3738,6 +3815,12 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': None,
 }
 
+# .. setting_name: GRADE_REPORT_USERS_PER_SHARD
+# .. setting_default: 5000
+# .. setting_description: Number of learners graded by each subtask when a course grade report is
+#   generated in parallel shards, see the instructor_task.use_sharded_grade_reporting waffle flag.
+GRADE_REPORT_USERS_PER_SHARD = 5000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': None,
@@ -4284,6 +4367,19 @@ CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
 
+# .. setting_name: COMMENTS_SERVICE_POOL_SIZE
+# .. setting_default: 10
+# .. setting_description: The maximum number of keep-alive connections to the comments service kept by each
+#   process, which is also the maximum number of requests that it sends in parallel. Only used when the
+#   ENABLE_COMMENTS_SERVICE_CONNECTION_POOL toggle is enabled.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# .. setting_name: COMMENTS_SERVICE_MAX_RETRIES
+# .. setting_default: 2
+# .. setting_description: The number of times that idempotent requests to the comments service are retried when
+#   they get no response. Only used when the ENABLE_COMMENTS_SERVICE_CONNECTION_POOL toggle is enabled.
+COMMENTS_SERVICE_MAX_RETRIES = 2
+
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
 
@@ -5381,6 +5477,18 @@ SUBSCRIPTIONS_SERVICE_WORKER_USERNAME = 'subscriptions_worker'
 NOTIFICATIONS_EXPIRY = 60
 EXPIRED_NOTIFICATIONS_DELETE_BATCH_SIZE = 10000
 
+# .. setting_name: NOTIFICATIONS_AUDIENCE_CHUNK_SIZE
+# .. setting_default: 1000
+# .. setting_description: The maximum number of users that a send_notifications task notifies. Notifications to
+#   larger audiences are split into send_notifications subtasks for chunks of this many users.
+NOTIFICATIONS_AUDIENCE_CHUNK_SIZE = 1000
+
+# .. setting_name: NOTIFICATIONS_BULK_CREATE_BATCH_SIZE
+# .. setting_default: 250
+# .. setting_description: The number of notifications (and of outdated notification preferences) that are
+#   created (and updated) in each query by send_notifications.
+NOTIFICATIONS_BULK_CREATE_BATCH_SIZE = 250
+
 #### django-simple-history##
 # disable indexing on date field its coming from django-simple-history.
 SIMPLE_HISTORY_DATE_INDEX = False
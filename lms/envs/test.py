@@ -215,6 +215,9 @@ CACHES = {
     'course_structure_cache': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     },
+    'course_definition_cache': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
     # Blockstore caching tests require a cache that actually works:
     'blockstore': {
         'KEY_PREFIX': 'blockstore',
@@ -224,6 +227,12 @@ CACHES = {
     },
 }
 
+# Process-local caches outlive individual test cases, so disable them and let tests enable them explicitly.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES = 0
+SAFE_EXEC_LOCAL_CACHE_MAX_BYTES = 0
+CONTENTSERVER_LOCAL_CACHE_MAX_BYTES = 0
+TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES = 0
+
 ############################# SECURITY SETTINGS ################################
 # Default to advanced security in common.py, so tests can reset here to use
 # a simpler security model
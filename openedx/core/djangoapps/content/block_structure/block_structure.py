@@ -788,6 +788,17 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # set(string)
         self._requested_xblock_fields = set()
 
+        # Set of usage keys of the blocks whose data is to be collected,
+        # when collecting incrementally. None if all blocks are to be
+        # collected.
+        # set(UsageKey) or None
+        self._changed_block_keys = None
+
+        # Modulestore from which xBlocks that were not added up front
+        # are loaded on demand, when collecting incrementally.
+        # ModuleStoreRead or None
+        self._modulestore = None
+
     def request_xblock_fields(self, *field_names):
         """
         Records request for collecting data for the given xBlock fields.
@@ -808,11 +819,37 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         Returns the instantiated xBlock for the given usage key.
 
+        When collecting incrementally, xBlocks of unchanged blocks are
+        loaded from the modulestore on demand.
+
         Arguments:
             usage_key (UsageKey) - Usage key of the block whose
                 xBlock object is to be returned.
         """
-        return self._xblock_map[usage_key]
+        try:
+            return self._xblock_map[usage_key]
+        except KeyError:
+            if self._modulestore is None or usage_key not in self:
+                raise
+        xblock = self._modulestore.get_item(usage_key, depth=0)
+        self._add_xblock(usage_key, xblock)
+        return xblock
+
+    def needs_collect(self, usage_key):
+        """
+        Returns whether data for the block identified by the given
+        usage_key is to be collected.
+
+        All blocks need to be collected, except when collecting
+        incrementally, in which case the previously collected data of
+        unchanged blocks is already present in the block structure.
+        Transformers that support incremental collection should only
+        collect data for blocks for which this returns True.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block.
+        """
+        return self._changed_block_keys is None or usage_key in self._changed_block_keys
 
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
@@ -31,6 +31,36 @@ STORAGE_BACKING_FOR_CACHE = WaffleSwitch(
     "block_structure.storage_backing_for_cache", __name__
 )
 
+# .. toggle_name: block_structure.columnar_serialization
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, block structures are written to the cache and storage in a
+#   versioned columnar format (interned usage keys, integer adjacency arrays and per-field columns)
+#   instead of a single zpickled tuple. Data in either format can always be read, so the switch can
+#   be turned on or off without invalidating previously stored block structures.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: 2027-04-18
+# .. toggle_tickets: None
+COLUMNAR_SERIALIZATION = WaffleSwitch(
+    "block_structure.columnar_serialization", __name__
+)
+
+# .. toggle_name: block_structure.incremental_collect
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, updating an outdated block structure diffs the previously
+#   collected split modulestore structure version with the current one and recollects only the
+#   changed blocks, provided that all registered transformers support incremental collection.
+#   Otherwise, the entire block structure is recollected from the modulestore.
+# .. toggle_use_cases: temporary
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_target_removal_date: 2027-04-18
+# .. toggle_tickets: None
+INCREMENTAL_COLLECT = WaffleSwitch(
+    "block_structure.incremental_collect", __name__
+)
+
 
 def enable_storage_backing_for_cache_in_request():
     """
@@ -57,6 +57,53 @@ class BlockStructureFactory:
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_incrementally(cls, root_block_usage_key, modulestore, previous_block_structure, structure_changes):
+        """
+        Creates and returns a block structure starting at the given
+        root_block_usage_key, reusing the data previously collected in
+        previous_block_structure for all blocks that didn't change.
+
+        Only xBlocks for changed blocks are instantiated up front. Any
+        other xBlocks requested during the collect phase are loaded from
+        the modulestore on demand.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks within the block
+                structure starting at root_block_usage_key.
+
+            previous_block_structure (BlockStructureBlockData) - The
+                previously collected block structure, whose data is
+                reused (not copied) by the returned block structure.
+
+            structure_changes (StructureChanges) - The relations of the
+                new version of the block structure, and the blocks that
+                changed since the previous_block_structure was collected.
+
+        Returns:
+            BlockStructureModulestoreData - The created block structure,
+                ready to be collected incrementally.
+        """
+        block_structure = BlockStructureModulestoreData(root_block_usage_key)
+        for parent_key, children in structure_changes.children_map.items():
+            for child_key in children:
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+
+        block_structure.transformer_data = previous_block_structure.transformer_data
+        for block_key in block_structure:
+            if block_key not in structure_changes.changed_block_keys and block_key in previous_block_structure:
+                block_structure._block_data_map[block_key] = previous_block_structure[block_key]  # pylint: disable=protected-access
+
+        block_structure._changed_block_keys = structure_changes.changed_block_keys  # pylint: disable=protected-access
+        block_structure._modulestore = modulestore  # pylint: disable=protected-access
+        for block_key in structure_changes.changed_block_keys:
+            block_structure.get_xblock(block_key)
+        return block_structure
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
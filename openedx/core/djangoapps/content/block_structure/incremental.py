@@ -0,0 +1,171 @@
+"""
+Module for computing which blocks of a collected block structure need to be
+recollected, by diffing two versions of a split modulestore course structure.
+"""
+# pylint: disable=protected-access
+
+
+from collections import namedtuple
+from logging import getLogger
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+
+# The changes between two versions of a course structure.
+#   children_map - dict {UsageKey: [UsageKey]} of all blocks reachable
+#       from the root in the new version, mapped to their children.
+#   changed_block_keys - set(UsageKey) of blocks whose collected data is
+#       possibly outdated.
+#   removed_block_keys - set(UsageKey) of blocks that were reachable from
+#       the root in the old version, but aren't in the new version.
+StructureChanges = namedtuple('StructureChanges', ['children_map', 'changed_block_keys', 'removed_block_keys'])
+
+
+def get_structure_changes(modulestore, root_block_usage_key, old_version, new_version):
+    """
+    Returns the StructureChanges between the old_version and new_version
+    of the course structure containing root_block_usage_key, or None if
+    the changes can't be computed (for example, if the course isn't stored
+    in the split modulestore or the old version can't be found).
+
+    A block is considered changed if it was added, if its definition,
+    settings or asides changed, if its parents changed, or if it is a
+    descendant of a block whose settings changed (since settings can be
+    inherited). Changes to only the children of a block are reflected in
+    the children_map, but don't invalidate the block's collected data.
+    """
+    course_key = root_block_usage_key.course_key
+    old_structure = _get_structure(modulestore, course_key, old_version)
+    new_structure = _get_structure(modulestore, course_key, new_version)
+    if old_structure is None or new_structure is None:
+        return None
+
+    old_blocks = old_structure['blocks']
+    new_blocks = new_structure['blocks']
+    root_block_key = BlockKey.from_usage_key(root_block_usage_key)
+    if root_block_key not in new_blocks:
+        return None
+
+    old_parents = _get_parents_map(old_blocks)
+    new_parents = _get_parents_map(new_blocks)
+
+    changed = set()
+    invalidated_subtrees = set()
+    for block_key, block in new_blocks.items():
+        old_block = old_blocks.get(block_key)
+        if old_block is None or old_parents.get(block_key) != new_parents.get(block_key):
+            changed.add(block_key)
+            invalidated_subtrees.add(block_key)
+        elif _settings(old_block) != _settings(block):
+            changed.add(block_key)
+            invalidated_subtrees.add(block_key)
+        elif old_block.definition != block.definition or old_block.get_asides() != block.get_asides():
+            changed.add(block_key)
+
+    children_map = {}
+    _add_reachable_blocks(new_blocks, root_block_key, children_map, invalidated_subtrees, changed)
+    removed = _get_reachable_blocks(old_blocks, root_block_key) - set(children_map)
+
+    def usage_key_for(block_key):
+        return course_key.make_usage_key(block_key.type, block_key.id)
+
+    return StructureChanges(
+        children_map={
+            usage_key_for(block_key): [usage_key_for(child_key) for child_key in children]
+            for block_key, children in children_map.items()
+        },
+        changed_block_keys={usage_key_for(block_key) for block_key in changed if block_key in children_map},
+        removed_block_keys={usage_key_for(block_key) for block_key in removed},
+    )
+
+
+def _get_structure(modulestore, course_key, version):
+    """
+    Returns the split modulestore structure for the given version of
+    the given course, or None if not available.
+    """
+    if version is None:
+        return None
+    get_store = getattr(modulestore, '_get_modulestore_for_courselike', None)
+    store = get_store(course_key) if get_store else modulestore
+    if not hasattr(store, 'get_structure'):
+        return None
+    try:
+        return store.get_structure(course_key, version)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("BlockStructure: Unable to load structure version %s for %s.", version, course_key)
+        return None
+
+
+def _get_children(block):
+    """
+    Returns the BlockKeys of the children of the given split BlockData.
+    """
+    return [BlockKey(*child) for child in block.fields.get('children', [])]
+
+
+def _settings(block):
+    """
+    Returns the settings of the given split BlockData, excluding children.
+    """
+    return (
+        {name: value for name, value in block.fields.items() if name != 'children'},
+        block.defaults,
+    )
+
+
+def _get_parents_map(blocks):
+    """
+    Returns a map of BlockKey to the sorted list of its parents' BlockKeys.
+    """
+    parents_map = {}
+    for block_key, block in blocks.items():
+        for child_key in _get_children(block):
+            parents_map.setdefault(child_key, []).append(block_key)
+    for parents in parents_map.values():
+        parents.sort()
+    return parents_map
+
+
+def _add_reachable_blocks(blocks, root_block_key, children_map, invalidated_subtrees, changed):
+    """
+    Iteratively adds all blocks reachable from root_block_key to the
+    children_map, adding all descendants of the invalidated_subtrees
+    to the changed set.
+    """
+    propagated = set()
+    stack = [(root_block_key, root_block_key in invalidated_subtrees)]
+    while stack:
+        block_key, invalidated = stack.pop()
+        visit_children = block_key not in children_map
+        if visit_children:
+            children_map[block_key] = [
+                child_key for child_key in _get_children(blocks[block_key]) if child_key in blocks
+            ]
+
+        # Blocks shared in DAGs are revisited only to propagate invalidation.
+        if invalidated and block_key not in propagated:
+            propagated.add(block_key)
+            changed.add(block_key)
+            visit_children = True
+
+        if visit_children:
+            for child_key in children_map[block_key]:
+                stack.append((child_key, invalidated or child_key in invalidated_subtrees))
+
+
+def _get_reachable_blocks(blocks, root_block_key):
+    """
+    Returns the set of BlockKeys of all blocks reachable from root_block_key.
+    """
+    reachable = set()
+    stack = [root_block_key] if root_block_key in blocks else []
+    while stack:
+        block_key = stack.pop()
+        if block_key in reachable:
+            continue
+        reachable.add(block_key)
+        stack.extend(child_key for child_key in _get_children(blocks[block_key]) if child_key in blocks)
+    return reachable
@@ -5,12 +5,21 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from logging import getLogger
 
+from . import config
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
+from .incremental import get_structure_changes
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+# Name of the field, collected on the root block, recording the version
+# of the course structure that the block structure was collected from.
+COURSE_VERSION_FIELD = 'course_version'
+
 
 class BlockStructureManager:
     """
@@ -118,14 +127,73 @@ class BlockStructureManager:
         the modulestore.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
+            block_structure = self._create_for_incremental_collect()
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
             BlockStructureTransformers.collect(block_structure)
+            self._collect_course_version(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _create_for_incremental_collect(self):
+        """
+        Returns a block structure to be collected incrementally, reusing
+        the data of the previously stored block structure for all blocks
+        that didn't change since. Returns None if the block structure
+        can't be collected incrementally.
+        """
+        if not config.INCREMENTAL_COLLECT.is_enabled():
+            return None
+
+        try:
+            previous_block_structure = self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        if not BlockStructureTransformers.supports_incremental_collect(previous_block_structure):
+            return None
+
+        old_version = previous_block_structure.get_xblock_field(self.root_block_usage_key, COURSE_VERSION_FIELD)
+        root_block = self.modulestore.get_item(self.root_block_usage_key, depth=0)
+        new_version = getattr(root_block, COURSE_VERSION_FIELD, None)
+        if old_version is None or new_version is None:
+            return None
+
+        structure_changes = get_structure_changes(
+            self.modulestore, self.root_block_usage_key, old_version, new_version,
+        )
+        if structure_changes is None:
+            return None
+
+        logger.info(
+            "BlockStructure: Collecting incrementally; %s, changed blocks: %d of %d.",
+            self.root_block_usage_key,
+            len(structure_changes.changed_block_keys),
+            len(structure_changes.children_map),
+        )
+        return BlockStructureFactory.create_incrementally(
+            self.root_block_usage_key,
+            self.modulestore,
+            previous_block_structure,
+            structure_changes,
+        )
+
+    def _collect_course_version(self, block_structure):
+        """
+        Records the version of the course structure that the given block
+        structure was collected from on its root block, so later updates
+        can be collected incrementally.
+        """
+        root_block = block_structure.get_xblock(self.root_block_usage_key)
+        block_structure.override_xblock_field(
+            self.root_block_usage_key,
+            COURSE_VERSION_FIELD,
+            getattr(root_block, COURSE_VERSION_FIELD, None),
+        )
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,261 @@
+"""
+Module for the columnar serialization format of BlockStructure objects.
+
+Rather than pickling the full graph of _BlockRelations, BlockData and
+TransformerData objects, a block structure is written as:
+
+    * an interned table of usage keys, where each block is identified
+      by its integer index in the table,
+    * integer-indexed parent and child adjacency arrays, stored in
+      compressed sparse row form,
+    * one column per collected xBlock field and per transformer block
+      field, each of which maps block indices to values, and
+    * the structure-wide transformer data.
+
+Each column is pickled independently, so deserializing a block
+structure never instantiates pickled BlockData objects, and columns
+are only decoded when the structure is materialized.
+
+Data written by older versions of the store (zpickled tuples) does not
+carry the format header and is still readable through
+deserialize_block_structure.
+"""
+# pylint: disable=protected-access
+
+
+import pickle
+import struct
+import zlib
+from array import array
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+
+# Header prepended to data in the columnar format. Legacy zpickled data
+# always starts with a zlib header, which can never collide with it.
+FORMAT_MAGIC = b'BSCF'
+
+# The latest version of the columnar format. Incrementally update this
+# value whenever the layout of the payload changes.
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('>4sH')
+
+# Typecode used for the adjacency and column index arrays. 'q' is 8 bytes on all platforms,
+# unlike 'l', which is only 4 bytes on Windows and 32-bit builds.
+_INDEX_TYPECODE = 'q'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data was written in the
+    columnar format.
+    """
+    return serialized_data[:len(FORMAT_MAGIC)] == FORMAT_MAGIC
+
+
+def serialize_block_structure(block_structure):
+    """
+    Serializes the given block structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The versioned, compressed serialization.
+    """
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Intern the usage keys of all blocks, including those that only
+    # have collected data.
+    keys = list(block_relations)
+    key_index = {key: index for index, key in enumerate(keys)}
+    for key in block_data_map:
+        if key not in key_index:
+            key_index[key] = len(keys)
+            keys.append(key)
+
+    children = _encode_adjacency(
+        (block_relations[key].children if key in block_relations else () for key in keys),
+        key_index,
+    )
+    parents = _encode_adjacency(
+        (block_relations[key].parents if key in block_relations else () for key in keys),
+        key_index,
+    )
+
+    field_columns = {}
+    transformer_columns = {}
+    for key, block_data in block_data_map.items():
+        index = key_index[key]
+        for field_name, value in block_data.fields.items():
+            _add_to_column(field_columns, field_name, index, value)
+        for transformer_name, transformer_data in block_data.transformer_data.items():
+            columns = transformer_columns.setdefault(transformer_name, {})
+            for field_name, value in transformer_data.fields.items():
+                _add_to_column(columns, field_name, index, value)
+
+    payload = {
+        'keys': keys,
+        'relations_mask': _encode_indices(key_index[key] for key in block_relations),
+        'data_mask': _encode_indices(key_index[key] for key in block_data_map),
+        'children': children,
+        'parents': parents,
+        'fields': _encode_columns(field_columns),
+        'transformer_fields': {
+            transformer_name: _encode_columns(columns)
+            for transformer_name, columns in transformer_columns.items()
+        },
+        'transformer_data': {
+            transformer_name: transformer_data.fields
+            for transformer_name, transformer_data in block_structure.transformer_data.items()
+        },
+    }
+    return _HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION) + zlib.compress(pickle.dumps(payload, 4))
+
+
+def deserialize_block_structure(serialized_data):
+    """
+    Deserializes the given data, in either the columnar or the legacy
+    zpickled format.
+
+    Returns:
+        tuple(dict, TransformerDataMap, dict) - The block relations,
+            transformer data and block data map to be passed to
+            BlockStructureFactory.create_new.
+
+    Raises:
+        ValueError - If the data uses an unsupported format version.
+    """
+    if not is_columnar(serialized_data):
+        return zunpickle(serialized_data)
+
+    _, version = _HEADER.unpack_from(serialized_data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported block structure format version: {version}")
+
+    payload = pickle.loads(zlib.decompress(serialized_data[_HEADER.size:]))
+    keys = payload['keys']
+
+    block_relations = {}
+    children = _decode_adjacency(payload['children'], keys)
+    parents = _decode_adjacency(payload['parents'], keys)
+    for index in _decode_indices(payload['relations_mask']):
+        relations = _BlockRelations()
+        relations.children = children[index]
+        relations.parents = parents[index]
+        block_relations[keys[index]] = relations
+
+    block_data_by_index = {}
+    for index in _decode_indices(payload['data_mask']):
+        block_data_by_index[index] = BlockData(keys[index])
+
+    for field_name, (indices, values) in _iter_columns(payload['fields']):
+        for index, value in zip(indices, values):
+            block_data_by_index[index].fields[field_name] = value
+
+    for transformer_name, columns in payload['transformer_fields'].items():
+        for field_name, (indices, values) in _iter_columns(columns):
+            for index, value in zip(indices, values):
+                block_data_by_index[index].transformer_data.get_or_create(
+                    transformer_name
+                ).fields[field_name] = value
+
+    block_data_map = {keys[index]: block_data for index, block_data in block_data_by_index.items()}
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in payload['transformer_data'].items():
+        transformer_data[transformer_name] = TransformerData()
+        transformer_data[transformer_name].fields = fields
+
+    return block_relations, transformer_data, block_data_map
+
+
+def serialize_block_structure_legacy(block_structure):
+    """
+    Serializes the given block structure into the legacy zpickled
+    format.
+    """
+    return zpickle((
+        block_structure._block_relations,
+        block_structure.transformer_data,
+        block_structure._block_data_map,
+    ))
+
+
+def _add_to_column(columns, field_name, index, value):
+    """
+    Appends the given value for the block at the given index to the
+    named column.
+    """
+    try:
+        indices, values = columns[field_name]
+    except KeyError:
+        indices, values = columns[field_name] = (array(_INDEX_TYPECODE), [])
+    indices.append(index)
+    values.append(value)
+
+
+def _encode_columns(columns):
+    """
+    Returns a map of column name to its independently pickled
+    (indices, values) pair.
+    """
+    return {
+        field_name: (indices.tobytes(), pickle.dumps(values, 4))
+        for field_name, (indices, values) in columns.items()
+    }
+
+
+def _iter_columns(encoded_columns):
+    """
+    Yields (field_name, (indices, values)) for each of the given
+    encoded columns, decoding each column on the way.
+    """
+    for field_name, (encoded_indices, encoded_values) in encoded_columns.items():
+        yield field_name, (_decode_indices(encoded_indices), pickle.loads(encoded_values))
+
+
+def _encode_indices(indices):
+    """
+    Returns the given iterable of integers as packed bytes.
+    """
+    return array(_INDEX_TYPECODE, indices).tobytes()
+
+
+def _decode_indices(encoded_indices):
+    """
+    Returns the array of integers packed by _encode_indices.
+    """
+    indices = array(_INDEX_TYPECODE)
+    indices.frombytes(encoded_indices)
+    return indices
+
+
+def _encode_adjacency(adjacency_lists, key_index):
+    """
+    Encodes the given per-block lists of usage keys as a pair of
+    packed offsets and targets arrays.
+    """
+    offsets = array(_INDEX_TYPECODE, [0])
+    targets = array(_INDEX_TYPECODE)
+    for adjacent_keys in adjacency_lists:
+        targets.extend(key_index[key] for key in adjacent_keys)
+        offsets.append(len(targets))
+    return offsets.tobytes(), targets.tobytes()
+
+
+def _decode_adjacency(encoded_adjacency, keys):
+    """
+    Decodes the pair of arrays written by _encode_adjacency into a list
+    of usage key lists, indexed by block index.
+    """
+    offsets = _decode_indices(encoded_adjacency[0])
+    targets = _decode_indices(encoded_adjacency[1])
+    return [
+        [keys[target] for target in targets[offsets[index]:offsets[index + 1]]]
+        for index in range(len(offsets) - 1)
+    ]
@@ -6,14 +6,12 @@ Module for the Storage of BlockStructure objects.
 
 from logging import getLogger
 
-
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
 from . import config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .serializer import deserialize_block_structure, serialize_block_structure, serialize_block_structure_legacy
 from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
@@ -195,20 +193,20 @@ class BlockStructureStore:
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        if config.COLUMNAR_SERIALIZATION.is_enabled():
+            return serialize_block_structure(block_structure)
+        return serialize_block_structure_legacy(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+
+        Data in both the columnar and the legacy zpickled formats is
+        accepted.
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            block_relations, transformer_data, block_data_map = deserialize_block_structure(serialized_data)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
@@ -0,0 +1,130 @@
+"""
+Tests for incremental.py
+"""
+
+from unittest import TestCase
+
+import ddt
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+
+from ..incremental import get_structure_changes
+from .helpers import ChildrenMapTestMixin, UsageKeyFactoryMixin
+
+
+class MockSplitModulestore:
+    """
+    A mock split modulestore, providing only the structure lookup needed
+    by get_structure_changes.
+    """
+    def __init__(self, structures):
+        self.structures = structures
+
+    def get_structure(self, course_key, version_guid):  # pylint: disable=unused-argument
+        """
+        Returns the structure for the given version, if any.
+        """
+        return self.structures.get(version_guid)
+
+
+def create_structure(children_map, fields=None, definitions=None):
+    """
+    Returns a split structure for the given children_map, with the given
+    per-block settings fields and definition ids.
+    """
+    fields = fields or {}
+    definitions = definitions or {}
+    return {
+        'blocks': {
+            BlockKey('course', str(block_id)): BlockData(
+                fields=dict(fields.get(block_id, {}), children=[['course', str(child)] for child in children]),
+                definition=definitions.get(block_id, f'definition_{block_id}'),
+            )
+            for block_id, children in enumerate(children_map)
+        }
+    }
+
+
+@ddt.ddt
+class TestGetStructureChanges(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for get_structure_changes.
+    """
+
+    def get_changes(self, old_structure, new_structure):
+        """
+        Returns the changes between the given structures.
+        """
+        modulestore = MockSplitModulestore({'old': old_structure, 'new': new_structure})
+        return get_structure_changes(modulestore, self.block_key_factory(0), 'old', 'new')
+
+    def assert_changed(self, changes, expected_changed_blocks):
+        """
+        Verifies the set of changed blocks.
+        """
+        assert changes.changed_block_keys == {self.block_key_factory(block) for block in expected_changed_blocks}
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_unchanged(self, children_map):
+        changes = self.get_changes(create_structure(children_map), create_structure(children_map))
+        self.assert_changed(changes, [])
+        assert changes.children_map == {
+            self.block_key_factory(block): [self.block_key_factory(child) for child in children]
+            for block, children in enumerate(children_map)
+        }
+
+    def test_definition_changed(self):
+        changes = self.get_changes(
+            create_structure(self.SIMPLE_CHILDREN_MAP),
+            create_structure(self.SIMPLE_CHILDREN_MAP, definitions={1: 'new_definition'}),
+        )
+        self.assert_changed(changes, [1])
+
+    @ddt.data(
+        (ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP, 1, [1, 3, 4]),
+        (ChildrenMapTestMixin.DAG_CHILDREN_MAP, 2, [2, 3, 4, 5, 6]),
+        (ChildrenMapTestMixin.DAG_CHILDREN_MAP, 0, [0, 1, 2, 3, 4, 5, 6]),
+    )
+    @ddt.unpack
+    def test_settings_changed(self, children_map, changed_block, expected_changed_blocks):
+        changes = self.get_changes(
+            create_structure(children_map),
+            create_structure(children_map, fields={changed_block: {'visible_to_staff_only': True}}),
+        )
+        self.assert_changed(changes, expected_changed_blocks)
+
+    def test_block_added(self):
+        changes = self.get_changes(
+            create_structure(self.SIMPLE_CHILDREN_MAP),
+            create_structure([[1, 2], [3, 4], [5], [], [], []]),
+        )
+        self.assert_changed(changes, [5])
+        assert changes.children_map[self.block_key_factory(2)] == [self.block_key_factory(5)]
+
+    def test_block_moved(self):
+        changes = self.get_changes(
+            create_structure(self.SIMPLE_CHILDREN_MAP),
+            create_structure([[1, 2], [3], [4], [], []]),
+        )
+        self.assert_changed(changes, [4])
+        assert changes.removed_block_keys == set()
+
+    def test_block_removed(self):
+        changes = self.get_changes(
+            create_structure(self.SIMPLE_CHILDREN_MAP),
+            create_structure([[1, 2], [3], [], [], []]),
+        )
+        self.assert_changed(changes, [])
+        assert self.block_key_factory(4) not in changes.children_map
+        assert changes.removed_block_keys == {self.block_key_factory(4)}
+
+    def test_missing_version(self):
+        modulestore = MockSplitModulestore({'new': create_structure(self.SIMPLE_CHILDREN_MAP)})
+        assert get_structure_changes(modulestore, self.block_key_factory(0), 'old', 'new') is None
+
+    def test_not_split_modulestore(self):
+        assert get_structure_changes(object(), self.block_key_factory(0), 'old', 'new') is None
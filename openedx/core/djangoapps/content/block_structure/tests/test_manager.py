@@ -8,7 +8,7 @@ from django.test import TestCase
 from edx_toggles.toggles.testutils import override_waffle_switch
 
 from ..block_structure import BlockStructureBlockData
-from ..config import STORAGE_BACKING_FOR_CACHE
+from ..config import INCREMENTAL_COLLECT, STORAGE_BACKING_FOR_CACHE
 from ..exceptions import UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -20,6 +20,7 @@ from .helpers import (
     UsageKeyFactoryMixin,
     mock_registered_transformers
 )
+from .test_incremental import create_structure
 
 
 class TestTransformer1(MockTransformer):
@@ -94,6 +95,25 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + str(block_key)
 
 
+class IncrementalTestTransformer(MockTransformer):
+    """
+    Test Transformer class that supports incremental collection, recording
+    the blocks it collected data for.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collected_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects block data for the blocks that need to be collected.
+        """
+        for block_key in block_structure.topological_traversal():
+            if block_structure.needs_collect(block_key):
+                block_structure.set_transformer_block_field(block_key, cls, 'collected', True)
+                cls.collected_block_keys.append(block_key)
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -220,3 +240,69 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         assert TestTransformer1.collect_call_count == 2
+
+
+@ddt.ddt
+class TestBlockStructureManagerIncrementalCollect(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Test class for incremental collection by the BlockStructureManager.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        IncrementalTestTransformer.collected_block_keys = []
+        self.registered_transformers = [IncrementalTestTransformer()]
+
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.modulestore = MockModulestoreFactory.create(self.children_map, self.block_key_factory)
+        self.modulestore.structures = {'v1': create_structure(self.children_map)}
+        self.modulestore.get_structure = lambda course_key, version: self.modulestore.structures.get(version)
+        self.set_course_version('v1')
+        self.cache = MockCache()
+        self.bs_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, self.cache)
+
+    def set_course_version(self, version):
+        """
+        Sets the version of the course structure in the mock modulestore.
+        """
+        self.modulestore.get_item(self.block_key_factory(0)).field_map['course_version'] = version
+
+    def update_collected(self):
+        """
+        Updates the collected block structure and returns the keys of
+        the blocks that were collected.
+        """
+        IncrementalTestTransformer.collected_block_keys = []
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed()
+            block_structure = self.bs_manager.get_collected()
+        self.assert_block_structure(block_structure, self.children_map)
+        for block_key in block_structure:
+            assert block_structure.get_transformer_block_field(block_key, IncrementalTestTransformer, 'collected')
+        return set(IncrementalTestTransformer.collected_block_keys)
+
+    @ddt.data(True, False)
+    def test_incremental_collect(self, incremental_collect_enabled):
+        all_block_keys = {self.block_key_factory(block) for block in range(len(self.children_map))}
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=incremental_collect_enabled):
+            assert self.update_collected() == all_block_keys
+
+            self.modulestore.structures['v2'] = create_structure(self.children_map, definitions={3: 'new'})
+            self.set_course_version('v2')
+            expected_block_keys = {self.block_key_factory(3)} if incremental_collect_enabled else all_block_keys
+            assert self.update_collected() == expected_block_keys
+
+    def test_incremental_collect_unsupported_transformer(self):
+        self.registered_transformers.append(TestTransformer1())
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            self.update_collected()
+            self.modulestore.structures['v2'] = create_structure(self.children_map, definitions={3: 'new'})
+            self.set_course_version('v2')
+            assert len(self.update_collected()) == len(self.children_map)
+
+    def test_incremental_collect_without_previous_version(self):
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            self.update_collected()
+            self.set_course_version('v2')
+            assert len(self.update_collected()) == len(self.children_map)
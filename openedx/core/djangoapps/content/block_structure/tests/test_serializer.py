@@ -0,0 +1,108 @@
+"""
+Tests for block_structure/serializer.py
+"""
+# pylint: disable=protected-access
+
+import struct
+from unittest import TestCase
+
+import ddt
+import pytest
+
+from ..block_structure import TRANSFORMER_VERSION_KEY
+from ..serializer import (
+    FORMAT_MAGIC,
+    deserialize_block_structure,
+    is_columnar,
+    serialize_block_structure,
+    serialize_block_structure_legacy
+)
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@ddt.ddt
+class TestBlockStructureSerializer(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar block structure serialization format.
+    """
+
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with
+        xBlock fields and transformer data set on its blocks.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_data(MockTransformer, 'structure_wide', {'a': 1})
+        for block_key in block_structure:
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_key}')
+            if block_key % 2:
+                block_structure.override_xblock_field(block_key, 'graded', True)
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', block_key)
+        return block_structure
+
+    def assert_round_trip(self, block_structure, serialized_data):
+        """
+        Verifies that the given serialized data deserializes to the
+        same relations and data as the given block structure.
+        """
+        block_relations, transformer_data, block_data_map = deserialize_block_structure(serialized_data)
+
+        assert list(block_relations) == list(block_structure._block_relations)
+        for block_key, relations in block_structure._block_relations.items():
+            assert block_relations[block_key].children == relations.children
+            assert block_relations[block_key].parents == relations.parents
+
+        assert set(block_data_map) == set(block_structure._block_data_map)
+        for block_key, block_data in block_structure._block_data_map.items():
+            assert block_data_map[block_key].location == block_key
+            assert block_data_map[block_key].fields == block_data.fields
+            assert set(block_data_map[block_key].transformer_data) == set(block_data.transformer_data)
+            for transformer_name, data in block_data.transformer_data.items():
+                assert block_data_map[block_key].transformer_data[transformer_name].fields == data.fields
+
+        assert transformer_data[MockTransformer].fields == block_structure.transformer_data[MockTransformer].fields
+        assert transformer_data.get_or_create(MockTransformer).structure_wide == {'a': 1}
+        assert getattr(transformer_data[MockTransformer], TRANSFORMER_VERSION_KEY) == MockTransformer.WRITE_VERSION
+
+    @ddt.data(
+        [[]],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized_data = serialize_block_structure(block_structure)
+        assert is_columnar(serialized_data)
+        self.assert_round_trip(block_structure, serialized_data)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_reads_legacy_format(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized_data = serialize_block_structure_legacy(block_structure)
+        assert not is_columnar(serialized_data)
+        self.assert_round_trip(block_structure, serialized_data)
+
+    def test_block_data_without_relations(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure.override_xblock_field(10, 'display_name', 'Detached')
+        block_relations, _, block_data_map = deserialize_block_structure(serialize_block_structure(block_structure))
+        assert 10 not in block_relations
+        assert block_data_map[10].display_name == 'Detached'
+
+    def test_smaller_than_legacy_format(self):
+        children_map = [list(range(1, 200))] + [[] for _ in range(199)]
+        block_structure = self.create_collected_block_structure(children_map)
+        assert len(serialize_block_structure(block_structure)) < len(serialize_block_structure_legacy(block_structure))
+
+    def test_unsupported_version(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        serialized_data = serialize_block_structure(block_structure)
+        header_size = struct.calcsize('>4sH')
+        serialized_data = struct.pack('>4sH', FORMAT_MAGIC, 999) + serialized_data[header_size:]
+        with pytest.raises(ValueError):
+            deserialize_block_structure(serialized_data)
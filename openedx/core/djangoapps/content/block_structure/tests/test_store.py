@@ -2,13 +2,15 @@
 Tests for block_structure/cache.py
 """
 
+import itertools
+
 import pytest
 import ddt
 from edx_toggles.toggles.testutils import override_waffle_switch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -52,13 +54,28 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with pytest.raises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
-    @ddt.data(True, False)
-    def test_add_and_get(self, with_storage_backing):
+    @ddt.data(*itertools.product((True, False), (True, False)))
+    @ddt.unpack
+    def test_add_and_get(self, with_storage_backing, with_columnar_serialization):
         with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
-            self.store.add(self.block_structure)
-            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            with override_waffle_switch(COLUMNAR_SERIALIZATION, active=with_columnar_serialization):
+                self.store.add(self.block_structure)
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
             assert stored_value is not None
             self.assert_block_structure(stored_value, self.children_map)
+            assert stored_value.get_transformer_block_field(
+                self.block_key_factory(0), MockTransformer, 'test',
+            ) == f'{MockTransformer.name()} val'
+
+    @ddt.data(True, False)
+    def test_read_across_formats(self, written_as_columnar):
+        with override_waffle_switch(STORAGE_BACKING_FOR_CACHE, active=True):
+            with override_waffle_switch(COLUMNAR_SERIALIZATION, active=written_as_columnar):
+                self.store.add(self.block_structure)
+            self.mock_cache.map.clear()
+            with override_waffle_switch(COLUMNAR_SERIALIZATION, active=not written_as_columnar):
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
 
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
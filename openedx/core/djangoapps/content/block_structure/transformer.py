@@ -58,6 +58,22 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method supports incremental
+    # collection, in which only blocks that changed since the previous
+    # collection are recollected.
+    #
+    # When collecting incrementally, the block_structure passed to
+    # collect already contains the previously collected data of all
+    # unchanged blocks, as well as the transformer's previously collected
+    # non-block-specific data. The collect method should then only
+    # (re)compute block-specific data for blocks for which
+    # block_structure.needs_collect returns True.
+    #
+    # Transformers whose collect method only calls
+    # request_xblock_fields support incremental collection as is.
+    #
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -80,6 +80,21 @@ class BlockStructureTransformers:
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls, block_structure):
+        """
+        Returns whether all registered transformers support incremental
+        collection on top of the data collected in the given block
+        structure, which requires that the data was collected with the
+        transformers' current versions.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            if not transformer.SUPPORTS_INCREMENTAL_COLLECT:
+                return False
+            if block_structure._get_transformer_data_version(transformer) != transformer.WRITE_VERSION:  # pylint: disable=protected-access
+                return False
+        return True
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
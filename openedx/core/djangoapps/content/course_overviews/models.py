@@ -5,13 +5,17 @@ Declaration of CourseOverview model
 
 import json
 import logging
+import time
+from collections import defaultdict
 from datetime import datetime
 from urllib.parse import urlparse, urlunparse
+from uuid import uuid4
 
 import pytz
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.signals import post_save, post_delete
@@ -19,6 +23,7 @@ from django.db.utils import IntegrityError
 from django.template import defaultfilters
 
 from django.utils.functional import cached_property
+from edx_toggles.toggles import SettingToggle
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from simple_history.models import HistoricalRecords
@@ -38,6 +43,30 @@ from xmodule.tabs import CourseTab  # lint-amnesty, pylint: disable=wrong-import
 
 log = logging.getLogger(__name__)
 
+# .. toggle_name: ENABLE_COURSE_OVERVIEW_SHARED_CACHE
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to cache CourseOverviews, with their tabs and image sets, in the
+#   default django cache, and to let a single process at a time reload a course's outdated or missing overview
+#   from the modulestore, while the other processes briefly wait for its result.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_COURSE_OVERVIEW_SHARED_CACHE = SettingToggle(
+    "ENABLE_COURSE_OVERVIEW_SHARED_CACHE", default=False, module_name=__name__
+)
+
+# The seconds CourseOverviews are kept in the shared cache.
+COURSE_OVERVIEW_CACHE_TIMEOUT = 60 * 15
+
+# The seconds after which the lock on reloading a CourseOverview expires, if the process holding it died.
+COURSE_OVERVIEW_RELOAD_LOCK_TIMEOUT = 60
+
+# The seconds a process waits for another process to reload a CourseOverview, before loading it itself.
+COURSE_OVERVIEW_RELOAD_WAIT = 1
+
+# The seconds between checks of the shared cache while waiting for another process to reload an overview.
+COURSE_OVERVIEW_RELOAD_POLL_INTERVAL = 0.1
+
 
 class CourseOverviewCaseMismatchException(Exception):
     pass
@@ -406,6 +435,17 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
+        if ENABLE_COURSE_OVERVIEW_SHARED_CACHE.is_enabled():
+            cache_keys = cls._shared_cache_keys([course_id])
+            course_overview = cache.get(cache_keys[course_id])
+            if course_overview is None:
+                course_overview = cls._get_current_from_db(course_id)
+                if course_overview is None:
+                    course_overview = cls._load_from_module_store_once(course_id)
+                else:
+                    cls._set_shared_cache([course_overview], cache_keys)
+            return course_overview
+
         try:
             course_overview = cls.objects.select_related('image_set').get(id=course_id)
             if course_overview.version < cls.VERSION:
@@ -437,6 +477,9 @@ class CourseOverview(TimeStampedModel):
 
         Returns: dict[CourseKey, CourseOverview|None]
         """
+        if ENABLE_COURSE_OVERVIEW_SHARED_CACHE.is_enabled():
+            return cls._get_from_ids_shared_cache(course_ids)
+
         overviews = {
             overview.id: overview
             for overview in cls.objects.select_related('image_set').filter(
@@ -452,6 +495,146 @@ class CourseOverview(TimeStampedModel):
                     overviews[course_id] = None
         return overviews
 
+    @classmethod
+    def _get_from_ids_shared_cache(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, like get_from_ids.
+
+        Gets all the overviews in the shared cache at once, then selects the
+        remaining overviews in one query, and reloads only the missing or
+        outdated ones from the modulestore.
+        """
+        cache_keys = cls._shared_cache_keys(course_ids)
+        cached_overviews = cache.get_many(list(cache_keys.values()))
+        overviews = {
+            course_id: cached_overviews[cache_key]
+            for course_id, cache_key in cache_keys.items()
+            if cache_key in cached_overviews
+        }
+        uncached_ids = [course_id for course_id in cache_keys if course_id not in overviews]
+        if uncached_ids:
+            current_overviews = list(cls.objects.select_related('image_set').filter(
+                id__in=uncached_ids,
+                version__gte=cls.VERSION
+            ))
+            # Overviews without image sets are cached once get_from_id regenerates their thumbnails.
+            cls._set_shared_cache(
+                [overview for overview in current_overviews if hasattr(overview, 'image_set')], cache_keys,
+            )
+            overviews.update((overview.id, overview) for overview in current_overviews)
+        for course_id in uncached_ids:
+            if course_id not in overviews:
+                try:
+                    overviews[course_id] = cls._load_from_module_store_once(course_id)
+                except CourseOverview.DoesNotExist:
+                    overviews[course_id] = None
+        return overviews
+
+    @classmethod
+    def _get_current_from_db(cls, course_id):
+        """
+        Return the CourseOverview of the given course from the database, or
+        None if it doesn't exist or is outdated.
+        """
+        try:
+            course_overview = cls.objects.select_related('image_set').get(id=course_id)
+        except cls.DoesNotExist:
+            return None
+        if course_overview.version < cls.VERSION:
+            return None
+        if not hasattr(course_overview, 'image_set'):
+            CourseOverviewImageSet.create(course_overview)
+        return course_overview
+
+    @classmethod
+    def _load_from_module_store_once(cls, course_id):
+        """
+        Load the CourseOverview of the given course from the module store, and
+        store it in the shared cache.
+
+        Only one process at a time reloads the overview of a course: the others
+        briefly wait for its result in the shared cache, so that publishing a
+        course doesn't cause every concurrent request to reload its overview.
+        Processes that are still waiting after COURSE_OVERVIEW_RELOAD_WAIT
+        seconds load the overview themselves.
+        """
+        lock_key = f'{cls._shared_cache_key(course_id)}.reload'
+        deadline = time.time() + COURSE_OVERVIEW_RELOAD_WAIT
+        waited = False
+        while not cache.add(lock_key, True, COURSE_OVERVIEW_RELOAD_LOCK_TIMEOUT):
+            if time.time() >= deadline:
+                log.info("Stopped waiting for the CourseOverview of course %s to be reloaded.", course_id)
+                return cls._get_current_from_db(course_id) or cls.load_from_module_store(course_id)
+            time.sleep(COURSE_OVERVIEW_RELOAD_POLL_INTERVAL)
+            waited = True
+            course_overview = cache.get(cls._shared_cache_keys([course_id])[course_id])
+            if course_overview is not None:
+                return course_overview
+        try:
+            course_overview = None
+            if waited:
+                # The overview may have been reloaded by the process we waited for.
+                cache_keys = cls._shared_cache_keys([course_id])
+                course_overview = cls._get_current_from_db(course_id)
+            if course_overview is None:
+                course_overview = cls.load_from_module_store(course_id)
+                # Saving the overview invalidated the keys read before.
+                cache_keys = cls._shared_cache_keys([course_id])
+            cls._set_shared_cache([course_overview], cache_keys)
+        finally:
+            cache.delete(lock_key)
+        return course_overview
+
+    @classmethod
+    def _set_shared_cache(cls, course_overviews, cache_keys):
+        """
+        Store the given CourseOverviews, with their tabs, in the shared cache,
+        under the `cache_keys` of their courses that were current when they
+        were read.
+        """
+        if not course_overviews:
+            return
+        tab_dicts = defaultdict(list)
+        for tab_dict in CourseOverviewTab.objects.filter(
+            course_overview_id__in=[course_overview.id for course_overview in course_overviews]
+        ).order_by('id').values():
+            tab_dicts[tab_dict['course_overview_id']].append(tab_dict)
+        for course_overview in course_overviews:
+            course_overview._cached_tab_dicts = tab_dicts[course_overview.id]  # pylint: disable=protected-access
+        cache.set_many(
+            {cache_keys[course_overview.id]: course_overview for course_overview in course_overviews},
+            COURSE_OVERVIEW_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def _shared_cache_keys(cls, course_ids):
+        """
+        Return the current shared cache keys of the overviews of the given
+        courses, by course id.
+
+        The keys contain a generation of each course that is replaced whenever
+        its overview is invalidated, so an overview that was read before an
+        invalidation is never cached under a key that is read after it.
+        """
+        generation_keys = {course_id: cls._shared_cache_generation_key(course_id) for course_id in course_ids}
+        generations = cache.get_many(list(generation_keys.values()))
+        cache_keys = {}
+        for course_id, generation_key in generation_keys.items():
+            generation = generations.get(generation_key)
+            if generation is None:
+                cache.add(generation_key, uuid4().hex, None)
+                generation = cache.get(generation_key)
+            cache_keys[course_id] = f'{cls._shared_cache_key(course_id)}.{generation}'
+        return cache_keys
+
+    @classmethod
+    def _shared_cache_generation_key(cls, course_id):
+        return f'{cls._shared_cache_key(course_id)}.generation'
+
+    @classmethod
+    def _shared_cache_key(cls, course_id):
+        return f'course_overview.{cls.VERSION}.{course_id}'
+
     @classmethod
     def _get_course_has_highlights(cls, course):
         # Avoid circular import here
@@ -724,8 +907,11 @@ class CourseOverview(TimeStampedModel):
         """
         Returns an iterator of CourseTabs.
         """
-        for tab_dict in self.tab_set.all().values():
-            tab = CourseTab.from_json(tab_dict)
+        tab_dicts = getattr(self, '_cached_tab_dicts', None)
+        if tab_dicts is None:
+            tab_dicts = self.tab_set.all().values()
+        for tab_dict in tab_dicts:
+            tab = CourseTab.from_json(dict(tab_dict))
             if tab is None:
                 log.warning("Can't instantiate CourseTab from %r", tab_dict)
             else:
@@ -939,6 +1125,12 @@ class CourseOverview(TimeStampedModel):
         """
         return self._original_course.edxnotes_visibility
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # The course block is never cached with the overview.
+        state.pop('_original_course', None)
+        return state
+
     def __str__(self):
         """Represent ourselves with the course key."""
         return str(self.id)
@@ -1169,7 +1361,35 @@ def _invalidate_overview_cache(**kwargs):  # pylint: disable=unused-argument
     RequestCache('course_overview').clear()
 
 
+def _invalidate_shared_overview_cache(course_id):
+    """
+    Invalidate the shared cache of the given course's overview, now and once
+    the current transaction commits (so that the overview isn't cached with
+    the tabs and image set being replaced in the transaction), by replacing
+    the generation of the course in its cache keys.
+    """
+    generation_key = CourseOverview._shared_cache_generation_key(course_id)  # pylint: disable=protected-access
+
+    def replace_generation():
+        cache.set(generation_key, uuid4().hex, None)
+
+    replace_generation()
+    transaction.on_commit(replace_generation)
+
+
+def _invalidate_shared_overview_cache_for_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    _invalidate_shared_overview_cache(instance.id)
+
+
+def _invalidate_shared_overview_cache_for_image_set(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    _invalidate_shared_overview_cache(instance.course_overview_id)
+
+
 post_save.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_save.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverview)
 post_delete.connect(_invalidate_overview_cache, sender=CourseOverviewImageConfig)
+post_save.connect(_invalidate_shared_overview_cache_for_overview, sender=CourseOverview)
+post_delete.connect(_invalidate_shared_overview_cache_for_overview, sender=CourseOverview)
+post_save.connect(_invalidate_shared_overview_cache_for_image_set, sender=CourseOverviewImageSet)
+post_delete.connect(_invalidate_shared_overview_cache_for_image_set, sender=CourseOverviewImageSet)
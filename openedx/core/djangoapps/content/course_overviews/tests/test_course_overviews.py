@@ -13,9 +13,11 @@ import math  # lint-amnesty, pylint: disable=wrong-import-order
 import ddt
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test.utils import override_settings
 from django.utils import timezone
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 
@@ -42,6 +44,7 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase  # lint-a
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range  # lint-amnesty, pylint: disable=wrong-import-order
 
 from ..models import CourseOverview, CourseOverviewImageConfig, CourseOverviewImageSet, CourseOverviewTab
+from ..models import _invalidate_shared_overview_cache
 from .factories import CourseOverviewFactory
 
 
@@ -623,6 +626,104 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         assert CourseOverview.objects.filter(id=course_key).exists()
 
 
+@override_settings(ENABLE_COURSE_OVERVIEW_SHARED_CACHE=True)
+class CourseOverviewSharedCacheTestCase(ModuleStoreTestCase, CacheIsolationTestCase):
+    """
+    Tests for the shared cache of CourseOverviews.
+    """
+    ENABLED_CACHES = ['default']
+    ENABLED_SIGNALS = ['course_published']
+
+    def setUp(self):
+        super().setUp()
+        self.course = CourseFactory.create()
+
+    def test_get_from_id(self):
+        course_overview = CourseOverview.get_from_id(self.course.id)
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            cached_overview = CourseOverview.get_from_id(self.course.id)
+            cached_tab_ids = [tab.tab_id for tab in cached_overview.tabs]
+        assert cached_overview.id == course_overview.id
+        assert cached_tab_ids == [tab.tab_id for tab in course_overview.tab_set.all()]
+
+    def test_publish_invalidates(self):
+        CourseOverview.get_from_id(self.course.id)
+        self.course.display_name = 'Updated display name'
+        with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            self.store.update_item(self.course, ModuleStoreEnum.UserID.test)
+        RequestCache.clear_all_namespaces()
+        assert CourseOverview.get_from_id(self.course.id).display_name == 'Updated display name'
+
+    def test_get_from_ids(self):
+        other_course = CourseFactory.create()
+        non_existent_course_key = CourseKey.from_string('course-v1:This+Course+IsFake')
+        course_ids = [self.course.id, other_course.id, non_existent_course_key]
+        CourseOverview.get_from_ids(course_ids)
+        with mock.patch.object(
+            CourseOverview,
+            'load_from_module_store',
+            wraps=CourseOverview.load_from_module_store
+        ) as mock_load_from_modulestore:
+            overviews_by_id = CourseOverview.get_from_ids(course_ids)
+        assert overviews_by_id[self.course.id].id == self.course.id
+        assert overviews_by_id[other_course.id].id == other_course.id
+        assert overviews_by_id[non_existent_course_key] is None
+        assert mock_load_from_modulestore.call_count == 1
+
+    def test_stale_read_not_cached(self):
+        get_current_from_db = CourseOverview._get_current_from_db  # pylint: disable=protected-access
+
+        def read_before_commit(course_id):
+            # The overview is read before a concurrent update commits.
+            course_overview = get_current_from_db(course_id)
+            _invalidate_shared_overview_cache(course_id)
+            return course_overview
+
+        with mock.patch.object(CourseOverview, '_get_current_from_db', side_effect=read_before_commit):
+            CourseOverview.get_from_id(self.course.id)
+        cache_keys = CourseOverview._shared_cache_keys([self.course.id])  # pylint: disable=protected-access
+        assert cache.get(cache_keys[self.course.id]) is None
+
+    def test_single_flight_reload(self):
+        CourseOverview.objects.filter(id=self.course.id).update(version=CourseOverview.VERSION - 1)
+        cache_key = CourseOverview._shared_cache_key(self.course.id)  # pylint: disable=protected-access
+        cache.add(f'{cache_key}.reload', True)
+        load_from_module_store = CourseOverview.load_from_module_store
+
+        def reloaded(_seconds):
+            # Another process finishes reloading the overview.
+            course_overview = load_from_module_store(self.course.id)
+            cache_keys = CourseOverview._shared_cache_keys([self.course.id])  # pylint: disable=protected-access
+            cache.set(cache_keys[self.course.id], course_overview)
+
+        with mock.patch.object(
+            CourseOverview,
+            'load_from_module_store',
+            wraps=CourseOverview.load_from_module_store
+        ) as mock_load_from_modulestore, mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.time.sleep', side_effect=reloaded
+        ):
+            course_overview = CourseOverview.get_from_id(self.course.id)
+        assert course_overview.id == self.course.id
+        assert mock_load_from_modulestore.call_count == 0
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.models.COURSE_OVERVIEW_RELOAD_WAIT', 0)
+    def test_reload_wait_timeout(self):
+        CourseOverview.objects.filter(id=self.course.id).update(version=CourseOverview.VERSION - 1)
+        cache_key = CourseOverview._shared_cache_key(self.course.id)  # pylint: disable=protected-access
+        cache.add(f'{cache_key}.reload', True)
+
+        with mock.patch.object(
+            CourseOverview,
+            'load_from_module_store',
+            wraps=CourseOverview.load_from_module_store
+        ) as mock_load_from_modulestore:
+            course_overview = CourseOverview.get_from_id(self.course.id)
+        assert course_overview.id == self.course.id
+        assert mock_load_from_modulestore.call_count == 1
+
+
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
     """
@@ -1,11 +1,19 @@
 """
 Helper functions for caching course assets.
+
+Course assets are cached in two tiers: the metadata of assets (everything but
+their data) is cached in the shared "course_assets" cache, so that requests
+can be authorized and conditional requests answered without querying the
+contentstore, and the data of small, frequently requested assets is cached
+in a bounded, process-local LRU cache.
 """
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from openedx.core.lib.cache_utils import BoundedLRUCache
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -15,18 +23,32 @@ except InvalidCacheBackendError:
     pass
 
 
-def set_cached_content(content):
+def _metadata_key(location):
+    """
+    Return the key of the cached metadata of the content at `location`.
+    """
+    return f"metadata:{location}".encode("utf-8")
+
+
+def set_cached_content_metadata(content):
     """
-    Stores the given piece of content in the cache, using its location as the key.
+    Stores the metadata of the given piece of content, without its data, in the cache.
     """
-    CONTENT_CACHE.set(str(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+    CONTENT_CACHE.set(_metadata_key(content.location), metadata, version=STATIC_CONTENT_VERSION)
 
 
-def get_cached_content(location):
+def get_cached_content_metadata(location):
     """
-    Retrieves the given piece of content by its location if cached.
+    Retrieves the metadata of the given piece of content by its location if cached, as a
+    StaticContent without data.
     """
-    return CONTENT_CACHE.get(str(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+    return CONTENT_CACHE.get(_metadata_key(location), version=STATIC_CONTENT_VERSION)
 
 
 def del_cached_content(location):
@@ -36,15 +58,89 @@ def del_cached_content(location):
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
     """
-    def location_str(loc):
-        """Force the location to a Unicode string."""
-        return str(loc).encode("utf-8")
-
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.delete_many([_metadata_key(loc) for loc in locations], version=STATIC_CONTENT_VERSION)
+
+    local_cache = get_local_content_cache()
+    if local_cache is not None:
+        for loc in locations:
+            local_cache.delete(loc)
+
+
+class LocalContentCache:
+    """
+    A bounded, process-local LRU cache of small assets, with their data in memory.
+
+    Other processes can't invalidate it when an asset changes, so entries
+    expire after `timeout` seconds.
+    """
+    def __init__(self, max_bytes, max_asset_bytes, timeout):
+        self.max_bytes = max_bytes
+        self.max_asset_bytes = max_asset_bytes
+        self.timeout = timeout
+        self._assets = BoundedLRUCache(max_bytes, timeout=timeout)
+
+    def accepts(self, length):
+        """
+        Return whether assets of `length` bytes are cached.
+        """
+        return length is not None and length <= min(self.max_asset_bytes, self.max_bytes)
+
+    def get(self, location):
+        """
+        Return the content cached for `location`, or None if it is not cached or has expired.
+        """
+        return self._assets.get(str(location))
+
+    def set(self, content):
+        """
+        Cache the in-memory `content`, unless it is too large.
+        """
+        size = len(content.data)
+        if self.accepts(size):
+            self._assets.set(str(content.location), content, size)
+
+    def delete(self, location):
+        """
+        Remove the content cached for `location`, if any.
+        """
+        self._assets.delete(str(location))
+
+    def clear(self):
+        """
+        Remove all assets from the cache.
+        """
+        self._assets.clear()
+
+    def __len__(self):
+        return len(self._assets)
+
+
+_LOCAL_CONTENT_CACHE = None
+
+
+def get_local_content_cache():
+    """
+    Return the process-wide :class:`LocalContentCache`, or None if it is
+    disabled by setting ``CONTENTSERVER_LOCAL_CACHE_MAX_BYTES`` to 0.
+    """
+    global _LOCAL_CONTENT_CACHE  # pylint: disable=global-statement
+    max_bytes = getattr(settings, 'CONTENTSERVER_LOCAL_CACHE_MAX_BYTES', 0)
+    max_asset_bytes = getattr(settings, 'CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES', 64 * 1024)
+    timeout = getattr(settings, 'CONTENTSERVER_LOCAL_CACHE_TIMEOUT', 60)
+    if not max_bytes:
+        return None
+    if (
+        _LOCAL_CONTENT_CACHE is None or
+        _LOCAL_CONTENT_CACHE.max_bytes != max_bytes or
+        _LOCAL_CONTENT_CACHE.max_asset_bytes != max_asset_bytes or
+        _LOCAL_CONTENT_CACHE.timeout != timeout
+    ):
+        _LOCAL_CONTENT_CACHE = LocalContentCache(max_bytes, max_asset_bytes, timeout)
+    return _LOCAL_CONTENT_CACHE
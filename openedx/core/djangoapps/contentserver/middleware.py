@@ -5,6 +5,7 @@ Middleware to serve assets.
 
 import datetime
 import logging
+from uuid import uuid4
 
 from django.http import (
     HttpResponse,
@@ -12,7 +13,8 @@ from django.http import (
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseNotModified,
-    HttpResponsePermanentRedirect
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse
 )
 from django.utils.deprecation import MiddlewareMixin
 from opaque_keys import InvalidKeyError
@@ -21,12 +23,12 @@ from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
 from common.djangoapps.student.models import CourseEnrollment
 from xmodule.assetstore.assetmgr import AssetManager  # lint-amnesty, pylint: disable=wrong-import-order
-from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent  # lint-amnesty, pylint: disable=wrong-import-order
+from xmodule.contentstore.content import XASSET_LOCATION_TAG, StaticContent, StaticContentStream  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.exceptions import NotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore import InvalidLocationError  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.exceptions import ItemNotFoundError  # lint-amnesty, pylint: disable=wrong-import-order
 
-from .caching import get_cached_content, set_cached_content
+from .caching import get_cached_content_metadata, get_local_content_cache, set_cached_content_metadata
 from .models import CdnUserAgentsConfig, CourseAssetCacheTtlConfig
 
 log = logging.getLogger(__name__)
@@ -78,7 +80,8 @@ class StaticContentServer(MiddlewareMixin):
                 return HttpResponseBadRequest()
 
             # Attempt to load the asset to make sure it exists, and grab the asset digest
-            # if we're able to load it.
+            # if we're able to load it.  This only loads the metadata of the asset, from
+            # the cache if possible; its data is only read once we know we need to send it.
             actual_digest = None
             try:
                 content = self.load_asset_from_location(loc)
@@ -118,24 +121,25 @@ class StaticContentServer(MiddlewareMixin):
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            if self.is_not_modified(request, content):
+                return HttpResponseNotModified()
+
+            # Now that we know we need the data of the asset, get it.
+            if not self.has_data(content):
+                try:
+                    content = self.load_asset_data(loc)
+                except (ItemNotFoundError, NotFoundError):
+                    return HttpResponseNotFound()
 
-            # *** File streaming within a byte range ***
+            # *** File streaming within byte ranges ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
-            # Request -> Range attribute structure: "Range: bytes=first-[last]"
+            # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]...]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
+            content_type = content.content_type
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -146,40 +150,49 @@ class StaticContentServer(MiddlewareMixin):
                         str(exception), header_value, str(loc)
                     )
                 else:
+                    # Unsatisfiable ranges are ignored, unless none of the ranges can be satisfied.
+                    satisfiable_ranges = [
+                        (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                    ]
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning("Unknown unit in Range header: %s for content: %s", header_value, str(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif not satisfiable_ranges:
                         log.warning(
-                            "More than 1 ranges in Range header: %s for content: %s", header_value, str(loc)
+                            "Cannot satisfy ranges in Range header: %s for content: %s",
+                            header_value, str(loc)
+                        )
+                        return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                    elif len(satisfiable_ranges) == 1:
+                        first, last = satisfiable_ranges[0]
+                        response = self.make_response(content, content.stream_data_in_range(first, last))
+                        response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
+                            first=first, last=last, length=content.length
                         )
+                        response['Content-Length'] = str(last - first + 1)
+                        response.status_code = 206  # Partial Content
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
-                            )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
-                            log.warning(
-                                "Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, str(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
+                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                        boundary = uuid4().hex
+                        parts = [
+                            (first, last, multipart_byteranges_part_header(boundary, content, first, last))
+                            for first, last in satisfiable_ranges
+                        ]
+                        end = f'--{boundary}--\r\n'.encode('utf-8')
+                        response = self.make_response(content, stream_multipart_byteranges(content, parts, end))
+                        response['Content-Length'] = str(
+                            sum(len(header) + (last - first + 1) + 2 for first, last, header in parts) + len(end)
+                        )
+                        response.status_code = 206  # Partial Content
+                        content_type = f'multipart/byteranges; boundary={boundary}'
+
+                    if response is not None and newrelic:
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                response = self.make_response(content, content.stream_data())
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -188,7 +201,7 @@ class StaticContentServer(MiddlewareMixin):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -225,6 +238,8 @@ class StaticContentServer(MiddlewareMixin):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        if getattr(content, "content_digest", None):
+            response['ETag'] = f'"{content.content_digest}"'
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -278,31 +293,117 @@ class StaticContentServer(MiddlewareMixin):
 
         return True
 
-    def load_asset_from_location(self, location):
+    def is_not_modified(self, request, content):
         """
-        Loads an asset based on its location, either retrieving it from a cache
-        or loading it directly from the contentstore.
+        Determines whether the conditional request, if any, is for the current version of the given asset.
         """
+        # If-None-Match takes precedence over If-Modified-Since.
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            digest = getattr(content, "content_digest", None)
+            if not digest:
+                return False
+            etags = [etag.strip() for etag in request.META['HTTP_IF_NONE_MATCH'].split(',')]
+            # Weak comparison: weak and strong validators with the same value match.
+            etags = [etag[2:] if etag.startswith('W/') else etag for etag in etags]
+            return '*' in etags or f'"{digest}"' in etags
 
-        # See if we can load this item from cache.
-        content = get_cached_content(location)
+        if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+            return request.META['HTTP_IF_MODIFIED_SINCE'] == last_modified_at_str
+
+        return False
+
+    @staticmethod
+    def has_data(content):
+        """
+        Determines whether the given content has its data, in memory or as a stream,
+        rather than being only the cached metadata of an asset.
+        """
+        return isinstance(content, StaticContentStream) or content.data is not None
+
+    @staticmethod
+    def make_response(content, chunks):
+        """
+        Returns a response with the given chunks of the data of the given content as its body.
+
+        Assets that are read from the contentstore are streamed, chunk by chunk, and their
+        stream is closed once the response is sent.
+        """
+        if isinstance(content, StaticContentStream):
+            return StreamingHttpResponse(stream_and_close(content, chunks))
+        return HttpResponse(chunks)
+
+    def load_asset_from_location(self, location):
+        """
+        Loads an asset based on its location, either retrieving it, or only its metadata,
+        from a cache or loading it directly from the contentstore.
+
+        Use `has_data` to check whether the data of the returned asset was loaded,
+        and `load_asset_data` to load it if not.
+        """
+        local_cache = get_local_content_cache()
+        content = local_cache.get(location) if local_cache is not None else None
         if content is None:
-            # Not in cache, so just try and load it from the asset manager.
-            try:
-                content = AssetManager.find(location, as_stream=True)
-            except (ItemNotFoundError, NotFoundError):  # lint-amnesty, pylint: disable=try-except-raise
-                raise
+            content = get_cached_content_metadata(location)
+        if content is None:
+            content = self.load_asset_data(location)
+        return content
+
+    def load_asset_data(self, location):
+        """
+        Loads an asset, with its data, from the contentstore, and caches it.
+
+        The metadata of every asset is cached, but only small assets are cached
+        with their data, in memory; other assets are returned as a stream.
+        """
+        content = AssetManager.find(location, as_stream=True)
+        set_cached_content_metadata(content)
 
-            # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
-                content = content.copy_to_in_mem()
-                set_cached_content(content)
+        local_cache = get_local_content_cache()
+        if local_cache is not None and local_cache.accepts(content.length):
+            in_mem_content = content.copy_to_in_mem()
+            content.close()
+            local_cache.set(in_mem_content)
+            content = in_mem_content
 
         return content
 
 
+def stream_and_close(content, chunks):
+    """
+    Yields the given chunks of data of the given content stream, then closes the stream.
+    """
+    try:
+        yield from chunks
+    finally:
+        content.close()
+
+
+def multipart_byteranges_part_header(boundary, content, first, last):
+    """
+    Returns the boundary and headers that start the part of a multipart/byteranges
+    response for the given range of the given content.
+    """
+    return (
+        f'--{boundary}\r\n'
+        f'Content-Type: {content.content_type}\r\n'
+        f'Content-Range: bytes {first}-{last}/{content.length}\r\n'
+        '\r\n'
+    ).encode('utf-8')
+
+
+def stream_multipart_byteranges(content, parts, end):
+    """
+    Yields the body of a multipart/byteranges response with the given
+    (first, last, header) parts of the given content, followed by `end`.
+    """
+    for first, last, header in parts:
+        yield header
+        yield from content.stream_data_in_range(first, last)
+        yield b'\r\n'
+    yield end
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -28,6 +28,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from common.djangoapps.student.models import CourseEnrollment
 from common.djangoapps.student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import del_cached_content, get_local_content_cache
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -243,17 +244,51 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message with each range.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
-        # lint-amnesty, pylint: disable=bad-option-value, unicode-format-string
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        assert resp.status_code == 200
+        assert resp.status_code == 206
         assert 'Content-Range' not in resp
-        assert resp['Content-Length'] == str(self.length_unlocked)
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        assert content_type == 'multipart/byteranges'
+
+        content = self.contentstore.find(self.unlocked_asset)
+        body = b''.join(resp.streaming_content)
+        assert resp['Content-Length'] == str(len(body))
+        expected_body = b''
+        for first, last in [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]:
+            expected_body += (
+                '--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {first}-{last}/{length}\r\n\r\n'
+            ).format(
+                boundary=boundary, content_type=content.content_type, first=first, last=last,
+                length=self.length_unlocked,
+            ).encode('utf-8')
+            expected_body += content.data[first:last + 1] + b'\r\n'
+        expected_body += f'--{boundary}--\r\n'.encode('utf-8')
+        assert body == expected_body
+
+    def test_range_request_multiple_ranges_one_satisfiable(self):
+        """
+        Test that unsatisfiable ranges are ignored when other ranges in request can be satisfied.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+
+        assert resp.status_code == 206
+        assert resp['Content-Range'] == f'bytes 0-9/{self.length_unlocked}'
+        assert resp['Content-Length'] == '10'
+
+    def test_streamed_content(self):
+        """
+        Test that assets are streamed from the contentstore.
+        """
+        resp = self.client.get(self.url_unlocked)
+        assert resp.streaming
+        assert b''.join(resp.streaming_content) == self.contentstore.find(self.unlocked_asset).data
 
     @ddt.data(
         'bytes 0-',
@@ -356,6 +391,70 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         assert 'Expires' not in resp
         assert 'private, no-cache, no-store' == resp['Cache-Control']
 
+    def test_if_modified_since(self):
+        """
+        Test that conditional requests for an unchanged asset get a 304 Not Modified response.
+        """
+        resp = self.client.get(self.url_unlocked)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        assert resp.status_code == 304
+
+    def test_if_none_match(self):
+        """
+        Test that conditional requests matching the digest of an asset get a 304 Not Modified response.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp.get('ETag')
+        if etag is None:
+            raise unittest.SkipTest("The contentstore doesn't record the digest of assets.")
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"{FAKE_MD5_HASH}", {etag}')
+        assert resp.status_code == 304
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=f'"{FAKE_MD5_HASH}"')
+        assert resp.status_code == 200
+
+    def test_conditional_request_with_cached_metadata(self):
+        """
+        Test that conditional requests are answered from the cached metadata of an asset,
+        without reading the asset from the contentstore.
+        """
+        metadata = self.contentstore.find(self.unlocked_asset)
+        last_modified = metadata.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        with patch(
+            'openedx.core.djangoapps.contentserver.middleware.get_cached_content_metadata', return_value=metadata
+        ), patch.object(AssetManager, 'find') as mock_find:
+            resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert resp.status_code == 304
+        assert not mock_find.called
+
+    @override_settings(
+        CONTENTSERVER_LOCAL_CACHE_MAX_BYTES=1024 * 1024,
+        CONTENTSERVER_LOCAL_CACHE_MAX_ASSET_BYTES=1024 * 1024,
+    )
+    def test_local_cache(self):
+        """
+        Test that small assets are served from the process-local cache once they have been read.
+        """
+        get_local_content_cache().clear()
+        self.addCleanup(get_local_content_cache().clear)
+
+        resp = self.client.get(self.url_unlocked)
+        assert resp.status_code == 200
+        assert len(get_local_content_cache()) == 1
+
+        with patch.object(AssetManager, 'find') as mock_find:
+            resp = self.client.get(self.url_unlocked)
+            ranged_resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+        assert not mock_find.called
+        data = self.contentstore.find(self.unlocked_asset).data
+        assert resp.content == data
+        assert ranged_resp.status_code == 206
+        assert ranged_resp.content == data[:10]
+
+        # Deleting the cached content removes it from the local cache too.
+        del_cached_content(self.unlocked_asset)
+        assert len(get_local_content_cache()) == 0
+
     def test_get_expiration_value(self):
         start_dt = datetime.datetime.strptime("Thu, 01 Dec 1983 20:00:00 GMT", HTTP_DATE_FORMAT)
         near_expire_dt = StaticContentServer.get_expiration_value(start_dt, 55)
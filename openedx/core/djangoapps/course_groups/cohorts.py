@@ -6,16 +6,19 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from array import array
+from bisect import bisect_left
 
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import IntegrityError
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.http import Http404
 from django.utils.translation import gettext as _
 from edx_django_utils.cache import RequestCache
+from edx_toggles.toggles import SettingToggle
 from eventtracking import tracker
 
 from lms.djangoapps.courseware import courses
@@ -35,6 +38,18 @@ from .signals.signals import COHORT_MEMBERSHIP_UPDATED
 
 log = logging.getLogger(__name__)
 
+# .. toggle_name: ENABLE_COHORT_MEMBERSHIP_INDEX
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to resolve the cohorts of the learners of grade reports from a compact
+#   index of each course's cohort memberships, built once per task, instead of querying the memberships of each
+#   batch of learners. Bulk operations over a few learners, such as the gradebook, always query their memberships.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_COHORT_MEMBERSHIP_INDEX = SettingToggle(
+    "ENABLE_COHORT_MEMBERSHIP_INDEX", default=False, module_name=__name__
+)
+
 
 @receiver(post_save, sender=CourseUserGroup)
 def _cohort_added(sender, **kwargs):  # lint-amnesty, pylint: disable=unused-argument
@@ -88,6 +103,19 @@ def _cohort_membership_changed(sender, **kwargs):  # lint-amnesty, pylint: disab
     for event in get_event_iter(user_id_iter, cohort_iter):
         tracker.emit(event_name, event)
 
+    if reverse:
+        course_keys = {cohort.course_id for cohort in cohort_iter}
+    else:
+        course_keys = {instance.course_id}
+    for course_key in course_keys:
+        invalidate_cohort_membership_index(course_key)
+
+
+@receiver(post_delete, sender=CourseUserGroup)
+def _cohort_deleted(sender, instance, **kwargs):  # lint-amnesty, pylint: disable=unused-argument
+    """Invalidates the cohort membership index of the course of a deleted cohort"""
+    invalidate_cohort_membership_index(instance.course_id)
+
 
 # A 'default cohort' is an auto-cohort that is automatically created for a course if no cohort with automatic
 # assignment have been specified. It is intended to be used in a cohorted course for users who have yet to be assigned
@@ -171,17 +199,93 @@ def _cohort_cache_key(user_id, course_key):
     return f"{user_id}.{course_key}"
 
 
-def bulk_cache_cohorts(course_key, users):
+class CohortMembershipIndex:
+    """
+    A compact index of the cohort memberships of a course: the sorted ids of
+    the users in cohorts, and the ids of their cohorts.
+    """
+    def __init__(self, user_ids, cohort_ids):
+        self.user_ids = array('q', user_ids)
+        self.cohort_ids = array('q', cohort_ids)
+
+    @classmethod
+    def from_db(cls, course_key):
+        """
+        Returns the index of the cohort memberships of the given course.
+        """
+        memberships = CohortMembership.objects.filter(course_id=course_key).order_by('user_id').values_list(
+            'user_id', 'course_user_group_id',
+        )
+        user_ids = array('q')
+        cohort_ids = array('q')
+        for user_id, cohort_id in memberships.iterator():
+            user_ids.append(user_id)
+            cohort_ids.append(cohort_id)
+        return cls(user_ids, cohort_ids)
+
+    def get_cohort_id(self, user_id):
+        """
+        Returns the id of the cohort of the given user, or None if the user
+        isn't in a cohort.
+        """
+        index = bisect_left(self.user_ids, user_id)
+        if index < len(self.user_ids) and self.user_ids[index] == user_id:
+            return self.cohort_ids[index]
+        return None
+
+    def __len__(self):
+        return len(self.user_ids)
+
+
+COHORT_MEMBERSHIP_INDEX_CACHE_NAMESPACE = "cohorts.get_cohort_membership_index"
+
+
+def get_cohort_membership_index(course_key):
+    """
+    Returns the CohortMembershipIndex of the given course, which is built
+    once per request, and rebuilt if cohort memberships of the course change.
+    """
+    request_cache = RequestCache(COHORT_MEMBERSHIP_INDEX_CACHE_NAMESPACE).data
+    index = request_cache.get(str(course_key))
+    if index is None:
+        index = request_cache[str(course_key)] = CohortMembershipIndex.from_db(course_key)
+    return index
+
+
+def invalidate_cohort_membership_index(course_key):
+    """
+    Invalidates the CohortMembershipIndex of the given course.
+    """
+    RequestCache(COHORT_MEMBERSHIP_INDEX_CACHE_NAMESPACE).data.pop(str(course_key), None)
+
+
+def bulk_cache_cohorts(course_key, users, use_membership_index=False):
     """
     Pre-fetches and caches the cohort assignments for the
     given users, for later fast retrieval by get_cohort.
+
+    Pass use_membership_index=True when caching the cohorts of many batches
+    of users in the same request or task, such as all the learners of a
+    course, to read them from the CohortMembershipIndex of the course when
+    ENABLE_COHORT_MEMBERSHIP_INDEX is enabled: building the index reads all
+    the memberships of the course.
     """
     # before populating the cache with another bulk set of data,
     # remove previously cached entries to keep memory usage low.
     RequestCache(COHORT_CACHE_NAMESPACE).clear()
     cache = RequestCache(COHORT_CACHE_NAMESPACE).data
 
-    if is_course_cohorted(course_key):
+    if use_membership_index and is_course_cohorted(course_key) and ENABLE_COHORT_MEMBERSHIP_INDEX.is_enabled():
+        index = get_cohort_membership_index(course_key)
+        cohorts_by_id = {cohort.id: cohort for cohort in get_course_cohorts(course_id=course_key)}
+        uncohorted_users = []
+        for user in users:
+            cohort = cohorts_by_id.get(index.get_cohort_id(user.id))
+            if cohort is None:
+                uncohorted_users.append(user)
+            else:
+                cache[_cohort_cache_key(user.id, course_key)] = cohort
+    elif is_course_cohorted(course_key):
         cohorts_by_user = {
             membership.user: membership
             for membership in
@@ -9,7 +9,7 @@ import ddt
 from django.contrib.auth.models import AnonymousUser, User  # lint-amnesty, pylint: disable=imported-auth-user
 from django.db import IntegrityError
 from django.http import Http404
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import CourseLocator
 from openedx_events.tests.utils import OpenEdxEventsTestMixin
@@ -198,6 +198,50 @@ class TestCohorts(ModuleStoreTestCase):
 
         pytest.raises(Http404, (lambda: cohorts.get_cohort_id(user, CourseLocator('course', 'does_not', 'exist'))))
 
+    def test_cohort_membership_index(self):
+        """
+        Make sure that cohorts.get_cohort_membership_index() returns the cohort ids of users, and is
+        rebuilt when memberships change.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        user = UserFactory()
+        other_user = UserFactory()
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[user])
+        other_cohort = CohortFactory(course_id=course.id, name="OtherTestCohort")
+
+        assert cohorts.get_cohort_membership_index(course.id).get_cohort_id(user.id) == cohort.id
+        with self.assertNumQueries(0):
+            assert cohorts.get_cohort_membership_index(course.id).get_cohort_id(user.id) == cohort.id
+
+        cohorts.add_user_to_cohort(other_cohort, other_user.username)
+        cohorts.add_user_to_cohort(other_cohort, user.username)
+        index = cohorts.get_cohort_membership_index(course.id)
+        assert index.get_cohort_id(other_user.id) == other_cohort.id
+        assert index.get_cohort_id(user.id) == other_cohort.id
+        assert len(index) == 2
+        assert index.get_cohort_id(UserFactory().id) is None
+
+    @override_settings(ENABLE_COHORT_MEMBERSHIP_INDEX=True)
+    def test_bulk_cache_cohorts_from_index(self):
+        """
+        Make sure that cohorts.bulk_cache_cohorts() caches the cohorts of the membership index, when asked to.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        users = [UserFactory() for _ in range(3)]
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=users[:2])
+
+        with patch.object(cohorts, 'get_cohort_membership_index') as mock_get_index:
+            cohorts.bulk_cache_cohorts(course.id, users)
+        mock_get_index.assert_not_called()
+
+        cohorts.bulk_cache_cohorts(course.id, users, use_membership_index=True)
+        with self.assertNumQueries(0):
+            assert [cohorts.get_cohort(user, course.id, assign=False, use_cached=True) for user in users] == [
+                cohort, cohort, None,
+            ]
+
     def test_assignment_type(self):
         """
         Make sure that cohorts.set_assignment_type() and cohorts.get_assignment_type() works correctly.
@@ -3,15 +3,42 @@
 
 
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 import requests
-from django.utils.translation import get_language
+from django.conf import settings
+from django.utils.translation import get_language, override
+from edx_toggles.toggles import SettingToggle
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# .. toggle_name: ENABLE_COMMENTS_SERVICE_CONNECTION_POOL
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to send the requests of the comments service client through a pooled
+#   keep-alive HTTP session (see COMMENTS_SERVICE_POOL_SIZE and COMMENTS_SERVICE_MAX_RETRIES), and to let
+#   perform_concurrently send independent requests in parallel. Otherwise, every request opens a new connection,
+#   and perform_concurrently sends requests one at a time.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_COMMENTS_SERVICE_CONNECTION_POOL = SettingToggle(
+    "ENABLE_COMMENTS_SERVICE_CONNECTION_POOL", default=False, module_name=__name__
+)
+
+# The session and executor of this process, and the forums config of the requests of this thread.
+_pool = threading.local()
+_pool_lock = threading.Lock()
+_session = None
+_executor = None
+_pool_pid = None
+
 
 def strip_none(dic):
     return {k: v for k, v in dic.items() if v is not None}  # lint-amnesty, pylint: disable=consider-using-dict-comprehension
@@ -32,9 +59,7 @@ def extract(dic, keys):
 
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
-    # To avoid dependency conflict
-    from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = _get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -62,7 +87,11 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+    if ENABLE_COMMENTS_SERVICE_CONNECTION_POOL.is_enabled():
+        request = get_session().request
+    else:
+        request = requests.request
+    response = request(
         method,
         url,
         data=data,
@@ -102,6 +131,87 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def _get_forums_config():
+    """
+    Returns the current ForumsConfig, or the one of the thread that started
+    the concurrent requests being performed by this thread.
+    """
+    config = getattr(_pool, 'forums_config', None)
+    if config is None:
+        # To avoid dependency conflict
+        from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
+        config = ForumsConfig.current()
+    return config
+
+
+def _reset_pool():
+    """
+    Creates the session and executor of this process, since connections and
+    threads aren't inherited by forked processes.
+    """
+    global _session, _executor, _pool_pid  # pylint: disable=global-statement
+    pool_size = settings.COMMENTS_SERVICE_POOL_SIZE
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        # Only idempotent requests are retried, and only when they get no response.
+        max_retries=Retry(total=settings.COMMENTS_SERVICE_MAX_RETRIES, backoff_factor=0.1),
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    _session = session
+    _executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='comments-service')
+    _pool_pid = os.getpid()
+
+
+def get_session():
+    """
+    Returns the pooled keep-alive HTTP session for requests to the comments
+    service.
+    """
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            _reset_pool()
+        return _session
+
+
+def _get_executor():
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            _reset_pool()
+        return _executor
+
+
+def perform_concurrently(*functions):
+    """
+    Calls the given functions, which should only perform independent requests
+    to the comments service, in parallel, and returns their results in order.
+
+    The functions are called in threads of the pool, with the language and
+    forums config of the calling thread; if any of them raises an exception,
+    the exception of the first one is raised.  Without the
+    ENABLE_COMMENTS_SERVICE_CONNECTION_POOL toggle, the functions are called
+    one at a time.
+    """
+    if not ENABLE_COMMENTS_SERVICE_CONNECTION_POOL.is_enabled() or len(functions) < 2:
+        return [function() for function in functions]
+
+    config = _get_forums_config()
+    language = get_language()
+
+    def call(function):
+        _pool.forums_config = config
+        try:
+            with override(language):
+                return function()
+        finally:
+            _pool.forums_config = None
+
+    futures = [_get_executor().submit(call, function) for function in functions]
+    return [future.result() for future in futures]
+
+
 class CommentClientError(Exception):
     pass
 
@@ -8,11 +8,13 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 from edx_django_utils.monitoring import set_code_owner_attribute
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
 
 from common.djangoapps.student.models import CourseEnrollment
+from openedx.core.djangoapps.notifications.base_notification import NotificationPreferenceSyncManager
 from openedx.core.djangoapps.notifications.config.waffle import ENABLE_NOTIFICATIONS
 from openedx.core.djangoapps.notifications.events import notification_generated_event
 from openedx.core.djangoapps.notifications.models import (
@@ -85,24 +87,35 @@ def delete_expired_notifications():
 def send_notifications(user_ids, course_key: str, app_name, notification_type, context, content_url):
     """
     Send notifications to the users.
+
+    Audiences larger than settings.NOTIFICATIONS_AUDIENCE_CHUNK_SIZE are split
+    into subtasks, each notifying a chunk of the users.
     """
     course_key = CourseKey.from_string(course_key)
     if not ENABLE_NOTIFICATIONS.is_enabled(course_key):
         return
     user_ids = list(set(user_ids))
 
+    chunk_size = settings.NOTIFICATIONS_AUDIENCE_CHUNK_SIZE
+    if len(user_ids) > chunk_size:
+        logger.info(f'Sending {notification_type} notifications to {len(user_ids)} users in chunks of {chunk_size}')
+        for start in range(0, len(user_ids), chunk_size):
+            send_notifications.delay(
+                user_ids[start:start + chunk_size], str(course_key), app_name, notification_type, context, content_url,
+            )
+        return
+
     # check if what is preferences of user and make decision to send notification or not
     preferences = CourseNotificationPreference.objects.filter(
         user_id__in=user_ids,
         course_id=course_key,
     )
     preferences = create_notification_pref_if_not_exists(user_ids, list(preferences), course_key)
+    update_user_preferences(preferences)
     notifications = []
     audience = []
     for preference in preferences:
-        preference = update_user_preference(preference, preference.user, course_key)
         if (
-            preference and
             preference.get_web_config(app_name, notification_type) and
             preference.get_app_config(app_name).get('enabled', False)
         ):
@@ -117,23 +130,43 @@ def send_notifications(user_ids, course_key: str, app_name, notification_type, c
                 )
             )
             audience.append(preference.user_id)
-    # send notification to users but use bulk_create
-    notifications_generated = Notification.objects.bulk_create(notifications)
-    if notifications_generated:
-        notification_content = notifications_generated[0].content
+    # send notification to users but use bulk_create, one batch at a time
+    batch_size = settings.NOTIFICATIONS_BULK_CREATE_BATCH_SIZE
+    for start in range(0, len(notifications), batch_size):
+        Notification.objects.bulk_create(notifications[start:start + batch_size])
+    if notifications:
+        notification_content = notifications[0].content
         notification_generated_event(
             audience, app_name, notification_type, course_key, content_url, notification_content,
         )
 
 
-def update_user_preference(preference: CourseNotificationPreference, user, course_id):
+def update_user_preferences(preferences: List[CourseNotificationPreference]):
     """
-    Update user preference if config version is changed.
+    Update the preferences whose config version is changed, in bulk.
     """
     current_version = get_course_notification_preference_config_version()
-    if preference.config_version != current_version:
-        return preference.get_updated_user_course_preferences(user, course_id)
-    return preference
+    outdated_preferences = []
+    for preference in preferences:
+        # Preferences created in bulk (without a primary key) have the current config version.
+        if preference.config_version == current_version or preference.pk is None:
+            continue
+        try:
+            preference.notification_preference_config = NotificationPreferenceSyncManager.update_preferences(
+                preference.notification_preference_config
+            )
+            preference.config_version = current_version
+            preference.modified = timezone.now()
+            outdated_preferences.append(preference)
+        # pylint: disable-next=broad-except
+        except Exception as e:
+            logger.error(f'Unable to update notification preference for user {preference.user_id} to new config. {e}')
+    if outdated_preferences:
+        CourseNotificationPreference.objects.bulk_update(
+            outdated_preferences,
+            ['notification_preference_config', 'config_version', 'modified'],
+            batch_size=settings.NOTIFICATIONS_BULK_CREATE_BATCH_SIZE,
+        )
 
 
 def create_notification_pref_if_not_exists(user_ids: List, preferences: List, course_id: CourseKey):
@@ -141,9 +174,10 @@ def create_notification_pref_if_not_exists(user_ids: List, preferences: List, co
     Create notification preference if not exist.
     """
     new_preferences = []
+    existing_user_ids = {preference.user_id for preference in preferences}
 
     for user_id in user_ids:
-        if not any(preference.user_id == int(user_id) for preference in preferences):
+        if int(user_id) not in existing_user_ids:
             new_preferences.append(CourseNotificationPreference(
                 user_id=user_id,
                 course_id=course_id,
@@ -5,6 +5,7 @@ Tests for notifications tasks.
 from unittest.mock import patch
 
 import ddt
+from django.test.utils import override_settings
 from edx_toggles.toggles.testutils import override_waffle_flag
 
 from common.djangoapps.student.tests.factories import UserFactory
@@ -13,7 +14,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 
 from ..config.waffle import ENABLE_NOTIFICATIONS
 from ..models import CourseNotificationPreference, Notification
-from ..tasks import create_notification_pref_if_not_exists, send_notifications, update_user_preference
+from ..tasks import create_notification_pref_if_not_exists, send_notifications, update_user_preferences
 
 
 @patch('openedx.core.djangoapps.notifications.models.COURSE_NOTIFICATION_CONFIG_VERSION', 1)
@@ -52,17 +53,21 @@ class TestNotificationsTasks(ModuleStoreTestCase):
             config_version=1,
         )
 
-    def test_update_user_preference(self):
+    def test_update_user_preferences(self):
         """
-        Test whether update_user_preference updates the preference with the latest config version.
+        Test whether update_user_preferences updates the preferences with an outdated config version.
         """
-        # Test whether update_user_preference updates the preference with a different config version
-        updated_preference = update_user_preference(self.preference_v1, self.user, self.course_1.id)
-        self.assertEqual(updated_preference.config_version, 1)
+        modified = self.preference_v2.modified
+        update_user_preferences([self.preference_v1, self.preference_v2])
 
-        # Test whether update_user_preference does not update the preference if the config version is the same
-        updated_preference = update_user_preference(self.preference_v2, self.user, self.course_2.id)
-        self.assertEqual(updated_preference.config_version, 1)
+        # Test whether update_user_preferences updates the preference with a different config version
+        self.preference_v1.refresh_from_db()
+        self.assertEqual(self.preference_v1.config_version, 1)
+
+        # Test whether update_user_preferences does not update the preference if the config version is the same
+        self.preference_v2.refresh_from_db()
+        self.assertEqual(self.preference_v2.config_version, 1)
+        self.assertEqual(self.preference_v2.modified, modified)
 
     @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
     def test_create_notification_pref_if_not_exists(self):
@@ -159,3 +164,27 @@ class SendNotificationsTest(ModuleStoreTestCase):
         # Assert that `Notification` objects are not created for the users.
         notification = Notification.objects.filter(user_id=self.user.id).first()
         self.assertIsNone(notification)
+
+    @override_waffle_flag(ENABLE_NOTIFICATIONS, active=True)
+    @override_settings(NOTIFICATIONS_AUDIENCE_CHUNK_SIZE=2, NOTIFICATIONS_BULK_CREATE_BATCH_SIZE=1)
+    @patch('openedx.core.djangoapps.notifications.models.COURSE_NOTIFICATION_CONFIG_VERSION', 1)
+    def test_send_notifications_in_chunks(self):
+        """
+        Test send_notifications notifies large audiences in chunks, updating outdated preferences.
+        """
+        users = [self.user] + [UserFactory() for _ in range(4)]
+        context = {
+            'post_title': 'Post title',
+            'replier_name': 'replier name',
+        }
+        content_url = 'https://example.com/'
+
+        with patch.object(send_notifications, 'delay', wraps=send_notifications.delay) as mock_delay:
+            send_notifications(
+                [user.id for user in users], str(self.course_1.id), 'discussion', 'new_response', context, content_url,
+            )
+
+        assert mock_delay.call_count == 3
+        assert sorted(Notification.objects.values_list('user_id', flat=True)) == sorted(user.id for user in users)
+        self.preference_v1.refresh_from_db()
+        assert self.preference_v1.config_version == 1
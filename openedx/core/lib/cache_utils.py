@@ -6,6 +6,8 @@ Utilities related to caching.
 import collections
 import functools
 import itertools
+import threading
+import time
 import zlib
 import pickle
 
@@ -150,6 +152,109 @@ class process_cached:  # pylint: disable=invalid-name
         return functools.partial(self.__call__, obj)
 
 
+class BoundedLRUCache:
+    """
+    A thread-safe, process-local cache that keeps the most recently used
+    values whose total size is at most `max_size`.
+
+    Unlike the django and request caches, values are neither pickled nor
+    copied, so callers must not change the values they share through it.
+
+    Arguments:
+        max_size (int): The maximum total size of the cached values.
+        sizeof (function: value->int): Function returning the size of a value, if
+            `set` isn't given it.  By default every value has a size of 1, so
+            `max_size` is the maximum number of cached values.
+        timeout (int): If given, values expire after this many seconds.  Use it for
+            values that can change, since other processes can't invalidate them.
+    """
+    def __init__(self, max_size, sizeof=None, timeout=None):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.timeout = timeout
+        self.current_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the value cached for `key`, or `default` if it is not cached or has expired.
+        """
+        with self._lock:
+            try:
+                value, size, expires = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= time.time():
+                del self._entries[key]
+                self.current_size -= size
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=None):
+        """
+        Cache `value` for `key`, evicting the least recently used values as
+        needed to stay within `max_size`.  Values larger than `max_size` are
+        not cached.
+
+        Returns:
+            int: The number of values evicted to make room.
+        """
+        if size is None:
+            size = self.sizeof(value) if self.sizeof is not None else 1
+        if size > self.max_size:
+            return 0
+
+        expires = time.time() + self.timeout if self.timeout is not None else None
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self.current_size -= self._entries.pop(key)[1]
+            while self._entries and self.current_size + size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_size -= evicted_size
+                evicted += 1
+            self._entries[key] = (value, size, expires)
+            self.current_size += size
+            self.evictions += evicted
+        return evicted
+
+    def delete(self, key):
+        """
+        Remove the value cached for `key`, if any.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_size -= entry[1]
+
+    def items(self):
+        """
+        Return a list of the cached (key, value) pairs, from the least to the
+        most recently used, including values that have expired.
+        """
+        with self._lock:
+            return [(key, value) for key, (value, _, _) in self._entries.items()]
+
+    def clear(self):
+        """
+        Remove all values from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class CacheInvalidationManager:
     """
     This class provides a decorator for simple functions, which can handle invalidation.
@@ -10,7 +10,7 @@ from edx_django_utils.cache import RequestCache
 from django.core.cache import cache
 from django.test.utils import override_settings
 
-from openedx.core.lib.cache_utils import CacheService, request_cached
+from openedx.core.lib.cache_utils import BoundedLRUCache, CacheService, request_cached
 
 
 @ddt.ddt
@@ -299,6 +299,80 @@ class TestRequestCachedDecorator(TestCase):
         assert to_be_wrapped.call_count == 2
 
 
+class TestBoundedLRUCache(TestCase):
+    """
+    Test the BoundedLRUCache class.
+    """
+    def test_get_and_set(self):
+        cache = BoundedLRUCache(max_size=100)
+        assert cache.get('a') is None
+        assert cache.get('a', 'default') == 'default'
+        cache.set('a', 'value_a', 10)
+        assert cache.get('a') == 'value_a'
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.current_size == 10
+
+    def test_evicts_least_recently_used(self):
+        cache = BoundedLRUCache(max_size=100)
+        cache.set('a', 'value_a', 40)
+        cache.set('b', 'value_b', 40)
+        cache.get('a')
+        assert cache.set('c', 'value_c', 40) == 1
+        assert cache.get('b') is None
+        assert cache.get('a') == 'value_a'
+        assert cache.get('c') == 'value_c'
+        assert cache.evictions == 1
+        assert cache.current_size == 80
+
+    def test_bounded_by_count(self):
+        cache = BoundedLRUCache(max_size=2)
+        for key in 'abc':
+            cache.set(key, key)
+        assert cache.items() == [('b', 'b'), ('c', 'c')]
+        assert cache.current_size == 2
+
+    def test_sizeof(self):
+        cache = BoundedLRUCache(max_size=10, sizeof=len)
+        cache.set('a', 'aaaa')
+        cache.set('b', 'bbbb')
+        cache.set('c', 'cccc')
+        assert cache.get('a') is None
+        assert cache.current_size == 8
+
+    def test_replacing_value_updates_size(self):
+        cache = BoundedLRUCache(max_size=100)
+        cache.set('a', 'value_a', 40)
+        cache.set('a', 'value_a', 60)
+        assert len(cache) == 1
+        assert cache.current_size == 60
+
+    def test_skips_values_larger_than_cache(self):
+        cache = BoundedLRUCache(max_size=100)
+        cache.set('a', 'value_a', 40)
+        assert cache.set('big', 'big_value', 101) == 0
+        assert cache.get('big') is None
+        assert cache.get('a') == 'value_a'
+
+    def test_expiry(self):
+        cache = BoundedLRUCache(max_size=100, timeout=0)
+        cache.set('a', 'value_a', 10)
+        assert cache.get('a') is None
+        assert len(cache) == 0
+        assert cache.current_size == 0
+
+    def test_delete_and_clear(self):
+        cache = BoundedLRUCache(max_size=100)
+        cache.set('a', 'value_a', 40)
+        cache.set('b', 'value_b', 40)
+        cache.delete('a')
+        cache.delete('missing')
+        assert cache.items() == [('b', 'value_b')]
+        assert cache.current_size == 40
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.current_size == 0
+
+
 class CacheServiceTest(TestCase):
     """
     Test CacheService methods.
@@ -34,6 +34,7 @@ class EffortEstimationTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     # Public xblock field names
     EFFORT_ACTIVITIES = 'effort_activities'
@@ -63,10 +64,17 @@ class EffortEstimationTransformer(BlockStructureTransformer):
 
         Pooling leaf estimates higher up the tree (e.g. in verticals, then sequentials, then chapters) is done by
         transform() below at run time, because which blocks each user sees can be different.
+
+        When collecting incrementally, only the estimates of blocks that need to be collected are grabbed, unless
+        estimation was disabled for the course, in which case all blocks are checked again.
         """
         block_structure.request_xblock_fields('category')
         block_structure.request_xblock_fields('global_speed', 'only_on_web')  # video fields
 
+        collect_all = block_structure.get_transformer_data(cls, cls.DISABLE_ESTIMATION, default=False)
+        if collect_all:
+            block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, False)
+
         collection_cache = {}  # collection methods can stuff some temporary data here
 
         collections = {
@@ -76,6 +84,8 @@ class EffortEstimationTransformer(BlockStructureTransformer):
 
         try:
             for block_key in block_structure.topological_traversal():
+                if not collect_all and not block_structure.needs_collect(block_key):
+                    continue
                 xblock = block_structure.get_xblock(block_key)
 
                 if xblock.category in collections:
@@ -0,0 +1,203 @@
+"""
+Caching of safe_exec results.
+
+The results of executing code are cached in two tiers: a bounded,
+process-local LRU cache in front of the shared cache supplied by the caller
+(usually the django cache, through the XBlock 'cache' service).  Results are
+keyed by a hash of the code, the JSON-safe globals and the random seed, so
+they can be shared by every learner that sees the same problem variant.
+"""
+import hashlib
+import json
+import threading
+from collections import Counter
+
+from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
+
+from openedx.core.lib.cache_utils import BoundedLRUCache
+
+# The outcomes of a cache lookup.
+LOCAL_HIT = 'local_hit'
+SHARED_HIT = 'shared_hit'
+MISS = 'miss'
+
+# The maximum number of courses and of problems for which hit counts are kept.
+MAX_COUNTED_KEYS = 10000
+
+
+def safe_exec_cache_key(code, safe_globals, random_seed):
+    """
+    Return the cache key for executing `code` with the JSON-safe globals
+    `safe_globals` and `random_seed`.
+
+    The globals are canonicalized by serializing them with sorted keys,
+    which is much faster than hashing them one value at a time with
+    `update_hash`.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(code.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(json.dumps(safe_globals, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    return "safe_exec.%r.%s" % (random_seed, hasher.hexdigest())
+
+
+class _HitCounter:
+    """
+    Counts the outcomes of cache lookups by key, keeping the counts of the
+    `max_keys` most recently counted keys.
+    """
+    def __init__(self, max_keys):
+        self._counts = BoundedLRUCache(max_keys)
+
+    def count(self, key, outcome):
+        """
+        Count a lookup with the given `outcome` for `key`.
+        """
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = Counter()
+            self._counts.set(key, counts)
+        counts[outcome] += 1
+
+    def stats(self):
+        """
+        Return a dict mapping each counted key to a dict of its counts by outcome.
+        """
+        return {key: dict(counts) for key, counts in self._counts.items()}
+
+
+class LocalResultCache:
+    """
+    A bounded, process-local LRU cache of safe_exec results.
+
+    Results are stored in their serialized JSON form, both to measure their
+    size and so that callers can't modify the cached globals.  Entries expire
+    after `timeout` seconds.
+    """
+    def __init__(self, max_bytes, timeout):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._results = BoundedLRUCache(max_bytes, sizeof=len, timeout=timeout)
+        self._lock = threading.Lock()
+        self._course_counts = _HitCounter(MAX_COUNTED_KEYS)
+        self._problem_counts = _HitCounter(MAX_COUNTED_KEYS)
+
+    def get(self, key):
+        """
+        Return the result cached for `key`, or None if it is not cached or has expired.
+        """
+        serialized = self._results.get(key)
+        return json.loads(serialized) if serialized is not None else None
+
+    def set(self, key, result):
+        """
+        Cache `result`.  Results larger than `max_bytes` are not cached.
+        """
+        self._results.set(key, json.dumps(result))
+
+    def count(self, outcome, course_id, problem_id):
+        """
+        Count a lookup with the given `outcome` for the given course and problem.
+        """
+        with self._lock:
+            self._course_counts.count(course_id, outcome)
+            self._problem_counts.count((course_id, problem_id), outcome)
+
+    def stats(self):
+        """
+        Return the counts of lookup outcomes, by course and by (course, problem).
+        """
+        with self._lock:
+            return {
+                'courses': self._course_counts.stats(),
+                'problems': self._problem_counts.stats(),
+            }
+
+    def clear(self):
+        """
+        Remove all results from the cache, and reset the counts of lookup outcomes.
+        """
+        self._results.clear()
+        with self._lock:
+            self._course_counts = _HitCounter(MAX_COUNTED_KEYS)
+            self._problem_counts = _HitCounter(MAX_COUNTED_KEYS)
+
+    def __len__(self):
+        return len(self._results)
+
+
+_LOCAL_RESULT_CACHE = None
+
+
+def get_local_result_cache():
+    """
+    Return the process-wide :class:`LocalResultCache`, or None if it is
+    disabled by setting ``SAFE_EXEC_LOCAL_CACHE_MAX_BYTES`` to 0.
+    """
+    global _LOCAL_RESULT_CACHE  # pylint: disable=global-statement
+    max_bytes = getattr(settings, 'SAFE_EXEC_LOCAL_CACHE_MAX_BYTES', 0)
+    timeout = getattr(settings, 'SAFE_EXEC_LOCAL_CACHE_TIMEOUT', 300)
+    if not max_bytes:
+        return None
+    if (
+        _LOCAL_RESULT_CACHE is None or
+        _LOCAL_RESULT_CACHE.max_bytes != max_bytes or
+        _LOCAL_RESULT_CACHE.timeout != timeout
+    ):
+        _LOCAL_RESULT_CACHE = LocalResultCache(max_bytes, timeout)
+    return _LOCAL_RESULT_CACHE
+
+
+class SafeExecResultCache:
+    """
+    Two-tier cache of safe_exec results: the process-local LRU cache, if it
+    is enabled, in front of the shared `cache`.
+
+    A result is a pair: the exception message, if any, else None; and the
+    resulting JSON-safe globals dictionary.  Results with an exception are
+    cached too, since re-running the code would raise it again.
+    """
+    def __init__(self, cache, course_id=None, problem_id=None):
+        self.cache = cache
+        self.local_cache = get_local_result_cache()
+        self.course_id = course_id
+        self.problem_id = problem_id
+
+    def get(self, key):
+        """
+        Return the result cached for `key`, or None.
+        """
+        result = self.local_cache.get(key) if self.local_cache is not None else None
+        if result is not None:
+            outcome = LOCAL_HIT
+        else:
+            result = self.cache.get(key)
+            if result is not None:
+                outcome = SHARED_HIT
+                if self.local_cache is not None:
+                    self.local_cache.set(key, result)
+            else:
+                outcome = MISS
+
+        monitoring_utils.accumulate(f'safe_exec.cache.{outcome}', 1)
+        if self.local_cache is not None:
+            self.local_cache.count(outcome, self.course_id, self.problem_id)
+        return result
+
+    def set(self, key, result):
+        """
+        Cache `result` for `key` in both tiers.
+        """
+        if self.local_cache is not None:
+            self.local_cache.set(key, result)
+        self.cache.set(key, result)
+
+
+def get_cache_stats():
+    """
+    Return the counts of safe_exec cache lookup outcomes in this process, by
+    course and by (course, problem), or None if the local cache is disabled.
+    """
+    local_cache = get_local_result_cache()
+    return local_cache.stats() if local_cache is not None else None
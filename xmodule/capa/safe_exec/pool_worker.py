@@ -0,0 +1,203 @@
+"""
+The main loop of a pooled sandbox worker (see worker_pool.py).
+
+This code is run by the sandbox Python with ``python -c``, so it must only use
+the standard library.  The modules named on the command line are imported
+first, then the worker reports that it is ready and serves jobs, one JSON line
+per job on stdin, replying with one JSON line per job on stdout:
+
+    {"code": "...", "globals": {...}, "cpu": 1, "realtime": 3}
+    {"globals": {...}}  or  {"emsg": "..."}
+
+The worker itself never runs the code of a job.  It forks a new child for each
+job, which lowers its CPU limit to that of the job, runs the code and writes
+its reply to a pipe of its own before exiting.  So jobs can't see or change
+the state of earlier jobs, or write to the replies of the worker.
+"""
+import ctypes
+import io
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import time
+import traceback
+
+# From <linux/prctl.h>.
+PR_SET_DUMPABLE = 4
+
+
+def jsonable(value):
+    """
+    Return whether `value` can be serialized to JSON.
+    """
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def set_undumpable():
+    """
+    Stop the children of the worker from attaching to it with ptrace, or
+    opening its file descriptors through /proc.
+    """
+    try:
+        ctypes.CDLL(None).prctl(PR_SET_DUMPABLE, 0, 0, 0, 0)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def clear_directory(path):
+    """
+    Remove everything in the directory `path`.
+    """
+    for name in os.listdir(path):
+        name = os.path.join(path, name)
+        if os.path.isdir(name) and not os.path.islink(name):
+            shutil.rmtree(name, ignore_errors=True)
+        else:
+            try:
+                os.unlink(name)
+            except OSError:
+                pass
+
+
+def run_job(job, result_fd):
+    """
+    Run the code of `job` in this (child) process, and write the reply to
+    `result_fd`.
+    """
+    if job.get('cpu'):
+        # A hard limit, so the code can't raise it again.
+        resource.setrlimit(resource.RLIMIT_CPU, (job['cpu'], job['cpu']))
+    globals_dict = job['globals']
+    sys.stdout = io.StringIO()
+    try:
+        exec(job['code'], globals_dict)  # pylint: disable=exec-used
+    except BaseException:  # pylint: disable=broad-except
+        reply = {'emsg': "Couldn't execute jailed code: " + traceback.format_exc()}
+    else:
+        reply = {'globals': {
+            name: value for name, value in globals_dict.items()
+            if name != '__builtins__' and jsonable(value)
+        }}
+    with os.fdopen(result_fd, 'wb') as result_file:
+        result_file.write(json.dumps(reply).encode('utf-8'))
+
+
+def read_result(fd, timeout):
+    """
+    Read from `fd` until EOF, waiting at most `timeout` seconds (or forever,
+    if `timeout` is falsy).  Returns None if it timed out.
+    """
+    deadline = time.time() + timeout if timeout else None
+    chunks = []
+    while True:
+        remaining = deadline - time.time() if deadline else None
+        if remaining is not None and remaining <= 0:
+            return None
+        readable, _, _ = select.select([fd], [], [], remaining)
+        if not readable:
+            return None
+        data = os.read(fd, 65536)
+        if not data:
+            return b''.join(chunks)
+        chunks.append(data)
+
+
+def check_reply(result, status):
+    """
+    Return the reply for the `result` written by a child that exited with
+    the wait `status`, making sure it is one of the replies the pool expects.
+    """
+    try:
+        reply = json.loads(result.decode('utf-8'))
+    except ValueError:
+        reply = None
+    if isinstance(reply, dict) and isinstance(reply.get('globals'), dict):
+        return {'globals': reply['globals']}
+    if isinstance(reply, dict) and isinstance(reply.get('emsg'), str):
+        return {'emsg': reply['emsg']}
+    if os.WIFSIGNALED(status):
+        return {'emsg': f"Couldn't execute jailed code: killed by signal {os.WTERMSIG(status)}"}
+    return {'emsg': f"Couldn't execute jailed code: exited with status {os.WEXITSTATUS(status)}"}
+
+
+def fork_job(job, replies_fd, devnull):
+    """
+    Run `job` in a new child process, and return its reply.
+    """
+    result_read_fd, result_write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # In the child: keep only the pipe for the result of this job.
+        try:
+            os.setpgid(0, 0)
+            os.close(result_read_fd)
+            os.close(replies_fd)
+            os.dup2(devnull, 0)
+            run_job(job, result_write_fd)
+        except BaseException:  # pylint: disable=broad-except
+            os._exit(1)  # pylint: disable=protected-access
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(result_write_fd)
+    try:
+        # Also set here, so no process the child starts escapes the group.
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    try:
+        result = read_result(result_read_fd, job.get('realtime'))
+    finally:
+        os.close(result_read_fd)
+        # Stop the child, and any process it left behind.
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+        _, status = os.waitpid(pid, 0)
+        clear_directory('.')
+
+    if result is None:
+        return {'emsg': "Couldn't execute jailed code: timed out"}
+    return check_reply(result, status)
+
+
+def main():
+    """
+    Warm up, then fork a child for each job until stdin is closed.
+    """
+    set_undumpable()
+
+    # Keep the real stdout for replies, and discard anything else written to it.
+    replies_fd = os.dup(1)
+    replies = os.fdopen(replies_fd, 'w')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 1)
+    # Temporary files of the jobs go in the working directory, which is
+    # cleared after each job.
+    os.environ['TMPDIR'] = os.getcwd()
+
+    for module_name in sys.argv[1:]:
+        try:
+            __import__(module_name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    replies.write('ready\n')
+    replies.flush()
+
+    for line in sys.stdin:
+        reply = fork_job(json.loads(line), replies_fd, devnull)
+        replies.write(json.dumps(reply) + '\n')
+        replies.flush()
+
+
+if __name__ == '__main__':
+    main()
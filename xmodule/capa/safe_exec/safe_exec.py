@@ -1,13 +1,13 @@
 """Capa's specialized use of codejail.safe_exec."""
-import hashlib
-
 from codejail.safe_exec import SafeExecException, json_safe
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from edx_django_utils.monitoring import function_trace
 
 from . import lazymod
+from .cache import SafeExecResultCache, safe_exec_cache_key
 from .remote_exec import is_codejail_rest_service_enabled, get_remote_exec
+from .worker_pool import is_codejail_worker_pool_enabled, pooled_safe_exec
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -108,7 +108,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Results are also cached in a process-local cache in front
+    of it (see `cache.SafeExecResultCache`).
 
     `limit_overrides_context` is an optional string to be used as a key on
     the `settings.CODE_JAIL['limit_overrides']` dictionary in order to apply
@@ -123,11 +124,8 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code).encode('utf-8'))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+        cache = SafeExecResultCache(cache, course_id=limit_overrides_context, problem_id=slug)
+        key = safe_exec_cache_key(code, json_safe(globals_dict), random_seed)
         cached = cache.get(key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
@@ -158,6 +156,9 @@ def safe_exec(
         # Decide which code executor to use.
         if unsafely:
             exec_fn = codejail_not_safe_exec
+        elif is_codejail_worker_pool_enabled() and not python_path and not extra_files:
+            # Warm workers can't be given files, so code that needs them gets a new sandbox.
+            exec_fn = pooled_safe_exec
         else:
             exec_fn = codejail_safe_exec
 
@@ -19,6 +19,7 @@ from six import unichr
 from six.moves import range
 
 from xmodule.capa.safe_exec import safe_exec, update_hash
+from xmodule.capa.safe_exec.cache import LocalResultCache, get_cache_stats, get_local_result_cache, safe_exec_cache_key
 from xmodule.capa.safe_exec.remote_exec import is_codejail_rest_service_enabled
 
 
@@ -273,6 +274,95 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecLocalCaching(unittest.TestCase):
+    """Test the process-local tier of the safe_exec cache."""
+
+    def setUp(self):
+        super().setUp()
+        overrider = override_settings(SAFE_EXEC_LOCAL_CACHE_MAX_BYTES=1024 * 1024, SAFE_EXEC_LOCAL_CACHE_TIMEOUT=300)
+        overrider.enable()
+        self.addCleanup(overrider.disable)
+        get_local_result_cache().clear()
+
+    def test_local_hit(self):
+        cache = {}
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache), limit_overrides_context='course', slug='problem')
+        assert g['a'] == 3
+
+        # The shared cache is no longer consulted.
+        cache.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache), limit_overrides_context='course', slug='problem')
+        assert g['a'] == 3
+        assert not cache
+
+        assert get_cache_stats()['problems'][('course', 'problem')] == {'miss': 1, 'local_hit': 1}
+        assert get_cache_stats()['courses']['course'] == {'miss': 1, 'local_hit': 1}
+
+    def test_shared_hit(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+        get_local_result_cache().clear()
+
+        cache[list(cache.keys())[0]] = (None, {'a': 17})
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        assert g['a'] == 17
+        # The local cache was filled from the shared cache.
+        assert len(get_local_result_cache()) == 1
+
+    def test_cached_exceptions(self):
+        with pytest.raises(SafeExecException):
+            safe_exec("1/0", {}, cache=DictCache({}))
+        with pytest.raises(SafeExecException) as exc_info:
+            safe_exec("1/0", {}, cache=DictCache({}))
+        assert 'ZeroDivisionError' in str(exc_info.value)
+
+    def test_cached_globals_are_copies(self):
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        g['a'].append(3)
+
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        assert g['a'] == [1, 2]
+
+    def test_expiry(self):
+        local_cache = LocalResultCache(max_bytes=1024, timeout=0)
+        local_cache.set('key', [None, {'a': 1}])
+        assert local_cache.get('key') is None
+        assert len(local_cache) == 0
+
+    def test_eviction(self):
+        local_cache = LocalResultCache(max_bytes=100, timeout=300)
+        for i in range(10):
+            local_cache.set(f'key{i}', [None, {'a': 'x' * 20}])
+        assert len(local_cache) == 2
+        assert local_cache.get('key0') is None
+        assert local_cache.get('key9') == [None, {'a': 'x' * 20}]
+
+        # Results larger than the cache aren't cached.
+        local_cache.set('large', [None, {'a': 'x' * 200}])
+        assert local_cache.get('large') is None
+
+
+class TestSafeExecCacheKey(unittest.TestCase):
+    """Test safe_exec_cache_key."""
+
+    def test_dict_ordering(self):
+        d1 = {k: 1 for k in "abcdefghijklmnopqrstuvwxyz"}
+        d2 = {k: 1 for k in reversed("abcdefghijklmnopqrstuvwxyz")}
+        assert safe_exec_cache_key("a = 1", {'d': d1}, 1) == safe_exec_cache_key("a = 1", {'d': d2}, 1)
+
+    def test_distinct(self):
+        key = safe_exec_cache_key("a = 1", {'b': 1}, 1)
+        assert key != safe_exec_cache_key("a = 2", {'b': 1}, 1)
+        assert key != safe_exec_cache_key("a = 1", {'b': '1'}, 1)
+        assert key != safe_exec_cache_key("a = 1", {'b': 1}, 2)
+        assert len(key) <= 250
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -0,0 +1,117 @@
+"""Test worker_pool.py"""
+
+import sys
+import unittest
+
+import pytest
+from codejail.safe_exec import SafeExecException
+
+from xmodule.capa.safe_exec.worker_pool import WorkerPool, WorkerPools
+
+
+class TestWorkerPool(unittest.TestCase):
+    """
+    Test the pool of warm workers, using the current Python without a sandbox.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.pool = WorkerPool([sys.executable], None, size=1, max_jobs=3)
+        self.pool.limits = {'CPU': 5, 'REALTIME': 5}
+        self.addCleanup(self.pool.close)
+
+    def test_run(self):
+        g = {'b': 2}
+        self.pool.run("a = b * 3\nprint('ignored')", g)
+        assert g == {'a': 6, 'b': 2}
+
+    def test_jobs_isolated(self):
+        self.pool.run(
+            "import sys, threading, time\n"
+            "sys.flags_seen = 1\n"
+            "open('leftover', 'w').close()\n"
+            "threading.Thread(target=time.sleep, args=(60,)).start()",
+            {},
+        )
+        g = {}
+        self.pool.run("import os, sys; a = getattr(sys, 'flags_seen', 0); files = os.listdir('.')", g)
+        assert g['a'] == 0
+        assert g['files'] == []
+
+    def test_workers_reused(self):
+        parents = []
+        for _ in range(4):
+            g = {}
+            self.pool.run("import os; parent = os.getppid()", g)
+            parents.append(g['parent'])
+        # Each job runs in a new child of a worker, and the worker is retired
+        # once it has forked max_jobs jobs.
+        assert parents[0] == parents[1] == parents[2]
+        assert parents[3] != parents[0]
+
+    def test_cpu_limit(self):
+        self.pool.limits = {'CPU': 1, 'REALTIME': 5}
+        with pytest.raises(SafeExecException) as exc_info:
+            self.pool.run("import resource; resource.setrlimit(resource.RLIMIT_CPU, (100, 100))", {})
+        assert 'ValueError' in str(exc_info.value)
+
+        with pytest.raises(SafeExecException) as exc_info:
+            self.pool.run("while True: pass", {})
+        assert 'killed by signal' in str(exc_info.value)
+
+    def test_forged_reply(self):
+        g = {}
+        self.pool.run("import os; os.write(1, b'{\"globals\": {\"a\": 2}}\\n'); a = 1", g)
+        assert g == {'a': 1}
+
+    def test_exceptions(self):
+        with pytest.raises(SafeExecException) as exc_info:
+            self.pool.run("1/0", {})
+        assert 'ZeroDivisionError' in str(exc_info.value)
+
+        with pytest.raises(SafeExecException) as exc_info:
+            self.pool.run("import sys; sys.exit(1)", {})
+        assert "Couldn't execute jailed code" in str(exc_info.value)
+
+        # The worker survives the jobs that fail.
+        g = {}
+        self.pool.run("a = 1", g)
+        assert g['a'] == 1
+
+    def test_realtime_limit(self):
+        self.pool.limits = {'REALTIME': 1}
+        with pytest.raises(SafeExecException) as exc_info:
+            self.pool.run("import time; time.sleep(10)", {})
+        assert 'timed out' in str(exc_info.value)
+
+        g = {}
+        self.pool.run("a = 1", g)
+        assert g['a'] == 1
+
+    def test_dead_worker(self):
+        with pytest.raises(SafeExecException):
+            self.pool.run("import os; os._exit(1)", {})
+
+        g = {}
+        self.pool.run("a = 1", g)
+        assert g['a'] == 1
+
+
+class TestWorkerPools(unittest.TestCase):
+    """
+    Test the pools of warm workers of a process.
+    """
+
+    def test_pools_by_context(self):
+        pools = WorkerPools([sys.executable], size=0, max_jobs=1, max_pools=2)
+        self.addCleanup(pools.close)
+
+        pool_a = pools.get('course-a')
+        assert pools.get('course-a') is pool_a
+        pool_b = pools.get('course-b')
+        assert pool_b is not pool_a
+
+        # The least recently used pool is retired to make room.
+        pools.get('course-c')
+        assert pool_a.closed
+        assert not pool_b.closed
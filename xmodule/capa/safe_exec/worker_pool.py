@@ -0,0 +1,371 @@
+"""
+A pool of warm sandbox workers for running jailed code locally.
+
+Spawning a new sandboxed Python for every execution, and importing numpy and
+the other assumed imports in it, is most of the cost of running a Python
+scripted problem.  Instead, pooled workers are started ahead of time (with
+the same command, user and resource limits that codejail uses) and import
+those modules once.  They never run jailed code themselves: for each job a
+worker forks a fresh child, which runs the code under the CPU limit of the job
+and exits, so no process ever runs the code of more than one job.
+
+Workers are pooled by `limit_overrides_context` (the course), so that the
+limits of every job are those of its context.  Each worker is retired after
+forking ``CODE_JAIL_WORKER_POOL_MAX_JOBS`` jobs.  A job that doesn't finish
+within the REALTIME limit is killed by its worker, and a worker that doesn't
+reply in time is killed by the pool.
+"""
+import json
+import logging
+import os
+import resource
+import select
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from django.conf import settings
+from edx_toggles.toggles import SettingToggle
+
+from . import pool_worker
+
+log = logging.getLogger(__name__)
+
+# .. toggle_name: ENABLE_CODEJAIL_WORKER_POOL
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to run jailed code locally in a pool of warm sandbox workers,
+#   rather than in a new sandbox process for every execution. Has no effect when the codejail REST
+#   service is enabled, or when codejail is not configured for python.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_CODEJAIL_WORKER_POOL = SettingToggle(
+    "ENABLE_CODEJAIL_WORKER_POOL", default=False, module_name=__name__
+)
+
+# The modules imported by workers before they run any jobs.
+WARM_IMPORTS = ["numpy", "math", "random2", "six", "calc", "eia", "chem", "verifiers"]
+
+# The CPU seconds a worker may use to import WARM_IMPORTS.
+WARM_UP_CPU = 10
+
+# The seconds to wait for a worker to warm up.
+WARM_UP_TIMEOUT = 30
+
+# The seconds to wait for the reply of a worker, beyond the REALTIME limit
+# that the worker itself enforces on the job.
+REPLY_GRACE_TIMEOUT = 5
+
+# We'll need the code from pool_worker.py to start workers, so read it now.
+pool_worker_py_file = pool_worker.__file__
+if pool_worker_py_file.endswith("c"):
+    pool_worker_py_file = pool_worker_py_file[:-1]
+
+with open(pool_worker_py_file) as f:
+    pool_worker_py = f.read()
+
+
+class WorkerError(Exception):
+    """
+    Raised when a worker dies or times out.
+    """
+
+
+def is_codejail_worker_pool_enabled():
+    """
+    Return whether jailed code should be run by pooled workers.
+    """
+    # Pooled workers don't support the proxy process that codejail uses for subprocesses.
+    return (
+        ENABLE_CODEJAIL_WORKER_POOL.is_enabled() and
+        jail_code.is_configured("python") and
+        not jail_code.get_effective_limits().get("PROXY")
+    )
+
+
+def _limit_worker(limits, max_jobs):
+    """
+    Return a function that applies the resource `limits` to a worker process
+    that forks up to `max_jobs` jobs.
+    """
+    def set_limits():
+        if limits.get("CPU"):
+            # The worker only uses CPU to warm up and to fork its jobs, which
+            # lower the limit inherited from it to the CPU limit of the job.
+            hard_cpu = WARM_UP_CPU + max_jobs
+            resource.setrlimit(resource.RLIMIT_CPU, (hard_cpu, hard_cpu))
+        if limits.get("VMEM"):
+            resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+        if limits.get("FSIZE") is not None:
+            resource.setrlimit(resource.RLIMIT_FSIZE, (limits["FSIZE"], limits["FSIZE"]))
+        if limits.get("NPROC"):
+            resource.setrlimit(resource.RLIMIT_NPROC, (limits["NPROC"], limits["NPROC"]))
+    return set_limits
+
+
+class SandboxWorker:
+    """
+    A sandboxed Python process, forking a child for each job sent to it, one
+    at a time.
+    """
+    def __init__(self, cmdline, limits, max_jobs):
+        self.limits = limits
+        self.jobs = 0
+        self.homedir = tempfile.mkdtemp(prefix="codejail-pool-")
+        # The sandbox user needs to be able to write in its home directory.
+        os.chmod(self.homedir, 0o777)
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            cmdline + ["-c", pool_worker_py] + WARM_IMPORTS,
+            cwd=self.homedir,
+            env={},
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=_limit_worker(limits, max_jobs),
+        )
+        self._buffer = b""
+        if self._read_line(WARM_UP_TIMEOUT) != b"ready":
+            self.close()
+            raise WorkerError("worker failed to start")
+
+    def _read_line(self, timeout):
+        """
+        Read a line from the worker, waiting at most `timeout` seconds (or
+        forever, if `timeout` is falsy).
+        """
+        deadline = time.time() + timeout if timeout else None
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.time() if deadline else None
+            if remaining is not None and remaining <= 0:
+                raise WorkerError("timed out")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                raise WorkerError("timed out")
+            data = os.read(fd, 65536)
+            if not data:
+                raise WorkerError(f"worker exited with status {self.process.poll()}")
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def run(self, code, globals_dict):
+        """
+        Run `code` with the JSON-safe `globals_dict`, and return the reply of
+        the worker: a dict with either the resulting "globals", or an "emsg".
+        """
+        self.jobs += 1
+        realtime = self.limits.get("REALTIME")
+        job = {"code": code, "globals": globals_dict, "cpu": self.limits.get("CPU"), "realtime": realtime}
+        try:
+            self.process.stdin.write(json.dumps(job).encode("utf-8") + b"\n")
+            self.process.stdin.flush()
+        except OSError as exc:
+            raise WorkerError(str(exc)) from exc
+        return json.loads(self._read_line(realtime + REPLY_GRACE_TIMEOUT if realtime else None))
+
+    def close(self):
+        """
+        Stop the worker.
+        """
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        shutil.rmtree(self.homedir, ignore_errors=True)
+
+
+class WorkerPool:
+    """
+    A pool of `size` warm workers, with the limits of `limit_overrides_context`.
+    """
+    def __init__(self, cmdline, limit_overrides_context, size, max_jobs):
+        self.cmdline = cmdline
+        self.limit_overrides_context = limit_overrides_context
+        self.limits = jail_code.get_effective_limits(limit_overrides_context)
+        self.size = size
+        self.max_jobs = max_jobs
+        self.closed = False
+        self._idle = []
+        self._starting = 0
+        self._lock = threading.Lock()
+
+    def _start_worker(self):
+        return SandboxWorker(self.cmdline, self.limits, self.max_jobs)
+
+    def replenish(self):
+        """
+        Start workers in the background, until there are `size` idle workers.
+        """
+        with self._lock:
+            missing = self.size - len(self._idle) - self._starting
+            self._starting += max(missing, 0)
+        for _ in range(missing):
+            threading.Thread(target=self._start_idle_worker, daemon=True).start()
+
+    def _start_idle_worker(self):
+        """
+        Start a worker and add it to the idle workers.
+        """
+        try:
+            worker = self._start_worker()
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Couldn't start a codejail pool worker for %r", self.limit_overrides_context)
+            worker = None
+        with self._lock:
+            self._starting -= 1
+            if worker is not None and not self.closed and len(self._idle) < self.size:
+                self._idle.append(worker)
+                worker = None
+        if worker is not None:
+            worker.close()
+
+    def _checkout(self):
+        """
+        Return an idle worker, or a newly started one if none is idle.
+        """
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None:
+            worker = self._start_worker()
+        return worker
+
+    def _checkin(self, worker):
+        """
+        Return `worker` to the idle workers, or retire it once it has forked
+        `max_jobs` jobs.
+        """
+        with self._lock:
+            if worker.jobs < self.max_jobs and not self.closed and len(self._idle) < self.size:
+                self._idle.append(worker)
+                worker = None
+        if worker is not None:
+            worker.close()
+            self.replenish()
+
+    def run(self, code, globals_dict, slug=None):
+        """
+        Run `code` in a worker, updating `globals_dict` with the results.
+
+        Raises SafeExecException if the code raised an exception, or didn't
+        finish within the limits.
+        """
+        try:
+            worker = self._checkout()
+        except (WorkerError, OSError) as exc:
+            raise SafeExecException(f"Couldn't execute jailed code: {exc}") from exc
+
+        try:
+            reply = worker.run(code, json_safe(globals_dict))
+        except WorkerError as exc:
+            log.warning("Codejail pool worker for %r failed running %s: %s", self.limit_overrides_context, slug, exc)
+            worker.close()
+            self.replenish()
+            raise SafeExecException(f"Couldn't execute jailed code: {exc}") from exc
+
+        self._checkin(worker)
+        if "emsg" in reply:
+            raise SafeExecException(reply["emsg"])
+        globals_dict.update(reply["globals"])
+
+    def close(self):
+        """
+        Stop all idle workers.  Workers that are running jobs are stopped when
+        they are returned.
+        """
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+class WorkerPools:
+    """
+    The worker pools of this process, by `limit_overrides_context`, keeping
+    the `max_pools` most recently used pools.
+    """
+    def __init__(self, cmdline, size, max_jobs, max_pools):
+        self.cmdline = cmdline
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_pools = max_pools
+        self.pid = os.getpid()
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, limit_overrides_context):
+        """
+        Return the pool for `limit_overrides_context`, creating it if needed.
+        """
+        retired_pool = None
+        with self._lock:
+            pool = self._pools.pop(limit_overrides_context, None)
+            if pool is None:
+                pool = WorkerPool(self.cmdline, limit_overrides_context, self.size, self.max_jobs)
+                pool.replenish()
+                if len(self._pools) >= self.max_pools:
+                    _, retired_pool = self._pools.popitem(last=False)
+            self._pools[limit_overrides_context] = pool
+        if retired_pool is not None:
+            retired_pool.close()
+        return pool
+
+    def close(self):
+        """
+        Stop the workers of all pools.
+        """
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), OrderedDict()
+        for pool in pools:
+            pool.close()
+
+
+_WORKER_POOLS = None
+_WORKER_POOLS_LOCK = threading.Lock()
+
+
+def get_worker_pools():
+    """
+    Return the :class:`WorkerPools` of this process.
+    """
+    global _WORKER_POOLS  # pylint: disable=global-statement
+    with _WORKER_POOLS_LOCK:
+        # Workers (and their pipes) aren't inherited by forked processes.
+        if _WORKER_POOLS is None or _WORKER_POOLS.pid != os.getpid():
+            command = jail_code.COMMANDS["python"]
+            cmdline = []
+            if command["user"]:
+                cmdline.extend(["sudo", "-u", command["user"]])
+            cmdline.extend(command["cmdline_start"])
+            _WORKER_POOLS = WorkerPools(
+                cmdline,
+                size=settings.CODE_JAIL_WORKER_POOL_SIZE,
+                max_jobs=settings.CODE_JAIL_WORKER_POOL_MAX_JOBS,
+                max_pools=settings.CODE_JAIL_WORKER_POOL_MAX_POOLS,
+            )
+        return _WORKER_POOLS
+
+
+def pooled_safe_exec(
+    code,
+    globals_dict,
+    python_path=None,  # pylint: disable=unused-argument
+    extra_files=None,  # pylint: disable=unused-argument
+    limit_overrides_context=None,
+    slug=None,
+):
+    """
+    Run `code` in a warm sandbox worker, with the same signature as
+    `codejail.safe_exec.safe_exec`.
+
+    Workers don't support `python_path` or `extra_files`; callers should use
+    `codejail.safe_exec.safe_exec` for code that needs them.
+    """
+    get_worker_pools().get(limit_overrides_context).run(code, globals_dict, slug=slug)
@@ -294,6 +294,12 @@ class StaticContent:  # lint-amnesty, pylint: disable=missing-class-docstring
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        yield self._data[first_byte:last_byte + 1]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
@@ -314,9 +320,18 @@ class StaticContentStream(StaticContent):  # lint-amnesty, pylint: disable=missi
                          length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
+    @property
+    def chunk_size(self):
+        """
+        The number of bytes to read at a time: the size of the GridFS chunks of
+        the stream, so that each read maps to a single chunk.
+        """
+        return getattr(self._stream, 'chunk_size', None) or STREAM_DATA_CHUNK_SIZE
+
     def stream_data(self):
+        chunk_size = self.chunk_size
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -325,15 +340,18 @@ class StaticContentStream(StaticContent):  # lint-amnesty, pylint: disable=missi
         """
         Stream the data between first_byte and last_byte (included)
         """
+        chunk_size = self.chunk_size
         self._stream.seek(first_byte)
         position = first_byte
         while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
+            # Read up to the end of the current chunk, so reads stay aligned with chunks.
+            read_size = chunk_size - position % chunk_size
+            if last_byte <= position + read_size - 1:
                 chunk = self._stream.read(last_byte - position + 1)
                 yield chunk
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            chunk = self._stream.read(read_size)
+            position += read_size
             yield chunk
 
     def close(self):
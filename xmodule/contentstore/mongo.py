@@ -3,8 +3,13 @@ MongoDB/GridFS-level code for the contentstore.
 """
 
 
+import io
 import json
 import os
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import gridfs
 import pymongo
@@ -203,7 +208,6 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
-        policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
@@ -216,6 +220,58 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
+
+        self._export_assets_policy(assets, assets_policy_file)
+
+    def export_all_for_course_to_tar(self, course_key, tar_file, arc_directory, assets_policy_file, max_workers=1):
+        """
+        Export all of this course's assets into a tar file, rather than to disk. Export all of the
+        assets' attributes to the policy file.
+
+        Up to `max_workers` assets are fetched from GridFS at once, and only the assets that have
+        been fetched but not yet written to the tar file are held in memory.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            tar_file (tarfile.TarFile): the tar file to add the asset files to
+            arc_directory: the directory of the tar file under which to put all the asset files
+            assets_policy_file: the filename for the policy file which should be in the same
+                directory as the other policy files.
+            max_workers (int): the number of assets to fetch at once
+        """
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetching = deque()
+            for asset in assets:
+                fetching.append(executor.submit(self.find, asset['asset_key']))
+                if len(fetching) >= max_workers:
+                    self._add_to_tar(fetching.popleft().result(), tar_file, arc_directory)
+            while fetching:
+                self._add_to_tar(fetching.popleft().result(), tar_file, arc_directory)
+
+        self._export_assets_policy(assets, assets_policy_file)
+
+    def _add_to_tar(self, content, tar_file, arc_directory):
+        """
+        Add the `content` to the `tar_file`, at the path that :meth:`export` writes it to on disk.
+        """
+        if content.import_path is not None:
+            arc_directory = arc_directory + '/' + os.path.dirname(content.import_path)
+        # Escape invalid char from filename.
+        export_name = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+
+        tar_info = tarfile.TarInfo(os.path.normpath(os.path.join(arc_directory, export_name)))
+        tar_info.size = len(content.data)
+        tar_info.mtime = int(time.time())
+        tar_file.addfile(tar_info, io.BytesIO(content.data))
+
+    def _export_assets_policy(self, assets, assets_policy_file):
+        """
+        Export the attributes of the `assets` to the policy file.
+        """
+        policy = {}
+        for asset in assets:
             for attr, value in asset.items():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
@@ -335,6 +335,12 @@ class EditInfo:
     """
     Encapsulates the editing info of a block.
     """
+    # Split modulestore workers keep the blocks of many structures in memory, so avoid a __dict__ per block.
+    __slots__ = (
+        'previous_version', 'update_version', 'source_version', 'edited_on', 'edited_by',
+        'original_usage', 'original_usage_version', '_subtree_edited_on', '_subtree_edited_by',
+    )
+
     def __init__(self, **kwargs):
         self.from_storable(kwargs)
 
@@ -396,6 +402,19 @@ class EditInfo:
             source_version="UNSET" if self.source_version is None else self.source_version,
         )
 
+    def __getstate__(self):
+        """
+        Pickle the attributes as a dict, as they were pickled before __slots__ were used.
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        """
+        Unpickle the attributes from a dict, setting those that older pickles lack to None.
+        """
+        for name in self.__slots__:
+            setattr(self, name, state.get(name, None))
+
     def __eq__(self, edit_info):
         """
         Two EditInfo instances are equal iff their storable representations
@@ -416,6 +435,8 @@ class BlockData:
     Allows the storing of meta-information about a structure that doesn't persist along with
     the structure itself.
     """
+    __slots__ = ('fields', 'block_type', 'definition', 'defaults', 'asides', 'edit_info', 'definition_loaded')
+
     def __init__(self, **kwargs):
         # Has the definition been loaded?
         self.definition_loaded = False
@@ -480,6 +501,21 @@ class BlockData:
             asides=self.get_asides()
         )
 
+    def __getstate__(self):
+        """
+        Pickle the attributes as a dict, as they were pickled before __slots__ were used.
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        """
+        Unpickle the attributes from a dict. Older pickles may lack 'asides' (see get_asides).
+        """
+        self.definition_loaded = False
+        for name, value in state.items():
+            if name in self.__slots__:
+                setattr(self, name, value)
+
     def __eq__(self, block_data):
         """
         Two BlockData objects are equal iff all their attributes are equal.
@@ -837,7 +873,7 @@ class ModuleStoreRead(ModuleStoreAssetBase, metaclass=ABCMeta):
             xblock, fields = (block, block.fields)
         elif isinstance(block, BlockData):
             # BlockData is an object - compare its attributes in dict form.
-            xblock, fields = (None, block.__dict__)
+            xblock, fields = (None, block.__getstate__())
         else:
             xblock, fields = (None, block)
 
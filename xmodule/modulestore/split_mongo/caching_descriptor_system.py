@@ -77,6 +77,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
         self._services['library_tools'] = LibraryToolsService(modulestore, user_id=None)
         # Cache of block field datas, keyed by the XBlock instance (since the ScopeId changes!)
         self.block_field_datas = weakref.WeakKeyDictionary()
+        # Definitions fetched ahead of loading the fields of their blocks, by definition id
+        self.prefetched_definitions = {}
 
     @lazy
     def _parent_map(self):  # lint-amnesty, pylint: disable=missing-function-docstring
@@ -285,6 +287,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):  # li
                 block_key.type,
                 definition_id,
                 convert_fields,
+                definition=self.prefetched_definitions.get(definition_id),
             )
         else:
             definition_loader = None
@@ -3,23 +3,26 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 
 
+import copy
 import datetime
 import logging
 import math
 import pickle
 import re
+import sys
 import zlib
 from contextlib import contextmanager
 from time import time
 
 from ccx_keys.locator import CCXLocator
+from django.conf import settings
 from django.core.cache import caches, InvalidCacheBackendError
 from django.db.transaction import TransactionManagementError
 import pymongo
 import pytz
 from mongodb_proxy import autoretry_read
 # Import this just to export it
-from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
+from pymongo.errors import BulkWriteError, DuplicateKeyError  # pylint: disable=unused-import
 from edx_django_utils import monitoring
 from edx_django_utils.cache import RequestCache
 
@@ -28,10 +31,13 @@ from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
-from openedx.core.lib.cache_utils import request_cached
+from openedx.core.lib.cache_utils import BoundedLRUCache, request_cached
 
 log = logging.getLogger(__name__)
 
+# The code of the errors mongo reports for writes of documents whose _id is already in a collection.
+DUPLICATE_KEY_ERROR_CODE = 11000
+
 
 def get_cache(alias):
     """
@@ -140,6 +146,10 @@ class QueryTimer:
 TIMER = QueryTimer(__name__, 0.01)
 
 
+# Shared by the blocks of decoded structures that have no defaults or asides; never modify it.
+_EMPTY_DICT = {}
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
@@ -148,6 +158,10 @@ def structure_from_mongo(structure, course_context=None):
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    Decoded structures are kept in memory by every process (see :func:`get_local_structure_cache`),
+    so block types, ids and field names are interned, children refer to the same BlockKeys as
+    the 'blocks' map, and the blocks without defaults or asides share a single empty dict.
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -156,12 +170,27 @@ def structure_from_mongo(structure, course_context=None):
     with TIMER.timer('structure_from_mongo', course_context) as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
-        structure['root'] = BlockKey(*structure['root'])
+        block_keys = [
+            BlockKey(sys.intern(block['block_type']), sys.intern(block.pop('block_id')))
+            for block in structure['blocks']
+        ]
+        shared_block_keys = {block_key: block_key for block_key in block_keys}
+
+        def _shared_block_key(block_type, block_id):
+            block_key = BlockKey(block_type, block_id)
+            return shared_block_keys.get(block_key, block_key)
+
+        structure['root'] = _shared_block_key(*structure['root'])
         new_blocks = {}
-        for block in structure['blocks']:
+        for block_key, block in zip(block_keys, structure['blocks']):
+            block['block_type'] = block_key.type
+            block['fields'] = {sys.intern(name): value for name, value in block['fields'].items()}
             if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
+                block['fields']['children'] = [_shared_block_key(*child) for child in block['fields']['children']]
+            for name in ('defaults', 'asides'):
+                if block.get(name) == {}:
+                    block[name] = _EMPTY_DICT
+            new_blocks[block_key] = BlockData(**block)
         structure['blocks'] = new_blocks
 
         return structure
@@ -190,11 +219,95 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+def copy_structure(structure):
+    """
+    Return a copy of the decoded ``structure`` whose blocks, and their fields
+    and edit info, can be changed without changing those of ``structure``.
+
+    The field values themselves are shared, so they must not be changed in
+    place; edits version the structure (deep-copying it) first.
+    """
+    new_structure = dict(structure)
+    new_blocks = {}
+    for block_key, block in structure['blocks'].items():
+        new_block = copy.copy(block)
+        new_block.fields = dict(block.fields)
+        new_block.edit_info = copy.copy(block.edit_info)
+        new_blocks[block_key] = new_block
+    new_structure['blocks'] = new_blocks
+    return new_structure
+
+
+def get_memory_size(obj):
+    """
+    Return the approximate number of bytes of memory used by ``obj`` and
+    the objects it refers to, counting the objects it shares only once.
+
+    Dicts, lists, tuples, sets and the attributes of objects (including
+    those in ``__slots__``) are followed; other objects are measured by
+    ``sys.getsizeof`` alone.
+    """
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float)):
+            for cls in type(obj).__mro__:
+                slots = getattr(cls, '__slots__', ())
+                for name in (slots,) if isinstance(slots, str) else slots:
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+    return size
+
+
+_LOCAL_STRUCTURE_CACHE = None
+
+
+def get_local_structure_cache():
+    """
+    Return the process-wide LRU cache of already-decoded course structures, or
+    None if it is disabled by setting ``COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES`` to 0.
+
+    Structures are immutable once saved (they are keyed by their version
+    ObjectId), so decoded structures can be shared across requests. The
+    cache is bounded by the approximate size of the cached structures, as
+    measured by the length of their pickled serialization.
+
+    The cached structures are shared, so callers must not change them:
+    CourseStructureCache hands out copies of their blocks (see
+    :func:`copy_structure`), which are versioned (see
+    SplitMongoModuleStore.version_structure) before being edited.
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+    max_bytes = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES', 0)
+    if not max_bytes:
+        return None
+    if _LOCAL_STRUCTURE_CACHE is None or _LOCAL_STRUCTURE_CACHE.max_size != max_bytes:
+        _LOCAL_STRUCTURE_CACHE = BoundedLRUCache(max_bytes)
+    return _LOCAL_STRUCTURE_CACHE
+
+
 class CourseStructureCache:
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Decoded structures are also kept in a process-local LRU tier (see
+    :func:`get_local_structure_cache`) that is consulted before the django cache.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
@@ -204,6 +317,7 @@ class CourseStructureCache:
             self.cache = get_cache('course_structure_cache')
         except InvalidCacheBackendError:
             pass
+        self.local_cache = get_local_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
@@ -211,6 +325,13 @@ class CourseStructureCache:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.local_cache is not None:
+                structure = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(structure is not None).lower())
+                if structure is not None:
+                    # The cached structure is shared by all the requests of the process.
+                    return copy_structure(structure)
+
             try:
                 compressed_pickled_data = self.cache.get(key)
                 tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
@@ -225,13 +346,16 @@ class CourseStructureCache:
                 pickled_data = zlib.decompress(compressed_pickled_data)
                 tagger.measure('uncompressed_size', len(pickled_data))
 
-                return pickle.loads(pickled_data, encoding='latin-1')
+                structure = pickle.loads(pickled_data, encoding='latin-1')
             except Exception:  # lint-amnesty, pylint: disable=broad-except
                 # The cached data is corrupt in some way, get rid of it.
                 log.warning("CourseStructureCache: Bad data in cache for %s", course_context)
                 self.cache.delete(key)
                 return None
 
+            self._set_local(key, structure, len(pickled_data), tagger)
+            return structure
+
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
         if self.cache is None:
@@ -240,6 +364,7 @@ class CourseStructureCache:
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, 4)  # Protocol can't be incremented until cache is cleared
             tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_local(key, structure, len(pickled_data), tagger)
 
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
@@ -259,6 +384,98 @@ class CourseStructureCache:
                 monitoring.set_custom_attribute('split_mongo_compressed_size', chunk_size_in_mbs)
                 log.info('Data caching (course structure) failed on chunk size: {} MB'.format(chunk_size_in_mbs))
 
+    def _set_local(self, key, structure, size, tagger):
+        """
+        Add the decoded structure to the process-local tier, if enabled,
+        recording the memory it uses (see :func:`get_memory_size`), the
+        resulting evictions and the size of the tier on ``tagger``.
+        """
+        if self.local_cache is None or size > self.local_cache.max_size:
+            return
+
+        # Keep a copy, since the caller may change the blocks of the structure it was given.
+        local_structure = copy_structure(structure)
+        evicted = self.local_cache.set(key, local_structure, size)
+        tagger.measure('local_cache_memory_size', get_memory_size(local_structure))
+        tagger.measure('local_cache_evictions', evicted)
+        tagger.measure('local_cache_size', self.local_cache.current_size)
+
+
+class CourseDefinitionCache:
+    """
+    Wrapper around django cache object to cache definitions, by their id.
+    The definitions are pickled and compressed when cached.
+
+    Definitions are never changed once saved (edits create a new definition,
+    with a new id), so they are cached with a timeout of "never". Definitions
+    whose compressed size exceeds ``COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES``
+    are not cached.
+
+    If the 'course_definition_cache' doesn't exist, or the maximum size is 0,
+    then don't do anything for get_many and set_many.
+    """
+    def __init__(self):
+        self.cache = None
+        self.max_item_bytes = getattr(settings, 'COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES', 0)
+        if self.max_item_bytes:
+            try:
+                self.cache = get_cache('course_definition_cache')
+            except InvalidCacheBackendError:
+                pass
+
+    def get_many(self, keys, course_context=None):
+        """
+        Return a dict of the cached definitions whose ids are in ``keys``, by id.
+        """
+        if self.cache is None or not keys:
+            return {}
+
+        with TIMER.timer("CourseDefinitionCache.get_many", course_context) as tagger:
+            tagger.measure('definitions', len(keys))
+            keys_by_cache_key = {str(key): key for key in keys}
+            try:
+                cached_data = self.cache.get_many(list(keys_by_cache_key))
+            except Exception:  # pylint: disable=broad-except
+                log.warning("CourseDefinitionCache: Failed to read definitions for %s", course_context)
+                return {}
+
+            definitions = {}
+            for cache_key, compressed_pickled_data in cached_data.items():
+                try:
+                    definition = pickle.loads(zlib.decompress(compressed_pickled_data), encoding='latin-1')
+                except Exception:  # lint-amnesty, pylint: disable=broad-except
+                    # The cached data is corrupt in some way, get rid of it.
+                    log.warning("CourseDefinitionCache: Bad data in cache for %s", course_context)
+                    self.cache.delete(cache_key)
+                    continue
+                definitions[keys_by_cache_key[cache_key]] = definition
+            tagger.measure('cached_definitions', len(definitions))
+            return definitions
+
+    def set_many(self, definitions, course_context=None):
+        """
+        Pickle, compress, and write the given definitions to the cache, skipping those that are too large.
+        """
+        if self.cache is None or not definitions:
+            return
+
+        with TIMER.timer("CourseDefinitionCache.set_many", course_context) as tagger:
+            cached_data = {}
+            for definition in definitions:
+                # 1 = Fastest (slightly larger results)
+                compressed_pickled_data = zlib.compress(pickle.dumps(definition, 4), 1)
+                if len(compressed_pickled_data) > self.max_item_bytes:
+                    tagger.tag(skipped_large_definitions='true')
+                    continue
+                tagger.measure('compressed_size', len(compressed_pickled_data))
+                cached_data[str(definition['_id'])] = compressed_pickled_data
+
+            # Definitions are immutable, so we set a timeout of "never"
+            try:
+                self.cache.set_many(cached_data, None)
+            except Exception:  # pylint: disable=broad-except
+                log.info("CourseDefinitionCache: Failed to write %d definitions", len(cached_data))
+
 
 class MongoPersistenceBackend:
     """
@@ -513,19 +730,33 @@ class MongoPersistenceBackend:
         Get the definition from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_definition", course_context) as tagger:
-            definition = self.definitions.find_one({'_id': key})
+            cache = CourseDefinitionCache()
+            definition = cache.get_many([key], course_context).get(key)
+            tagger.tag(from_cache=str(definition is not None).lower())
+            if definition is None:
+                definition = self.definitions.find_one({'_id': key})
+                if definition is not None:
+                    cache.set_many([definition], course_context)
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
 
     def get_definitions(self, definitions, course_context=None):
         """
-        Retrieve all definitions listed in `definitions`.
+        Retrieve all definitions listed in `definitions`, in no particular order.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            cache = CourseDefinitionCache()
+            cached_definitions = cache.get_many(definitions, course_context)
+            missing_ids = [key for key in definitions if key not in cached_definitions]
+            if not missing_ids:
+                return list(cached_definitions.values())
+
+            tagger.measure('uncached_definitions', len(missing_ids))
+            found_definitions = list(self.definitions.find({'_id': {'$in': missing_ids}}))
+            cache.set_many(found_definitions, course_context)
+            return list(cached_definitions.values()) + found_definitions
 
     def insert_definition(self, definition, course_context=None):
         """
@@ -536,6 +767,21 @@ class MongoPersistenceBackend:
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert_one(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Create the definitions in the db, in a single batch. Definitions that are already in the db are skipped.
+        """
+        with TIMER.timer("insert_definitions", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            try:
+                self.definitions.insert_many(definitions, ordered=False)
+            except BulkWriteError as err:
+                # The store is append only, so a definition that has already been written can be skipped.
+                errors = err.details.get('writeErrors', [])
+                if any(error.get('code') != DUPLICATE_KEY_ERROR_CODE for error in errors):
+                    raise
+                log.debug("Skipped inserting %d duplicate definitions", len(errors))
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -58,11 +58,13 @@ Representation:
 import copy
 import datetime
 import logging
+import re
 from collections import defaultdict
 from importlib import import_module
 
 from bson.objectid import ObjectId
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from edx_toggles.toggles import SettingToggle
 from mongodb_proxy import autoretry_read
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import (
@@ -101,6 +103,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, DjangoFlexPersistenceBackend
+from xmodule.modulestore.split_mongo.structure_indexes import STRUCTURE_INDEX_CACHE, inherit_settings
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES, derived_key
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.util.misc import get_library_or_course_attribute
@@ -131,6 +134,45 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# .. toggle_name: ENABLE_BATCHED_DEFINITION_INSERTS
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True to write the definitions created in a split modulestore bulk operation
+#   (such as a course import) to mongo in a single batch when the operation ends, rather than one at a time.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_BATCHED_DEFINITION_INSERTS = SettingToggle(
+    "ENABLE_BATCHED_DEFINITION_INSERTS", default=False, module_name=__name__
+)
+
+# .. toggle_name: ENABLE_SPLIT_DEFINITION_PREFETCH
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True for the split modulestore to fetch the definitions of the blocks it lazily
+#   loads, and of their children, with a single query, rather than one query per block when its content is first
+#   read. For example, rendering a unit then fetches the definitions of all of its components at once.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_SPLIT_DEFINITION_PREFETCH = SettingToggle(
+    "ENABLE_SPLIT_DEFINITION_PREFETCH", default=False, module_name=__name__
+)
+
+# The maximum number of definitions fetched ahead of lazily loading blocks; larger sets, such as
+# those of whole courses, are left to be loaded as needed.
+MAX_PREFETCHED_DEFINITIONS = 250
+
+# .. toggle_name: ENABLE_SPLIT_STRUCTURE_INDEXES
+# .. toggle_implementation: SettingToggle
+# .. toggle_default: False
+# .. toggle_description: Set this to True for the split modulestore to find the parents of blocks, and the blocks
+#   matching get_items queries on block type or settings field values, using indexes built once per course structure
+#   version, rather than by scanning all the blocks of the structure for each query.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+ENABLE_SPLIT_STRUCTURE_INDEXES = SettingToggle(
+    "ENABLE_SPLIT_STRUCTURE_INDEXES", default=False, module_name=__name__
+)
+
 
 class SplitBulkWriteRecord(BulkOpsRecord):  # lint-amnesty, pylint: disable=missing-class-docstring
     def __init__(self):
@@ -266,7 +308,16 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                 # append only, so if it's already been written, we can just keep going.
                 log.debug("Attempted to insert duplicate structure %s", _id)
 
-        for _id in bulk_write_record.definitions.keys() - bulk_write_record.definitions_in_db:
+        new_definition_ids = bulk_write_record.definitions.keys() - bulk_write_record.definitions_in_db
+        if len(new_definition_ids) > 1 and ENABLE_BATCHED_DEFINITION_INSERTS.is_enabled():
+            # Course imports create thousands of definitions in one bulk operation, so write them in one batch.
+            self.db_connection.insert_definitions(
+                [bulk_write_record.definitions[_id] for _id in new_definition_ids], bulk_write_record.course_key
+            )
+            new_definition_ids = ()
+            dirty = True
+
+        for _id in new_definition_ids:
             dirty = True
 
             try:
@@ -354,6 +405,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        STRUCTURE_INDEX_CACHE.discard(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
@@ -746,16 +798,48 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 definitions = {definition['_id']: definition
                                for definition in descendent_definitions}
 
-                for block in new_block_data.values():
+                for block_key, block in list(new_block_data.items()):
                     if block.definition in definitions:
                         definition = definitions[block.definition]
+                        # Load the definition into a copy of the block, since the block of the
+                        # structure may be shared with other requests (see CourseStructureCache).
+                        block = copy.copy(block)
                         # convert_fields gets done later in the runtime's xblock_from_json
-                        block.fields.update(definition.get('fields'))
+                        block.fields = {**block.fields, **definition.get('fields')}
                         block.definition_loaded = True
+                        new_block_data[block_key] = block
+            elif ENABLE_SPLIT_DEFINITION_PREFETCH.is_enabled():
+                self._prefetch_definitions(system, base_block_ids, new_block_data, course_key)
 
             system.module_data.update(new_block_data)
             return system.module_data
 
+    def _prefetch_definitions(self, system, base_block_ids, block_data, course_key):
+        """
+        Fetch the definitions of the blocks in `block_data`, and of the children of the blocks
+        in `base_block_ids`, with a single query, and keep them in the CachingDescriptorSystem
+        `system` for when the fields of the blocks are loaded.
+        """
+        blocks = system.course_entry.structure['blocks']
+        block_keys = set(block_data)
+        for block_id in base_block_ids:
+            if block_id in blocks:
+                block_keys.update(BlockKey(*child) for child in blocks[block_id].fields.get('children', []))
+
+        definition_ids = {
+            blocks[block_key].definition
+            for block_key in block_keys
+            if block_key in blocks and blocks[block_key].definition is not None
+            and not blocks[block_key].definition_loaded
+        }
+        definition_ids.difference_update(system.prefetched_definitions)
+        # A single definition is left to be fetched when it's read, which may be never.
+        if not 1 < len(definition_ids) <= MAX_PREFETCHED_DEFINITIONS:
+            return
+
+        for definition in self.get_definitions(course_key, list(definition_ids)):
+            system.prefetched_definitions[definition['_id']] = definition
+
     def _load_items(self, course_entry, block_keys, depth=0, **kwargs):
         """
         Load & cache the given blocks from the course. May return the blocks in any order.
@@ -1268,11 +1352,21 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         path_cache = None
         parents_cache = None
 
+        indexes = self._get_structure_indexes(course)
         if not include_orphans:
             path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            if indexes is None:
+                parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            else:
+                parents_cache = indexes.parents
 
-        for block_id, value in course.structure['blocks'].items():
+        blocks = course.structure['blocks']
+        if indexes is None:
+            candidates = blocks.keys()
+        else:
+            candidates = self._get_indexed_candidates(indexes, qualifiers, settings)
+        for block_id in candidates:
+            value = blocks[block_id]
             if _block_matches_all(value):
                 if not include_orphans:
                     if (
@@ -1288,6 +1382,44 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_structure_indexes(self, course):
+        """
+        Return the :class:`StructureIndexes` of the structure of the `course` envelope, or None if
+        they are disabled, or if the structure is being edited by the active bulk operation.
+        """
+        if not ENABLE_SPLIT_STRUCTURE_INDEXES.is_enabled():
+            return None
+        bulk_write_record = self._get_bulk_ops_record(course.course_key)
+        if bulk_write_record.active and course.structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+        return STRUCTURE_INDEX_CACHE.get(course.structure)
+
+    def _get_indexed_candidates(self, indexes, qualifiers, settings):
+        """
+        Return the keys of the blocks that may match the get_items `qualifiers` and `settings`, in
+        structure order, using the `indexes` for the criteria that are plain values.
+        """
+        candidates = indexes.structure['blocks'].keys()
+
+        def _is_plain_value(criteria):
+            if isinstance(criteria, (dict, list, re.Pattern)) or callable(criteria):
+                return False
+            try:
+                hash(criteria)
+            except TypeError:
+                return False
+            return True
+
+        block_type = qualifiers.get('block_type')
+        if block_type is not None and _is_plain_value(block_type):
+            candidates = indexes.keys_by_type.get(block_type, [])
+        for field_name, criteria in settings.items():
+            if _is_plain_value(criteria):
+                keys = indexes.get_keys_with_field_value(field_name, criteria)
+                if len(keys) < len(candidates):
+                    candidates = keys
+        return candidates
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
@@ -1322,9 +1454,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return path_cache[block_key]
 
         if parents_cache is None:
-            xblock_parents = self._get_parents_from_structure(block_key, course.structure)
+            indexes = self._get_structure_indexes(course)
+            if indexes is None:
+                xblock_parents = self._get_parents_from_structure(block_key, course.structure)
+            else:
+                xblock_parents = indexes.get_parents(block_key)
         else:
-            xblock_parents = parents_cache[block_key]
+            xblock_parents = parents_cache.get(block_key, [])
 
         if len(xblock_parents) == 0 and block_key.type in ["course", "library"]:
             # Found, xblock has the path to the root
@@ -1356,7 +1492,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        indexes = self._get_structure_indexes(course)
+        if indexes is None:
+            all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        else:
+            all_parent_ids = indexes.get_parents(BlockKey.from_usage_key(locator))
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
@@ -1390,10 +1530,16 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         items = set(course.structure['blocks'].keys())
         items.remove(course.structure['root'])
         blocks = course.structure['blocks']
-        for block_id, block_data in blocks.items():
-            items.difference_update(BlockKey(*child) for child in block_data.fields.get('children', []))
-            if block_data.block_type in detached_categories:
-                items.discard(block_id)
+        indexes = self._get_structure_indexes(course)
+        if indexes is None:
+            for block_id, block_data in blocks.items():
+                items.difference_update(BlockKey(*child) for child in block_data.fields.get('children', []))
+                if block_data.block_type in detached_categories:
+                    items.discard(block_id)
+        else:
+            items.difference_update(indexes.parents)
+            for block_type in detached_categories:
+                items.difference_update(indexes.keys_by_type.get(block_type, []))
         return [
             course_key.make_usage_key(block_type=block_id.type, block_id=block_id.id)
             for block_id in items
@@ -2619,50 +2765,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         self._emit_course_deleted_signal(course_key)
 
-    def inherit_settings(
-        self, block_map, block_key, inherited_settings_map, inheriting_settings=None, inherited_from=None
-    ):
+    def inherit_settings(self, block_map, block_key, inherited_settings_map, inheriting_settings=None):
         """
-        Updates block_data with any inheritable setting set by an ancestor and recurses to children.
+        Updates inherited_settings_map with the inheritable settings that block_key and its descendants
+        inherit from their ancestors, with the settings passed down to block_key taking precedence.
+        See :func:`~xmodule.modulestore.split_mongo.structure_indexes.inherit_settings`.
         """
-        if block_key not in block_map:
-            return
-        block_data = block_map[block_key]
-
-        if inheriting_settings is None:
-            inheriting_settings = {}
-
-        if inherited_from is None:
-            inherited_from = []
-
-        # the currently passed down values take precedence over any previously cached ones
-        # NOTE: this should show the values which all fields would have if inherited: i.e.,
-        # not set to the locally defined value but to value set by nearest ancestor who sets it
-        inherited_settings_map.setdefault(block_key, {}).update(inheriting_settings)
-
-        # update the inheriting w/ what should pass to children
-        inheriting_settings = inherited_settings_map[block_key].copy()
-        block_fields = block_data.fields
-        for field_name in inheritance.InheritanceMixin.fields:  # lint-amnesty, pylint: disable=not-an-iterable
-            if field_name in block_fields:
-                inheriting_settings[field_name] = block_fields[field_name]
-
-        for child in block_fields.get('children', []):
-            try:
-                if child in inherited_from:
-                    raise Exception(f'Infinite loop detected when inheriting to {child}, having already inherited from {inherited_from}')  # lint-amnesty, pylint: disable=line-too-long
-                self.inherit_settings(
-                    block_map,
-                    BlockKey(*child),
-                    inherited_settings_map,
-                    inheriting_settings,
-                    inherited_from + [child]
-                )
-            except KeyError:
-                # here's where we need logic for looking up in other structures when we allow cross pointers
-                # but it's also getting this during course creation if creating top down w/ children set or
-                # migration where the old mongo published had pointers to privates
-                pass
+        inherit_settings(block_map, block_key, inherited_settings_map, inheriting_settings)
 
     def descendants(self, block_map, block_id, depth, descendent_map):
         """
@@ -2671,16 +2780,27 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         (0 => this usage only, 1 => this usage and its children, etc...)
         A depth of None returns all descendants
         """
-        if block_id not in block_map:
-            return descendent_map
+        # The depth to which the descendants of each block have been added, so that blocks
+        # with several parents are only walked again to add deeper descendants.
+        walked_depths = {}
+        stack = [(block_id, depth)]
+        while stack:
+            block_id, depth = stack.pop()
+            if block_id not in block_map:
+                continue
+
+            if block_id not in descendent_map:
+                descendent_map[block_id] = block_map[block_id]
 
-        if block_id not in descendent_map:
-            descendent_map[block_id] = block_map[block_id]
+            walked_depth = walked_depths.get(block_id, -1)
+            if walked_depth is None or (depth is not None and depth <= walked_depth):
+                continue
+            walked_depths[block_id] = depth
 
-        if depth is None or depth > 0:
-            depth = depth - 1 if depth is not None else None
-            for child in descendent_map[block_id].fields.get('children', []):
-                descendent_map = self.descendants(block_map, child, depth, descendent_map)
+            if depth is None or depth > 0:
+                child_depth = depth - 1 if depth is not None else None
+                children = descendent_map[block_id].fields.get('children', [])
+                stack.extend((child, child_depth) for child in reversed(children))
 
         return descendent_map
 
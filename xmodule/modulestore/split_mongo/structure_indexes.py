@@ -0,0 +1,186 @@
+"""
+Secondary indexes of split modulestore course structures.
+
+Finding the blocks of a type, the blocks with a given settings field value, or
+the parents of a block otherwise means scanning all the blocks of a structure.
+Structures saved to the database never change (edits create a new version, with
+a new '_id'), so the indexes of a structure are built lazily, the first time
+they are needed, and kept by structure '_id' for as long as the structure is
+among the most recently indexed ones.
+
+The indexes only narrow down the blocks to check: callers still match each
+candidate block against the full query.
+"""
+import threading
+from collections import defaultdict
+
+from openedx.core.lib.cache_utils import BoundedLRUCache
+from xmodule.modulestore.inheritance import InheritanceMixin
+from xmodule.modulestore.split_mongo import BlockKey
+
+# The maximum number of structures whose indexes are kept.
+MAX_INDEXED_STRUCTURES = 20
+
+
+def _hashable_values(value):
+    """
+    Yield the hashable values that a query value equal to would match `value`,
+    looking into lists as `ModuleStoreRead._value_matches` does.
+    """
+    if isinstance(value, list):
+        for element in value:
+            yield from _hashable_values(element)
+    else:
+        try:
+            hash(value)
+        except TypeError:
+            return
+        yield value
+
+
+# Marks the end of the subtree of a block in the stack of inherit_settings.
+_END_OF_SUBTREE = object()
+
+
+def inherit_settings(block_map, root_key, inherited_settings_map=None, inheriting_settings=None):
+    """
+    Compute the json values of the inheritable settings that each block under `root_key` in
+    `block_map` inherits from its nearest ancestor that sets them, and return them as a dict
+    by block key, updating `inherited_settings_map` if it is given.
+
+    The tree is walked iteratively, and blocks that set no inheritable settings share the
+    dict of their parent rather than copying it, so the returned dicts must not be modified.
+    """
+    if inherited_settings_map is None:
+        inherited_settings_map = {}
+    inheritable_names = InheritanceMixin.fields.keys()  # lint-amnesty, pylint: disable=no-member
+
+    stack = [(root_key, inheriting_settings or {})]
+    ancestors = set()
+    while stack:
+        block_key, inheriting_settings = stack.pop()
+        if inheriting_settings is _END_OF_SUBTREE:
+            ancestors.discard(block_key)
+            continue
+        if block_key not in block_map:
+            continue
+
+        # the currently passed down values take precedence over any previously computed ones
+        inherited_settings = inherited_settings_map.get(block_key)
+        if inherited_settings is None:
+            inherited_settings = inheriting_settings
+        elif inheriting_settings:
+            inherited_settings = {**inherited_settings, **inheriting_settings}
+        inherited_settings_map[block_key] = inherited_settings
+
+        block_fields = block_map[block_key].fields
+        own_settings = {name: block_fields[name] for name in inheritable_names & block_fields.keys()}
+        children_settings = {**inherited_settings, **own_settings} if own_settings else inherited_settings
+
+        ancestors.add(block_key)
+        stack.append((block_key, _END_OF_SUBTREE))
+        for child in reversed(block_fields.get('children', [])):
+            child_key = BlockKey(*child)
+            if child_key in ancestors:
+                raise Exception(f'Infinite loop detected when inheriting to {child_key} from {block_key}')
+            stack.append((child_key, children_settings))
+    return inherited_settings_map
+
+
+class StructureIndexes:
+    """
+    The lazily built indexes of an immutable structure.
+    """
+    def __init__(self, structure):
+        self.structure = structure
+        self._parents = None
+        self._keys_by_type = None
+        self._field_indexes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def parents(self):
+        """
+        A dict mapping the key of each child block to the keys of its parents, in structure order.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for parent_key, block in self.structure['blocks'].items():
+                for child in block.fields.get('children', []):
+                    child_parents = parents[child if isinstance(child, tuple) else BlockKey(*child)]
+                    if not child_parents or child_parents[-1] != parent_key:
+                        child_parents.append(parent_key)
+            self._parents = dict(parents)
+        return self._parents
+
+    @property
+    def keys_by_type(self):
+        """
+        A dict mapping each block type to the keys of the blocks of that type, in structure order.
+        """
+        if self._keys_by_type is None:
+            keys_by_type = defaultdict(list)
+            for block_key, block in self.structure['blocks'].items():
+                keys_by_type[block.block_type].append(block_key)
+            self._keys_by_type = dict(keys_by_type)
+        return self._keys_by_type
+
+    def get_parents(self, block_key):
+        """
+        Return the keys of the parents of `block_key`.
+        """
+        return self.parents.get(block_key, [])
+
+    def get_keys_with_field_value(self, field_name, value):
+        """
+        Return the keys of the blocks whose settings field `field_name` is set to
+        `value`, or to a list that contains it, in structure order.
+        """
+        with self._lock:
+            field_index = self._field_indexes.get(field_name)
+        if field_index is None:
+            field_index = defaultdict(list)
+            for block_key, block in self.structure['blocks'].items():
+                if field_name in block.fields:
+                    for field_value in _hashable_values(block.fields[field_name]):
+                        keys = field_index[field_value]
+                        if not keys or keys[-1] != block_key:
+                            keys.append(block_key)
+            field_index = dict(field_index)
+            with self._lock:
+                self._field_indexes[field_name] = field_index
+        return field_index.get(value, [])
+
+
+class StructureIndexCache:
+    """
+    The indexes of the `max_structures` most recently indexed structures, by structure '_id'.
+    """
+    def __init__(self, max_structures=MAX_INDEXED_STRUCTURES):
+        self.max_structures = max_structures
+        self._indexes = BoundedLRUCache(max_structures)
+
+    def get(self, structure):
+        """
+        Return the :class:`StructureIndexes` of `structure`.
+        """
+        indexes = self._indexes.get(structure['_id'])
+        if indexes is None:
+            indexes = StructureIndexes(structure)
+            self._indexes.set(structure['_id'], indexes)
+        return indexes
+
+    def discard(self, structure_id):
+        """
+        Drop the indexes of the structure with the given '_id', if any.
+        """
+        self._indexes.delete(structure_id)
+
+    def clear(self):
+        """
+        Drop the indexes of all structures.
+        """
+        self._indexes.clear()
+
+
+STRUCTURE_INDEX_CACHE = StructureIndexCache()
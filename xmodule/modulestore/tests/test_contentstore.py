@@ -3,9 +3,12 @@
 """
 
 
+import io
+import json
 import logging
 import mimetypes
 import shutil
+import tarfile
 import unittest
 from tempfile import mkdtemp
 from uuid import uuid4
@@ -147,6 +150,28 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tar(self, deprecated):
+        """
+        Test export into a tar file
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.Path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        tar_data = io.BytesIO()
+        with tarfile.open(fileobj=tar_data, mode='w') as tar_file:
+            self.contentstore.export_all_for_course_to_tar(
+                self.course1_key, tar_file, 'course/static',
+                path.Path(root_dir / "policy.json"), max_workers=2,
+            )
+        tar_data.seek(0)
+        with tarfile.open(fileobj=tar_data) as tar_file:
+            assert sorted(tar_file.getnames()) == sorted(f'course/static/{name}' for name in self.course1_files)
+            with open(f"{DATA_DIR}/static/picture1.jpg", "rb") as f:
+                assert tar_file.extractfile('course/static/picture1.jpg').read() == f.read()
+        with open(root_dir / "policy.json") as f:
+            assert sorted(json.load(f)) == sorted(self.course1_files)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
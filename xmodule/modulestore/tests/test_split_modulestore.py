@@ -15,6 +15,7 @@ import pytest
 import ddt
 from ccx_keys.locator import CCXBlockUsageLocator
 from django.core.cache import InvalidCacheBackendError, caches
+from django.test.utils import override_settings
 from opaque_keys.edx.locator import BlockUsageLocator, CourseKey, CourseLocator, LocalId
 from testfixtures import LogCapture
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -24,7 +25,7 @@ from openedx.core.lib import tempdir
 from openedx.core.lib.tests import attr
 from xmodule.course_block import CourseBlock
 from xmodule.fields import Date, Timedelta
-from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore import BlockData, ModuleStoreEnum
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import (
     DuplicateCourseError,
@@ -35,8 +36,9 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, get_local_structure_cache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.structure_indexes import STRUCTURE_INDEX_CACHE, inherit_settings
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
@@ -830,6 +832,36 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         # now make sure that you get the same structure
         assert cached_structure == not_cached_structure
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_local_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+
+        with override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=1024 * 1024):
+            local_cache = get_local_structure_cache()
+            local_cache.clear()
+
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # Even if the shared cache loses the structure, the decoded
+            # structure is served from the process-local tier.
+            enabled_cache.clear()
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+            assert cached_structure == not_cached_structure
+
+            # Each request gets its own copy of the blocks of the shared structure.
+            block = next(iter(cached_structure['blocks'].values()))
+            block.fields['display_name'] = 'Changed'
+            block.definition_loaded = True
+            with check_mongo_calls(0):
+                other_structure = self._get_structure(self.new_course)
+            assert other_structure == not_cached_structure
+            assert not any(block.definition_loaded for block in other_structure['blocks'].values())
+            local_cache.clear()
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
@@ -888,6 +920,74 @@ class TestCourseStructureCache(CacheIsolationMixin, SplitModuleTest):
         )
 
 
+class TestCourseDefinitionCache(CacheIsolationMixin, SplitModuleTest):
+    """Tests for the CourseDefinitionCache"""
+
+    # CacheIsolationMixin will reset the cache between test cases
+
+    # We'll use the "default" cache as a valid cache, and the "course_definition_cache" as a dummy cache
+    ENABLED_CACHES = ["default"]
+
+    def setUp(self):
+        super().setUp()
+        course = modulestore().get_course(
+            CourseLocator(org='testx', course='GreekHero', run='run', branch=BRANCH_NAME_DRAFT)
+        )
+        structure = modulestore().db_connection.get_structure(
+            course.location.as_object_id(course.location.version_guid)
+        )
+        self.definition_ids = list({block.definition for block in structure['blocks'].values()})
+
+    def _get_definitions(self):
+        """
+        Return the definitions of the course, sorted by id.
+        """
+        definitions = modulestore().db_connection.get_definitions(self.definition_ids)
+        return sorted(definitions, key=lambda definition: definition['_id'])
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_definition_cache(self, mock_get_cache):
+        enabled_cache = caches['default']
+        mock_get_cache.return_value = enabled_cache
+
+        with check_mongo_calls(1):
+            not_cached_definitions = self._get_definitions()
+        assert len(not_cached_definitions) == len(self.definition_ids)
+
+        # when cache is warmed, all of the definitions come from the cache
+        with check_mongo_calls(0):
+            cached_definitions = self._get_definitions()
+            cached_definition = modulestore().db_connection.get_definition(self.definition_ids[0])
+        assert cached_definitions == not_cached_definitions
+        assert cached_definition['_id'] == self.definition_ids[0]
+
+        # If data is corrupted, get the corrupt definition from mongo again.
+        enabled_cache.set(str(self.definition_ids[0]), b"bad_data")
+        with check_mongo_calls(1):
+            not_corrupt_definitions = self._get_definitions()
+        assert not_corrupt_definitions == not_cached_definitions
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_definition_cache_skips_large_definitions(self, mock_get_cache):
+        mock_get_cache.return_value = caches['default']
+
+        with override_settings(COURSE_DEFINITION_CACHE_MAX_ITEM_BYTES=1):
+            with check_mongo_calls(1):
+                self._get_definitions()
+            with check_mongo_calls(1):
+                self._get_definitions()
+
+    def test_dummy_cache(self):
+        with check_mongo_calls(1):
+            not_cached_definitions = self._get_definitions()
+
+        # Since the test is using the dummy cache, it's not actually caching
+        # anything
+        with check_mongo_calls(1):
+            cached_definitions = self._get_definitions()
+        assert cached_definitions == not_cached_definitions
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -1098,6 +1198,34 @@ class SplitModuleItemTests(SplitModuleTest):
         parent = modulestore().get_parent_location(locator)
         assert parent is None
 
+    @override_settings(ENABLE_SPLIT_STRUCTURE_INDEXES=True)
+    def test_structure_indexes(self):
+        """
+        Test that the structure indexes find the same items and parents as scanning the structure.
+        """
+        self.addCleanup(STRUCTURE_INDEX_CACHE.clear)
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter1 = BlockKey('chapter', 'chapter1')
+        queries = [
+            {},
+            {'qualifiers': {'category': 'chapter'}},
+            {'qualifiers': {'category': 'garbage'}},
+            {'qualifiers': {'category': 'chapter'}, 'settings': {'display_name': re.compile(r'Hera')}},
+            {'qualifiers': {'children': chapter1}},
+            {'qualifiers': {'category': 'chapter'}, 'include_orphans': False},
+        ]
+        for query in queries:
+            with override_settings(ENABLE_SPLIT_STRUCTURE_INDEXES=False):
+                expected = [item.location for item in modulestore().get_items(locator, **query)]
+            assert [item.location for item in modulestore().get_items(locator, **query)] == expected
+
+        parent = modulestore().get_parent_location(locator.make_usage_key('chapter', 'chapter1'))
+        assert parent.block_id == 'head12345'
+        assert modulestore().get_parent_location(locator.make_usage_key('garbage', 'nosuchblock')) is None
+        with override_settings(ENABLE_SPLIT_STRUCTURE_INDEXES=False):
+            expected_orphans = set(modulestore().get_orphans(locator))
+        assert set(modulestore().get_orphans(locator)) == expected_orphans
+
     def test_get_children(self):
         """
         Test the existing get_children method on xblocks
@@ -1116,6 +1244,28 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         assert len(expected_ids) == 0
 
+    @override_settings(ENABLE_SPLIT_DEFINITION_PREFETCH=True)
+    def test_prefetch_definitions(self):
+        """
+        Test that the definitions of the children of a block are fetched with a single query
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'chapter', 'chapter3'
+        )
+        db_connection = modulestore().db_connection
+        with patch.object(
+            db_connection, 'get_definition', wraps=db_connection.get_definition
+        ) as mock_get_definition, patch.object(
+            db_connection, 'get_definitions', wraps=db_connection.get_definitions
+        ) as mock_get_definitions:
+            block = modulestore().get_item(locator)
+            children = block.get_children()
+            assert len(children) == 3
+            for child in children:
+                assert child.data is not None
+        assert mock_get_definitions.call_count == 1
+        assert mock_get_definition.call_count == 0
+
 
 def version_agnostic(children):
     """
@@ -1816,6 +1966,52 @@ class TestInheritance(SplitModuleTest):
     """
     Test the metadata inheritance mechanism.
     """
+    def test_inherited_settings_map(self):
+        """
+        Test the inherited settings computed for a structure
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapter = modulestore().get_item(BlockUsageLocator(course_key, 'chapter', 'chapter3'))
+        structure = chapter.runtime.course_entry.structure
+        inherited_settings_map = inherit_settings(structure['blocks'], structure['root'])
+        course_settings = inherited_settings_map[BlockKey('chapter', 'chapter3')]
+        problem_settings = inherited_settings_map[BlockKey('problem', 'problem3_2')]
+        course_fields = structure['blocks'][BlockKey('course', 'head12345')].fields
+        assert course_settings['graceperiod'] == course_fields['graceperiod']
+        assert problem_settings['graceperiod'] == course_settings['graceperiod']
+        assert inherited_settings_map[BlockKey('course', 'head12345')] == {}
+
+    def test_inherit_settings_cycle(self):
+        """
+        Test that inheriting settings in a structure with a cycle fails rather than looping
+        """
+        block_map = {
+            BlockKey('chapter', 'a'): BlockData(block_type='chapter', fields={'children': [BlockKey('chapter', 'b')]}),
+            BlockKey('chapter', 'b'): BlockData(block_type='chapter', fields={'children': [BlockKey('chapter', 'a')]}),
+        }
+        with pytest.raises(Exception, match='Infinite loop'):
+            inherit_settings(block_map, BlockKey('chapter', 'a'))
+
+    def test_descendants(self):
+        """
+        Test the descendants of a block, to a depth
+        """
+        block_map = {
+            BlockKey('course', 'root'): BlockData(
+                block_type='course', fields={'children': [BlockKey('chapter', 'a'), BlockKey('chapter', 'b')]},
+            ),
+            BlockKey('chapter', 'a'): BlockData(block_type='chapter', fields={'children': [BlockKey('html', 'c')]}),
+            BlockKey('chapter', 'b'): BlockData(block_type='chapter', fields={'children': [BlockKey('html', 'c')]}),
+            BlockKey('html', 'c'): BlockData(block_type='html', fields={}),
+        }
+        root = BlockKey('course', 'root')
+        assert list(modulestore().descendants(block_map, root, 1, {})) == [
+            root, BlockKey('chapter', 'a'), BlockKey('chapter', 'b'),
+        ]
+        assert list(modulestore().descendants(block_map, root, None, {})) == [
+            root, BlockKey('chapter', 'a'), BlockKey('html', 'c'), BlockKey('chapter', 'b'),
+        ]
+
     def test_inheritance(self):
         """
         The actual test
@@ -10,6 +10,7 @@ from unittest.mock import MagicMock, Mock, call
 
 import ddt
 from bson.objectid import ObjectId
+from django.test import override_settings
 from opaque_keys.edx.locator import CourseLocator
 
 from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
@@ -243,6 +244,21 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
             self.conn.mock_calls
         )
 
+    @override_settings(ENABLE_BATCHED_DEFINITION_INSERTS=True)
+    def test_write_batched_definitions_on_close(self):
+        self.conn.get_course_index.return_value = None
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.conn.reset_mock()
+        self.bulk.update_definition(self.course_key.replace(branch='a'), self.definition)
+        other_definition = {'another': 'definition', '_id': ObjectId()}
+        self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
+        self.assertConnCalls()
+        self.bulk._end_bulk_operation(self.course_key)
+        assert len(self.conn.mock_calls) == 1
+        definitions, course_key = self.conn.insert_definitions.call_args[0]
+        self.assertCountEqual([self.definition, other_definition], definitions)
+        assert course_key == self.course_key
+
     def test_write_index_and_structure_on_close(self):
         original_index = {'versions': {}}
         self.conn.get_course_index.return_value = copy.deepcopy(original_index)
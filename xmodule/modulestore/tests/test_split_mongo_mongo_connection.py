@@ -1,14 +1,25 @@
 """ Test the behavior of split_mongo/MongoPersistenceBackend """
 
 
+import pickle
+import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
+from django.test.utils import override_settings
 from pymongo.errors import ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    CourseStructureCache,
+    MongoPersistenceBackend,
+    get_local_structure_cache,
+    get_memory_size,
+    structure_from_mongo
+)
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -24,3 +35,79 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with pytest.raises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestLocalStructureCache(unittest.TestCase):
+    """ Test the process-local LRU tier of the course structure cache """
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=0)
+    def test_disabled(self):
+        assert get_local_structure_cache() is None
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=100)
+    def test_process_wide_instance(self):
+        assert get_local_structure_cache() is get_local_structure_cache()
+        assert get_local_structure_cache().max_size == 100
+
+    @override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_BYTES=100)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_measures_memory_size(self, _mock_get_cache):
+        structure = {'_id': 'a', 'blocks': {}}
+        cache = CourseStructureCache()
+        self.addCleanup(cache.local_cache.clear)
+        tagger = Mock()
+        cache._set_local('a', structure, 40, tagger)  # pylint: disable=protected-access
+        tagger.measure.assert_any_call('local_cache_memory_size', get_memory_size(structure))
+        assert cache.local_cache.get('a') == structure
+
+
+class TestStructureFromMongo(unittest.TestCase):
+    """ Test the compact in-memory representation of decoded structures """
+
+    def _get_structure(self):
+        """
+        Return a decoded structure of a course with a single chapter.
+        """
+        return structure_from_mongo({
+            '_id': 'structure_id',
+            'root': ['course', 'course'],
+            'blocks': [
+                {
+                    'block_type': 'course', 'block_id': 'course', 'definition': None,
+                    'fields': {'children': [['chapter', 'chapter']]}, 'defaults': {}, 'asides': {}, 'edit_info': {},
+                },
+                {
+                    'block_type': 'chapter', 'block_id': 'chapter', 'definition': None,
+                    'fields': {'display_name': 'Chapter'}, 'defaults': {}, 'asides': {}, 'edit_info': {},
+                },
+            ],
+        })
+
+    def test_shared_block_keys(self):
+        structure = self._get_structure()
+        block_keys = {block_key: block_key for block_key in structure['blocks']}
+        root = block_keys[BlockKey('course', 'course')]
+        assert structure['root'] is root
+        chapter_key = structure['blocks'][root].fields['children'][0]
+        assert chapter_key is block_keys[BlockKey('chapter', 'chapter')]
+
+    def test_shared_empty_dicts(self):
+        blocks = list(self._get_structure()['blocks'].values())
+        assert blocks[0].defaults == {}
+        assert blocks[0].defaults is blocks[1].defaults
+        assert blocks[0].asides is blocks[1].asides
+
+    def test_pickled_blocks(self):
+        structure = self._get_structure()
+        assert pickle.loads(pickle.dumps(structure, 4)) == structure
+
+        # Blocks pickled before BlockData used __slots__ may lack 'asides'.
+        block = BlockData.__new__(BlockData)
+        block.__setstate__({'fields': {}, 'block_type': 'html', 'definition': None, 'defaults': {}})
+        assert block.get_asides() == {}
+        assert not block.definition_loaded
+
+    def test_memory_size(self):
+        shared = ['x' * 100]
+        # Objects referred to more than once are only counted once.
+        assert get_memory_size([shared, shared]) == sys.getsizeof([shared, shared]) + get_memory_size(shared)
@@ -246,6 +246,27 @@ class StaticContentImporterTest(unittest.TestCase):  # lint-amnesty, pylint: dis
                 'static/inner/file1.txt', base_dir=expected_base_dir
             )
 
+    def test_import_static_content_directory_concurrently(self):
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=self.course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course'),
+            max_workers=4,
+        )
+        mocked_os_walk_yield = [
+            ('static', None, ['file1.txt', 'file2.txt', '._file3.txt']),
+            ('static/inner', None, ['file1.txt']),
+        ]
+        with mock.patch(
+            'xmodule.modulestore.xml_importer.os.walk',
+            return_value=mocked_os_walk_yield
+        ), mock.patch.object(
+            static_content_importer, 'import_static_file', side_effect=lambda file_path, base_dir: (file_path, 'key')
+        ) as patched_import_static_file:
+            remap_dict = static_content_importer.import_static_content_directory('static')
+        assert patched_import_static_file.call_count == 3
+        assert remap_dict == {'static/file1.txt': 'key', 'static/file2.txt': 'key', 'static/inner/file1.txt': 'key'}
+
     def test_import_static_file(self):
         base_dir = path('/path/to/dir')
         full_file_path = os.path.join(base_dir, 'static/some_file.txt')
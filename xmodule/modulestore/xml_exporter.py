@@ -105,7 +105,9 @@ class ExportManager:
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(
+        self, modulestore, contentstore, courselike_key, root_dir, target_dir, static_tar=None, static_workers=1
+    ):
         """
         Export all blocks from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -114,12 +116,18 @@ class ExportManager:
         `courselike_key`: The Locator of the block to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `static_tar`: A `tarfile.TarFile` to write the static assets to (under `target_dir`) instead of
+            `root_dir`, can be None
+        `static_workers`: The number of static assets to fetch from the contentstore at once, when
+            writing them to `static_tar`
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = str(target_dir)
+        self.static_tar = static_tar
+        self.static_workers = static_workers
 
     @abstractmethod
     def get_key(self):
@@ -143,6 +151,21 @@ class ExportManager:
         Perform any final processing after the other export tasks are done.
         """
 
+    def export_static_content(self, root_courselike_dir):
+        """
+        Export the static assets from the contentstore, to `root_courselike_dir` or to `static_tar`.
+        """
+        assets_policy_file = root_courselike_dir + '/policies/assets.json'
+        if self.static_tar is None:
+            self.contentstore.export_all_for_course(
+                self.courselike_key, root_courselike_dir + '/static/', assets_policy_file,
+            )
+        else:
+            self.contentstore.export_all_for_course_to_tar(
+                self.courselike_key, self.static_tar, self.target_dir + '/static', assets_policy_file,
+                max_workers=self.static_workers,
+            )
+
     @abstractmethod
     def get_courselike(self):
         """
@@ -218,11 +241,7 @@ class CourseExportManager(ExportManager):
         # export the static assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_content(root_courselike_dir)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -317,11 +336,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makedir('policies', recreate=True)
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_content(self.root_dir + '/' + self.target_dir)
 
     def post_process(self, root, export_fs):
         """
@@ -336,18 +351,18 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, **kwargs):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, **kwargs).export()
 
 
-def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
+def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir, **kwargs):
     """
     Thin wrapper for the Library Export Manager. See ExportManager for details.
     """
-    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
+    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir, **kwargs).export()
 
 
 def adapt_references(subtree, destination_course_key, export_fs):
@@ -5,6 +5,7 @@ Utility functions for transcripts.
 
 
 import copy
+import hashlib
 import html
 import logging
 import os
@@ -21,6 +22,7 @@ from pysrt.srtexc import Error
 
 from openedx.core.djangolib import blockstore_cache
 from openedx.core.lib import blockstore_api
+from openedx.core.lib.cache_utils import BoundedLRUCache
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.exceptions import NotFoundError
@@ -646,6 +648,51 @@ def get_available_transcript_languages(edx_video_id):
     return available_languages
 
 
+_TRANSCRIPT_CONVERSION_CACHE = None
+
+
+def get_transcript_conversion_cache():
+    """
+    Return the process-wide cache of converted transcripts, or None if it is
+    disabled by setting ``TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES`` to 0.
+
+    Converted transcripts are keyed by a hash of the transcript that was
+    converted, so an uploaded transcript never gets the conversions of the
+    one it replaces, and the cache is never invalidated.  The cache is
+    bounded by the total length of the converted transcripts.
+    """
+    global _TRANSCRIPT_CONVERSION_CACHE  # pylint: disable=global-statement
+    max_bytes = getattr(settings, 'TRANSCRIPT_CONVERSION_CACHE_MAX_BYTES', 0)
+    if not max_bytes:
+        return None
+    if _TRANSCRIPT_CONVERSION_CACHE is None or _TRANSCRIPT_CONVERSION_CACHE.max_size != max_bytes:
+        _TRANSCRIPT_CONVERSION_CACHE = BoundedLRUCache(max_bytes, sizeof=len)
+    return _TRANSCRIPT_CONVERSION_CACHE
+
+
+def cached_transcript_conversion(content, conversion, convert):
+    """
+    Return the result of `convert()`, which converts the transcript `content`, from the
+    transcript conversion cache if it is enabled.
+
+    Arguments:
+        content (str or bytes): the transcript being converted
+        conversion (tuple): identifies the conversion, such as its input and output formats
+        convert (callable): converts `content`
+    """
+    cache = get_transcript_conversion_cache()
+    if cache is None:
+        return convert()
+
+    content_bytes = content.encode('utf-8') if isinstance(content, str) else content
+    key = (hashlib.sha1(content_bytes).hexdigest(), conversion)
+    converted = cache.get(key)
+    if converted is None:
+        converted = convert()
+        cache.set(key, converted)
+    return converted
+
+
 def convert_video_transcript(file_name, content, output_format):
     """
     Convert video transcript into desired format
@@ -696,6 +743,17 @@ class Transcript:
         if input_format == output_format:
             return content
 
+        return cached_transcript_conversion(
+            content,
+            (input_format, output_format),
+            lambda: Transcript._convert(content, input_format, output_format),
+        )
+
+    @staticmethod
+    def _convert(content, input_format, output_format):
+        """
+        Convert transcript `content` from `input_format` to a different `output_format`.
+        """
         if input_format == 'srt':
             # Standardize content into bytes for later decoding.
             if isinstance(content, str):
@@ -1007,8 +1065,12 @@ def get_transcript_from_contentstore(video, language, output_format, transcripts
 
     if youtube_id:
         youtube_ids = youtube_speed_dict(video)
-        transcript_content = json.dumps(
-            generate_subs(youtube_ids.get(youtube_id, 1), 1, json.loads(transcript_content))
+        speed = youtube_ids.get(youtube_id, 1)
+        sjson_content = transcript_content
+        transcript_content = cached_transcript_conversion(
+            sjson_content,
+            (Transcript.SJSON, Transcript.SJSON, speed),
+            lambda: json.dumps(generate_subs(speed, 1, json.loads(sjson_content))),
         )
 
     return transcript_content, transcript_name, Transcript.mime_types[output_format]